@@ -3,16 +3,36 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import functools
+import inspect
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar, get_type_hints
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+from ..config import config
 from ..database.neo4j_client import Neo4jClient
+from ..utils.cache import QueryCache, get_cache
+
+_R = TypeVar("_R")
+
+# Cached analytics results live under this prefix, keyed by a generation
+# number. Ingest bumps the generation with one INCR instead of scanning for
+# stale keys; entries from older generations are never read again and
+# expire by TTL.
+COMPLEXITY_CACHE_PREFIX = "analytics:complexity:"
+COMPLEXITY_GENERATION_KEY = COMPLEXITY_CACHE_PREFIX + "generation"
+
+# Analytics reads are aggregation-heavy; cap how many run at once across all
+# instances so report traffic cannot exhaust the Neo4j pool shared with tools.
+_report_sem = asyncio.Semaphore(max(1, int(config.database.max_connection_pool_size * 0.4)))
 
 
 class ComplexityMetrics(BaseModel):
     """Code complexity metrics."""
+    model_config = ConfigDict(frozen=True)
+    
     avg_complexity: float
     max_complexity: float
     min_complexity: float
@@ -23,203 +43,638 @@ class ComplexityMetrics(BaseModel):
 
 class ComplexityTrend(BaseModel):
     """Complexity trend over time."""
+    model_config = ConfigDict(frozen=True)
+    
     date: str
     metrics: ComplexityMetrics
 
 
 class LanguageComplexity(BaseModel):
     """Complexity metrics by language."""
+    model_config = ConfigDict(frozen=True)
+    
     language: str
     metrics: ComplexityMetrics
     sample_size: int
 
 
+# Inclusive upper bounds of average complexity for each grade; anything above
+# the last threshold is graded F.
+_GRADE_THRESHOLDS = (2, 5, 10, 15)
+_GRADES = (
+    "A",  # Excellent
+    "B",  # Good
+    "C",  # Acceptable
+    "D",  # Needs improvement
+    "F",  # Poor
+)
+
+
+# Incrementally maintains one ``ComplexityDailyRollup`` per (day, language, user)
+# so trend and language queries aggregate O(days) rollups instead of every
+# ``LintResult``. Append to a write query after binding the lint node as ``l``.
+# Missing language/user values are stored as empty strings because MERGE keys
+# cannot be null.
+ROLLUP_UPSERT_CLAUSE = """
+WITH l
+MERGE (rollup:ComplexityDailyRollup {
+    date: date(),
+    language: coalesce(l.language, ''),
+    user_id: coalesce(l.user_id, '')
+})
+ON CREATE SET
+    rollup.total = 0,
+    rollup.sum_complexity = 0.0,
+    rollup.count_0_2 = 0,
+    rollup.count_3_5 = 0,
+    rollup.count_6_10 = 0,
+    rollup.count_11p = 0,
+    rollup.max_complexity = l.complexity,
+    rollup.min_complexity = l.complexity
+SET
+    rollup.total = rollup.total + 1,
+    rollup.sum_complexity = rollup.sum_complexity + l.complexity,
+    rollup.count_0_2 = rollup.count_0_2 + CASE WHEN l.complexity <= 2 THEN 1 ELSE 0 END,
+    rollup.count_3_5 = rollup.count_3_5
+        + CASE WHEN l.complexity > 2 AND l.complexity <= 5 THEN 1 ELSE 0 END,
+    rollup.count_6_10 = rollup.count_6_10
+        + CASE WHEN l.complexity > 5 AND l.complexity <= 10 THEN 1 ELSE 0 END,
+    rollup.count_11p = rollup.count_11p + CASE WHEN l.complexity > 10 THEN 1 ELSE 0 END,
+    rollup.max_complexity = CASE
+        WHEN l.complexity > rollup.max_complexity THEN l.complexity
+        ELSE rollup.max_complexity
+    END,
+    rollup.min_complexity = CASE
+        WHEN l.complexity < rollup.min_complexity THEN l.complexity
+        ELSE rollup.min_complexity
+    END
+"""
+
+
+# Analytics queries are module-level constants with every filter expressed as
+# a parameter, so each one maps to a single cached Neo4j plan regardless of
+# which optional arguments a caller supplies.
+_TRENDS_QUERY = """
+MATCH (r:ComplexityDailyRollup)
+WHERE r.date >= date() - duration({days: $days})
+AND ($user_id IS NULL OR r.user_id = $user_id)
+WITH
+    r.date AS day,
+    sum(r.total) AS total_functions,
+    sum(r.sum_complexity) AS sum_complexity,
+    max(r.max_complexity) AS max_complexity,
+    min(r.min_complexity) AS min_complexity,
+    sum(r.count_0_2) AS simple_count,
+    sum(r.count_3_5) AS moderate_count,
+    sum(r.count_6_10) AS complex_count,
+    sum(r.count_11p) AS very_complex_count
+RETURN
+    day,
+    sum_complexity / total_functions AS avg_complexity,
+    max_complexity,
+    min_complexity,
+    total_functions,
+    very_complex_count AS high_complexity_count,
+    {
+        `0-2`: simple_count,
+        `3-5`: moderate_count,
+        `6-10`: complex_count,
+        `11+`: very_complex_count
+    } AS complexity_distribution
+ORDER BY day
+"""
+
+_LANGUAGES_QUERY = """
+MATCH (r:ComplexityDailyRollup)
+WHERE r.date >= date() - duration({days: $days})
+AND r.language <> ''
+AND ($languages IS NULL OR r.language IN $languages)
+WITH
+    r.language AS language,
+    sum(r.total) AS sample_size,
+    sum(r.sum_complexity) AS sum_complexity,
+    max(r.max_complexity) AS max_complexity,
+    min(r.min_complexity) AS min_complexity,
+    sum(r.count_0_2) AS simple_count,
+    sum(r.count_3_5) AS moderate_count,
+    sum(r.count_6_10) AS complex_count,
+    sum(r.count_11p) AS very_complex_count
+RETURN
+    language,
+    sum_complexity / sample_size AS avg_complexity,
+    max_complexity,
+    min_complexity,
+    sample_size,
+    very_complex_count AS high_complexity_count,
+    {
+        `0-2`: simple_count,
+        `3-5`: moderate_count,
+        `6-10`: complex_count,
+        `11+`: very_complex_count
+    } AS complexity_distribution
+ORDER BY avg_complexity DESC
+"""
+
+_HOTSPOTS_QUERY = """
+MATCH (l:LintResult)
+WHERE l.complexity >= $min_complexity
+RETURN
+    l.code_hash AS code_hash,
+    l.complexity AS complexity,
+    l.functions AS functions,
+    l.classes AS classes,
+    l.language AS language,
+    l.timestamp AS timestamp,
+    CASE WHEN $include_issues THEN l.linter_output ELSE '' END AS issues
+ORDER BY l.complexity DESC
+LIMIT $limit
+"""
+
+# Statistics for any number of users in one round-trip. OPTIONAL MATCH keeps
+# a row for users without submissions so every requested id is answered.
+_USER_STATS_QUERY = """
+UNWIND $user_ids AS uid
+OPTIONAL MATCH (l:LintResult)
+WHERE l.user_id = uid
+AND l.timestamp >= datetime() - duration({days: $days})
+RETURN
+    uid AS user_id,
+    avg(l.complexity) AS avg_complexity,
+    max(l.complexity) AS max_complexity,
+    min(l.complexity) AS min_complexity,
+    count(l) AS total_submissions,
+    sum(CASE WHEN l.complexity > 10 THEN 1 ELSE 0 END) AS high_complexity_count,
+    sum(CASE WHEN l.linter_exit_code = 0 THEN 1 ELSE 0 END) AS clean_code_count,
+    collect(DISTINCT l.language) AS languages_used
+"""
+
+
+# Trends, language comparison and hotspots fetched in one round-trip. Each
+# ``CALL`` subquery collapses to a single collected row, so the final RETURN
+# is one record regardless of how many days or languages are aggregated.
+# Hotspots leave out the raw linter output, which dominates row size.
+_REPORT_QUERY = """
+CALL {
+    MATCH (r:ComplexityDailyRollup)
+    WHERE r.date >= date() - duration({days: $days})
+    WITH
+        r.date AS day,
+        sum(r.total) AS total_functions,
+        sum(r.sum_complexity) AS sum_complexity,
+        max(r.max_complexity) AS max_complexity,
+        min(r.min_complexity) AS min_complexity,
+        sum(r.count_0_2) AS simple_count,
+        sum(r.count_3_5) AS moderate_count,
+        sum(r.count_6_10) AS complex_count,
+        sum(r.count_11p) AS very_complex_count
+    ORDER BY day
+    RETURN collect({
+        day: day,
+        avg_complexity: sum_complexity / total_functions,
+        max_complexity: max_complexity,
+        min_complexity: min_complexity,
+        total_functions: total_functions,
+        high_complexity_count: very_complex_count,
+        complexity_distribution: {
+            `0-2`: simple_count,
+            `3-5`: moderate_count,
+            `6-10`: complex_count,
+            `11+`: very_complex_count
+        }
+    }) AS trends
+}
+CALL {
+    MATCH (r:ComplexityDailyRollup)
+    WHERE r.date >= date() - duration({days: $days})
+    AND r.language <> ''
+    WITH
+        r.language AS language,
+        sum(r.total) AS sample_size,
+        sum(r.sum_complexity) AS sum_complexity,
+        max(r.max_complexity) AS max_complexity,
+        min(r.min_complexity) AS min_complexity,
+        sum(r.count_0_2) AS simple_count,
+        sum(r.count_3_5) AS moderate_count,
+        sum(r.count_6_10) AS complex_count,
+        sum(r.count_11p) AS very_complex_count
+    WITH *, sum_complexity / sample_size AS avg_complexity
+    ORDER BY avg_complexity DESC
+    RETURN collect({
+        language: language,
+        avg_complexity: avg_complexity,
+        max_complexity: max_complexity,
+        min_complexity: min_complexity,
+        sample_size: sample_size,
+        high_complexity_count: very_complex_count,
+        complexity_distribution: {
+            `0-2`: simple_count,
+            `3-5`: moderate_count,
+            `6-10`: complex_count,
+            `11+`: very_complex_count
+        }
+    }) AS languages
+}
+CALL {
+    MATCH (l:LintResult)
+    WHERE l.complexity >= $min_complexity
+    WITH l
+    ORDER BY l.complexity DESC
+    LIMIT $limit
+    RETURN collect({
+        code_hash: l.code_hash,
+        complexity: l.complexity,
+        functions: l.functions,
+        classes: l.classes,
+        language: l.language,
+        timestamp: l.timestamp,
+        issues: ''
+    }) AS hotspots
+}
+RETURN trends, languages, hotspots
+"""
+
+
+def _cached_analytics(
+    key_template: str,
+) -> Callable[[Callable[..., Awaitable[_R]]], Callable[..., Awaitable[_R]]]:
+    """Cache an analytics coroutine's result in the shared query cache.
+    
+    ``key_template`` is formatted with the call's bound arguments; list
+    arguments are filters whose order does not matter, so they are keyed as
+    sorted tuples and reorderings share an entry. Results are
+    stored in JSON form and validated back into the declared return type, so a
+    Redis hit yields the same objects as a fresh computation.
+    """
+    def decorator(func: Callable[..., Awaitable[_R]]) -> Callable[..., Awaitable[_R]]:
+        signature = inspect.signature(func)
+        adapter: TypeAdapter[Any] | None = None
+        
+        @functools.wraps(func)
+        async def wrapper(self: ComplexityAnalytics, *args: Any, **kwargs: Any) -> _R:
+            nonlocal adapter
+            if adapter is None:
+                adapter = TypeAdapter(get_type_hints(func)["return"])
+            
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key_args = {
+                name: tuple(sorted(set(value))) if isinstance(value, list) else value
+                for name, value in bound.arguments.items()
+            }
+            generation = await self.cache.get_counter(COMPLEXITY_GENERATION_KEY)
+            key = f"{COMPLEXITY_CACHE_PREFIX}{generation}:{key_template.format(**key_args)}"
+            
+            cached = await self.cache.get_value(key)
+            if cached is not None:
+                return adapter.validate_python(cached)
+            
+            result = await func(self, *args, **kwargs)
+            await self.cache.set_value(
+                key, adapter.dump_python(result, mode="json"), ttl=self.cache_ttl
+            )
+            return result
+        
+        return wrapper
+    return decorator
+
+
+async def invalidate_complexity_cache(cache: QueryCache | None = None) -> None:
+    """Retire all cached analytics results after new lint results are ingested."""
+    await (cache or get_cache()).incr(COMPLEXITY_GENERATION_KEY)
+
+
+_RECOMMEND_SPLIT_FUNCTIONS = (
+    "Consider refactoring: Average complexity is high (>10). "
+    "Break down complex functions into smaller, focused functions."
+)
+_RECOMMEND_REFACTOR_COUNT = (
+    "Refactor {count} high-complexity functions. "
+    "Use design patterns like Strategy or Command to reduce complexity."
+)
+_RECOMMEND_HOTSPOTS = (
+    "Multiple complexity hotspots detected. Prioritize refactoring "
+    "the most complex functions first."
+)
+_RECOMMEND_LANGUAGE = (
+    "{language}: Very high complexity detected. "
+    "Consider using language-specific patterns to simplify code."
+)
+_RECOMMEND_NOTHING = (
+    "Code complexity is within acceptable ranges. "
+    "Continue following good coding practices."
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _recommendations_for(
+    high_average: bool,
+    high_complexity_count: int,
+    many_hotspots: bool,
+    complex_languages: tuple[str, ...],
+) -> tuple[str, ...]:
+    """Return the recommendations for a bucketed report outcome.
+    
+    Reports fall into a small set of outcomes, so the rendered text is memoized
+    per outcome and only formatted the first time it is seen.
+    """
+    recommendations: list[str] = []
+    if high_average:
+        recommendations.append(_RECOMMEND_SPLIT_FUNCTIONS)
+    if high_complexity_count > 0:
+        recommendations.append(_RECOMMEND_REFACTOR_COUNT.format(count=high_complexity_count))
+    if many_hotspots:
+        recommendations.append(_RECOMMEND_HOTSPOTS)
+    recommendations.extend(
+        _RECOMMEND_LANGUAGE.format(language=language) for language in complex_languages
+    )
+    return tuple(recommendations) or (_RECOMMEND_NOTHING,)
+
+
 class ComplexityAnalytics:
     """Advanced code complexity analytics engine."""
     
-    def __init__(self, neo4j_client: Neo4jClient):
+    def __init__(
+        self,
+        neo4j_client: Neo4jClient,
+        cache: QueryCache | None = None,
+        cache_ttl: float = 300.0,
+    ):
         self.neo4j_client = neo4j_client
+        self.cache = cache or get_cache()
+        self.cache_ttl = cache_ttl
     
+    @_cached_analytics("trends:{days}:{user_id}")
     async def get_complexity_trends(
         self,
         days: int = 30,
         user_id: Optional[str] = None
     ) -> list[ComplexityTrend]:
-        """Get complexity trends over time."""
-        user_filter = "AND l.user_id = $user_id" if user_id else ""
-        
-        query = f"""
-        MATCH (l:LintResult)
-        WHERE l.timestamp >= datetime() - duration({{days: $days}})
-        {user_filter}
-        WITH l, date(l.timestamp) as day
-        RETURN 
-            day,
-            avg(l.complexity) as avg_complexity,
-            max(l.complexity) as max_complexity,
-            min(l.complexity) as min_complexity,
-            count(l) as total_functions,
-            sum(CASE WHEN l.complexity > 10 THEN 1 ELSE 0 END) as high_complexity_count,
-            sum(CASE WHEN l.complexity <= 2 THEN 1 ELSE 0 END) as simple_count,
-            sum(CASE WHEN l.complexity > 2 AND l.complexity <= 5 THEN 1 ELSE 0 END) as moderate_count,
-            sum(CASE WHEN l.complexity > 5 AND l.complexity <= 10 THEN 1 ELSE 0 END) as complex_count,
-            sum(CASE WHEN l.complexity > 10 THEN 1 ELSE 0 END) as very_complex_count
-        ORDER BY day
-        """
-        
-        params = {"days": days}
-        if user_id:
-            params["user_id"] = user_id
-        
-        results = await self.neo4j_client.execute_read(query, params)
+        """Get complexity trends over time from the daily rollups."""
+        params = {"days": days, "user_id": user_id or None}
         
-        trends = []
-        for row in results:
-            metrics = ComplexityMetrics(
-                avg_complexity=float(row["avg_complexity"] or 0),
-                max_complexity=float(row["max_complexity"] or 0),
-                min_complexity=float(row["min_complexity"] or 0),
-                total_functions=int(row["total_functions"] or 0),
-                high_complexity_count=int(row["high_complexity_count"] or 0),
-                complexity_distribution={
-                    "0-2": int(row["simple_count"] or 0),
-                    "3-5": int(row["moderate_count"] or 0),
-                    "6-10": int(row["complex_count"] or 0),
-                    "11+": int(row["very_complex_count"] or 0),
-                }
-            )
-            
-            trends.append(ComplexityTrend(
-                date=row["day"].isoformat(),
-                metrics=metrics
-            ))
-        
-        return trends
+        return [
+            self._trend_from_row(row)
+            async for row in self._read_stream(_TRENDS_QUERY, params)
+        ]
     
+    @_cached_analytics("languages:{days}:{languages}")
     async def get_language_complexity_comparison(
         self,
-        days: int = 30
+        days: int = 30,
+        languages: Optional[list[str]] = None,
     ) -> list[LanguageComplexity]:
-        """Compare complexity metrics across languages."""
-        query = """
-        MATCH (l:LintResult)
-        WHERE l.timestamp >= datetime() - duration({days: $days})
-        AND l.language IS NOT NULL
-        WITH l.language as language, l.complexity as complexity
-        RETURN 
-            language,
-            avg(complexity) as avg_complexity,
-            max(complexity) as max_complexity,
-            min(complexity) as min_complexity,
-            count(*) as sample_size,
-            sum(CASE WHEN complexity > 10 THEN 1 ELSE 0 END) as high_complexity_count,
-            sum(CASE WHEN complexity <= 2 THEN 1 ELSE 0 END) as simple_count,
-            sum(CASE WHEN complexity > 2 AND complexity <= 5 THEN 1 ELSE 0 END) as moderate_count,
-            sum(CASE WHEN complexity > 5 AND complexity <= 10 THEN 1 ELSE 0 END) as complex_count,
-            sum(CASE WHEN complexity > 10 THEN 1 ELSE 0 END) as very_complex_count
-        ORDER BY avg_complexity DESC
-        """
+        """Compare complexity metrics across languages from the daily rollups.
         
-        results = await self.neo4j_client.execute_read(query, {"days": days})
-        
-        language_metrics = []
-        for row in results:
-            metrics = ComplexityMetrics(
-                avg_complexity=float(row["avg_complexity"] or 0),
-                max_complexity=float(row["max_complexity"] or 0),
-                min_complexity=float(row["min_complexity"] or 0),
-                total_functions=int(row["sample_size"] or 0),
-                high_complexity_count=int(row["high_complexity_count"] or 0),
-                complexity_distribution={
-                    "0-2": int(row["simple_count"] or 0),
-                    "3-5": int(row["moderate_count"] or 0),
-                    "6-10": int(row["complex_count"] or 0),
-                    "11+": int(row["very_complex_count"] or 0),
-                }
-            )
-            
-            language_metrics.append(LanguageComplexity(
-                language=row["language"],
-                metrics=metrics,
-                sample_size=int(row["sample_size"] or 0)
-            ))
-        
-        return language_metrics
+        Pass ``languages`` to aggregate only those partitions of the rollups
+        instead of every language seen in the window.
+        """
+        params = {"days": days, "languages": sorted(set(languages)) if languages else None}
+        return [
+            self._language_from_row(row)
+            async for row in self._read_stream(_LANGUAGES_QUERY, params)
+        ]
     
     async def get_complexity_hotspots(
         self,
         limit: int = 10,
-        min_complexity: float = 10.0
+        min_complexity: float = 10.0,
+        include_issues: bool = False,
     ) -> list[dict[str, Any]]:
-        """Find code with highest complexity (hotspots for refactoring)."""
-        query = """
-        MATCH (l:LintResult)
-        WHERE l.complexity >= $min_complexity
-        RETURN 
-            l.code_hash as code_hash,
-            l.complexity as complexity,
-            l.functions as functions,
-            l.classes as classes,
-            l.language as language,
-            l.timestamp as timestamp,
-            l.linter_output as issues
-        ORDER BY l.complexity DESC
-        LIMIT $limit
-        """
+        """Find code with highest complexity (hotspots for refactoring).
         
-        results = await self.neo4j_client.execute_read(query, {
+        Linter output can run to kilobytes per row, so ``issues`` is left
+        empty unless ``include_issues`` is set.
+        """
+        params = {
             "min_complexity": min_complexity,
-            "limit": limit
-        })
-        
-        hotspots = []
-        for row in results:
-            hotspots.append({
-                "code_hash": row["code_hash"],
-                "complexity": float(row["complexity"]),
-                "functions": row["functions"] or [],
-                "classes": row["classes"] or [],
-                "language": row["language"],
-                "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None,
-                "issues": row["issues"] or "",
-                "refactor_priority": "HIGH" if row["complexity"] > 20 else "MEDIUM"
-            })
-        
-        return hotspots
+            "limit": limit,
+            "include_issues": include_issues,
+        }
+        return [
+            self._hotspot_from_row(row)
+            async for row in self._read_stream(_HOTSPOTS_QUERY, params)
+        ]
     
+    @_cached_analytics("user:{user_id}:{days}")
     async def get_user_complexity_stats(
         self,
         user_id: str,
         days: int = 30
     ) -> dict[str, Any]:
         """Get complexity statistics for a specific user."""
-        query = """
-        MATCH (l:LintResult)
-        WHERE l.user_id = $user_id
-        AND l.timestamp >= datetime() - duration({days: $days})
-        RETURN 
-            avg(l.complexity) as avg_complexity,
-            max(l.complexity) as max_complexity,
-            min(l.complexity) as min_complexity,
-            count(l) as total_submissions,
-            sum(CASE WHEN l.complexity > 10 THEN 1 ELSE 0 END) as high_complexity_count,
-            sum(CASE WHEN l.linter_exit_code = 0 THEN 1 ELSE 0 END) as clean_code_count,
-            collect(DISTINCT l.language) as languages_used
+        stats = await self.get_users_complexity_stats([user_id], days)
+        return stats[user_id]
+    
+    async def get_users_complexity_stats(
+        self,
+        user_ids: list[str],
+        days: int = 30
+    ) -> dict[str, dict[str, Any]]:
+        """Get complexity statistics for several users in a single query.
+        
+        Returns a mapping of user id to the same payload as
+        ``get_user_complexity_stats``.
         """
+        unique_ids = list(dict.fromkeys(user_ids))
+        if not unique_ids:
+            return {}
         
-        results = await self.neo4j_client.execute_read(query, {
-            "user_id": user_id,
+        results = await self._read(_USER_STATS_QUERY, {
+            "user_ids": unique_ids,
             "days": days
         })
+        rows = {row["user_id"]: row for row in results}
+        
+        return {
+            user_id: self._user_stats_from_row(user_id, days, rows.get(user_id))
+            for user_id in unique_ids
+        }
+    
+    async def rebuild_daily_rollups(self, days: int = 30) -> None:
+        """Recompute daily rollups from raw lint results for the given window.
+        
+        Ingest keeps rollups current; this backfills history recorded before
+        rollups existed or repairs drift after manual data changes.
+        """
+        await self.neo4j_client.execute_write(
+            """
+            MATCH (r:ComplexityDailyRollup)
+            WHERE r.date >= date() - duration({days: $days})
+            DETACH DELETE r
+            """,
+            {"days": days},
+        )
+        await self.neo4j_client.execute_write(
+            """
+            MATCH (l:LintResult)
+            WITH l, date(coalesce(l.timestamp, l.created_at)) AS day
+            WHERE day >= date() - duration({days: $days})
+            WITH
+                day,
+                coalesce(l.language, '') AS language,
+                coalesce(l.user_id, '') AS user_id,
+                l.complexity AS complexity
+            WITH
+                day,
+                language,
+                user_id,
+                count(*) AS total,
+                sum(complexity) AS sum_complexity,
+                max(complexity) AS max_complexity,
+                min(complexity) AS min_complexity,
+                sum(CASE WHEN complexity <= 2 THEN 1 ELSE 0 END) AS count_0_2,
+                sum(CASE WHEN complexity > 2 AND complexity <= 5 THEN 1 ELSE 0 END) AS count_3_5,
+                sum(CASE WHEN complexity > 5 AND complexity <= 10 THEN 1 ELSE 0 END) AS count_6_10,
+                sum(CASE WHEN complexity > 10 THEN 1 ELSE 0 END) AS count_11p
+            CREATE (:ComplexityDailyRollup {
+                date: day,
+                language: language,
+                user_id: user_id,
+                total: total,
+                sum_complexity: toFloat(sum_complexity),
+                max_complexity: max_complexity,
+                min_complexity: min_complexity,
+                count_0_2: count_0_2,
+                count_3_5: count_3_5,
+                count_6_10: count_6_10,
+                count_11p: count_11p
+            })
+            """,
+            {"days": days},
+        )
+        await invalidate_complexity_cache(self.cache)
+    
+    @_cached_analytics("report:{days}:{hotspot_limit}:{hotspot_min_complexity}")
+    async def generate_complexity_report(
+        self,
+        days: int = 30,
+        hotspot_limit: int = 10,
+        hotspot_min_complexity: float = 10.0,
+    ) -> dict[str, Any]:
+        """Generate comprehensive complexity report in a single database round-trip."""
+        results = await self._read(_REPORT_QUERY, {
+            "days": days,
+            "limit": hotspot_limit,
+            "min_complexity": hotspot_min_complexity,
+        })
+        row = results[0] if results else {}
+        
+        # The report is plain JSON-ready data, so rows become dicts directly
+        # rather than DTOs that would only be dumped again.
+        trends = [self._trend_dict_from_row(r) for r in row.get("trends") or []]
+        languages = [self._language_dict_from_row(r) for r in row.get("languages") or []]
+        hotspots = [self._hotspot_from_row(r) for r in row.get("hotspots") or []]
         
-        if not results:
+        # Calculate summary statistics
+        if trends:
+            latest_metrics = trends[-1]["metrics"]
+            avg_trend = sum(t["metrics"]["avg_complexity"] for t in trends) / len(trends)
+        else:
+            latest_metrics = {
+                "avg_complexity": 0.0, "max_complexity": 0.0, "min_complexity": 0.0,
+                "total_functions": 0, "high_complexity_count": 0,
+                "complexity_distribution": {},
+            }
+            avg_trend = 0
+        
+        return {
+            "report_date": datetime.now().isoformat(),
+            "period_days": days,
+            "summary": {
+                "current_avg_complexity": latest_metrics["avg_complexity"],
+                "trend_avg_complexity": avg_trend,
+                "total_hotspots": len(hotspots),
+                "languages_analyzed": len(languages),
+            },
+            "trends": trends,
+            "language_comparison": languages,
+            "complexity_hotspots": hotspots,
+            "recommendations": self._generate_recommendations(
+                latest_metrics, hotspots, languages
+            )
+        }
+    
+    async def _read(self, query: str, parameters: dict[str, Any]) -> list[dict[str, Any]]:
+        """Run an analytics read while holding a report concurrency slot."""
+        async with _report_sem:
+            return await self.neo4j_client.execute_read(query, parameters)
+    
+    async def _read_stream(
+        self,
+        query: str,
+        parameters: dict[str, Any],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream an analytics read, holding a concurrency slot until drained."""
+        async with _report_sem:
+            async for row in self.neo4j_client.execute_read_stream(query, parameters):
+                yield row
+    
+    @staticmethod
+    def _metrics_dict_from_row(row: dict[str, Any], total_key: str) -> dict[str, Any]:
+        """Build metrics from an aggregated row with bucketed complexity counts.
+        
+        Rows come from our own aggregations, which already assemble the
+        distribution map in Cypher, so values are only coerced, not validated.
+        """
+        return {
+            "avg_complexity": float(row["avg_complexity"] or 0),
+            "max_complexity": float(row["max_complexity"] or 0),
+            "min_complexity": float(row["min_complexity"] or 0),
+            "total_functions": int(row[total_key] or 0),
+            "high_complexity_count": int(row["high_complexity_count"] or 0),
+            "complexity_distribution": row["complexity_distribution"],
+        }
+    
+    @classmethod
+    def _trend_dict_from_row(cls, row: dict[str, Any]) -> dict[str, Any]:
+        """Convert a per-day aggregate row into a trend point payload."""
+        return {
+            "date": row["day"].isoformat(),
+            "metrics": cls._metrics_dict_from_row(row, "total_functions"),
+        }
+    
+    @classmethod
+    def _language_dict_from_row(cls, row: dict[str, Any]) -> dict[str, Any]:
+        """Convert a per-language aggregate row into a comparison payload."""
+        return {
+            "language": row["language"],
+            "metrics": cls._metrics_dict_from_row(row, "sample_size"),
+            "sample_size": int(row["sample_size"] or 0),
+        }
+    
+    @classmethod
+    def _trend_from_row(cls, row: dict[str, Any]) -> ComplexityTrend:
+        """Convert a per-day aggregate row into a trend point."""
+        trend = cls._trend_dict_from_row(row)
+        return ComplexityTrend.model_construct(
+            date=trend["date"],
+            metrics=ComplexityMetrics.model_construct(**trend["metrics"]),
+        )
+    
+    @classmethod
+    def _language_from_row(cls, row: dict[str, Any]) -> LanguageComplexity:
+        """Convert a per-language aggregate row into a comparison entry."""
+        language = cls._language_dict_from_row(row)
+        return LanguageComplexity.model_construct(
+            language=language["language"],
+            metrics=ComplexityMetrics.model_construct(**language["metrics"]),
+            sample_size=language["sample_size"],
+        )
+    
+    def _user_stats_from_row(
+        self,
+        user_id: str,
+        days: int,
+        row: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Convert a per-user aggregate row into the user statistics payload."""
+        if row is None:
             return {
                 "user_id": user_id,
                 "period_days": days,
                 "no_data": True
             }
         
-        row = results[0]
         total_submissions = int(row["total_submissions"] or 0)
         
         return {
@@ -243,110 +698,49 @@ class ComplexityAnalytics:
             )
         }
     
-    async def generate_complexity_report(
-        self,
-        days: int = 30
-    ) -> dict[str, Any]:
-        """Generate comprehensive complexity report."""
-        # Run analytics in parallel
-        trends_task = asyncio.create_task(
-            self.get_complexity_trends(days)
-        )
-        languages_task = asyncio.create_task(
-            self.get_language_complexity_comparison(days)
-        )
-        hotspots_task = asyncio.create_task(
-            self.get_complexity_hotspots()
-        )
-        
-        trends, languages, hotspots = await asyncio.gather(
-            trends_task, languages_task, hotspots_task
-        )
-        
-        # Calculate summary statistics
-        if trends:
-            latest_metrics = trends[-1].metrics
-            avg_trend = sum(t.metrics.avg_complexity for t in trends) / len(trends)
-        else:
-            latest_metrics = ComplexityMetrics(
-                avg_complexity=0, max_complexity=0, min_complexity=0,
-                total_functions=0, high_complexity_count=0,
-                complexity_distribution={}
-            )
-            avg_trend = 0
-        
+    @staticmethod
+    def _hotspot_from_row(row: dict[str, Any]) -> dict[str, Any]:
+        """Convert a hotspot row into the report payload shape."""
         return {
-            "report_date": datetime.now().isoformat(),
-            "period_days": days,
-            "summary": {
-                "current_avg_complexity": latest_metrics.avg_complexity,
-                "trend_avg_complexity": avg_trend,
-                "total_hotspots": len(hotspots),
-                "languages_analyzed": len(languages),
-            },
-            "trends": [t.dict() for t in trends],
-            "language_comparison": [l.dict() for l in languages],
-            "complexity_hotspots": hotspots,
-            "recommendations": self._generate_recommendations(
-                latest_metrics, hotspots, languages
-            )
+            "code_hash": row["code_hash"],
+            "complexity": float(row["complexity"]),
+            "functions": row["functions"] or [],
+            "classes": row["classes"] or [],
+            "language": row["language"],
+            "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None,
+            "issues": row["issues"] or "",
+            "refactor_priority": "HIGH" if row["complexity"] > 20 else "MEDIUM"
         }
     
     def _calculate_complexity_grade(self, avg_complexity: float) -> str:
         """Calculate complexity grade based on average complexity."""
-        if avg_complexity <= 2:
-            return "A"  # Excellent
-        elif avg_complexity <= 5:
-            return "B"  # Good
-        elif avg_complexity <= 10:
-            return "C"  # Acceptable
-        elif avg_complexity <= 15:
-            return "D"  # Needs improvement
-        else:
-            return "F"  # Poor
+        return _GRADES[bisect.bisect_left(_GRADE_THRESHOLDS, avg_complexity)]
     
     def _generate_recommendations(
         self,
-        current_metrics: ComplexityMetrics,
+        current_metrics: dict[str, Any],
         hotspots: list[dict],
-        languages: list[LanguageComplexity]
+        languages: list[dict[str, Any]]
     ) -> list[str]:
         """Generate actionable recommendations."""
-        recommendations = []
-        
-        if current_metrics.avg_complexity > 10:
-            recommendations.append(
-                "Consider refactoring: Average complexity is high (>10). "
-                "Break down complex functions into smaller, focused functions."
-            )
-        
-        if current_metrics.high_complexity_count > 0:
-            recommendations.append(
-                f"Refactor {current_metrics.high_complexity_count} high-complexity functions. "
-                "Use design patterns like Strategy or Command to reduce complexity."
-            )
-        
-        if len(hotspots) > 5:
-            recommendations.append(
-                "Multiple complexity hotspots detected. Prioritize refactoring "
-                "the most complex functions first."
-            )
-        
-        # Language-specific recommendations
-        for lang in languages:
-            if lang.metrics.avg_complexity > 15:
-                recommendations.append(
-                    f"{lang.language}: Very high complexity detected. "
-                    "Consider using language-specific patterns to simplify code."
-                )
-        
-        if not recommendations:
-            recommendations.append(
-                "Code complexity is within acceptable ranges. "
-                "Continue following good coding practices."
-            )
-        
-        return recommendations
+        return list(_recommendations_for(
+            current_metrics["avg_complexity"] > 10,
+            current_metrics["high_complexity_count"],
+            len(hotspots) > 5,
+            tuple(
+                lang["language"] for lang in languages
+                if lang["metrics"]["avg_complexity"] > 15
+            ),
+        ))
 
 
-__all__ = ["ComplexityAnalytics", "ComplexityMetrics", "ComplexityTrend", "LanguageComplexity"]
+__all__ = [
+    "ComplexityAnalytics",
+    "ComplexityMetrics",
+    "ComplexityTrend",
+    "LanguageComplexity",
+    "COMPLEXITY_CACHE_PREFIX",
+    "COMPLEXITY_GENERATION_KEY",
+    "ROLLUP_UPSERT_CLAUSE",
+    "invalidate_complexity_cache",
+]
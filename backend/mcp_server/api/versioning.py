@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import inspect
+import re
 from enum import Enum
 from typing import Any, Callable, Optional
 
 from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.routing import APIRoute
 from pydantic import BaseModel
 
@@ -16,6 +19,22 @@ class APIVersion(str, Enum):
     V2 = "v2"
 
 
+# Version tokens are looked up rather than coerced through the enum so that
+# unknown versions fall through without raising on the request path.
+_VERSION_MAP: dict[str, APIVersion] = {version.value: version for version in APIVersion}
+_VERSION_PATH_RE = re.compile(r"^/api/(v\d+)(?:/|$)")
+_VERSION_ACCEPT_RE = re.compile(r"vnd\.ultimate-mcp\.(v\d+)")
+
+# Versioned payloads are assembled as plain dicts, so encode them directly
+# (with orjson when installed) instead of validating a VersionedResponse.
+try:
+    import orjson  # noqa: F401
+
+    _VersionedJSONResponse: type[JSONResponse] = ORJSONResponse
+except ImportError:  # pragma: no cover - optional dependency
+    _VersionedJSONResponse = JSONResponse
+
+
 class VersionedResponse(BaseModel):
     """Base response with version information."""
     api_version: str
@@ -24,6 +43,26 @@ class VersionedResponse(BaseModel):
     migration_guide: Optional[str] = None
 
 
+def _make_versioned_endpoint(
+    func: Callable,
+    scaffold: dict[str, Any],
+    is_async: bool,
+) -> Callable:
+    """Wrap ``func`` so dict results carry the route's version metadata.
+    
+    Built in its own scope so each route binds its own scaffold rather than
+    the last value of the registration loop.
+    """
+    async def versioned_func(*args, **kwargs):
+        result = await func(*args, **kwargs) if is_async else func(*args, **kwargs)
+        
+        if isinstance(result, dict):
+            return _VersionedJSONResponse({**scaffold, "data": result})
+        return result
+    
+    return versioned_func
+
+
 class APIVersioning:
     """API versioning manager."""
     
@@ -45,28 +84,19 @@ class APIVersioning:
     def extract_version(self, request: Request) -> APIVersion:
         """Extract API version from request."""
         # Try path first (/api/v1/...)
-        path_parts = request.url.path.split("/")
-        if len(path_parts) >= 3 and path_parts[1] == "api":
-            version_str = path_parts[2]
-            try:
-                return APIVersion(version_str)
-            except ValueError:
-                pass
+        match = _VERSION_PATH_RE.match(request.url.path)
+        if match and (version := _VERSION_MAP.get(match.group(1))):
+            return version
         
         # Try Accept header (Accept: application/vnd.ultimate-mcp.v2+json)
-        accept_header = request.headers.get("accept", "")
-        if "vnd.ultimate-mcp.v2" in accept_header:
-            return APIVersion.V2
-        elif "vnd.ultimate-mcp.v1" in accept_header:
-            return APIVersion.V1
+        match = _VERSION_ACCEPT_RE.search(request.headers.get("accept", ""))
+        if match and (version := _VERSION_MAP.get(match.group(1))):
+            return version
         
         # Try custom header
-        version_header = request.headers.get("X-API-Version")
-        if version_header:
-            try:
-                return APIVersion(version_header)
-            except ValueError:
-                pass
+        version = _VERSION_MAP.get(request.headers.get("X-API-Version", ""))
+        if version:
+            return version
         
         return self.default_version
     
@@ -83,30 +113,30 @@ class APIVersioning:
                 # This will be handled by the router
                 return func(*args, **kwargs)
             
+            is_async = inspect.iscoroutinefunction(func)
+            
             # Add endpoint to specified version routers
             for version in versions:
                 router = self.routers[version]
                 is_deprecated = version in deprecated_versions
                 
-                # Modify the function to add version info
-                async def versioned_func(*args, **kwargs):
-                    result = await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
-                    
-                    if isinstance(result, dict):
-                        return VersionedResponse(
-                            api_version=version.value,
-                            data=result,
-                            deprecated=is_deprecated,
-                            migration_guide=f"https://docs.ultimate-mcp.com/migration/{version.value}" if is_deprecated else None
-                        )
-                    return result
+                # Version metadata is fixed per route, so build it once here and
+                # only attach the payload per request.
+                scaffold = {
+                    "api_version": version.value,
+                    "deprecated": is_deprecated,
+                    "migration_guide": (
+                        f"https://docs.ultimate-mcp.com/migration/{version.value}"
+                        if is_deprecated else None
+                    ),
+                }
                 
                 # Register with router
                 router.add_api_route(
                     path=func.__name__.replace("_", "-"),
-                    endpoint=versioned_func,
+                    endpoint=_make_versioned_endpoint(func, scaffold, is_async),
                     methods=["POST"],
-                    response_model=VersionedResponse if not is_deprecated else None,
+                    response_model=None,
                     deprecated=is_deprecated,
                 )
             
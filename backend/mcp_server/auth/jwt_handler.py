@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any, TYPE_CHECKING
 
@@ -13,25 +16,70 @@ if TYPE_CHECKING:
     from .token_blacklist import TokenBlacklist
 
 
+def _load_key_pair(
+    private_key_pem: bytes | str | None,
+    public_key_pem: bytes | str | None,
+) -> tuple[Any, Any]:
+    """Load PEM-encoded signing and verification keys."""
+    from cryptography.hazmat.primitives import serialization
+
+    private_key = None
+    if private_key_pem is not None:
+        if isinstance(private_key_pem, str):
+            private_key_pem = private_key_pem.encode("utf-8")
+        private_key = serialization.load_pem_private_key(private_key_pem, password=None)
+
+    if public_key_pem is not None:
+        if isinstance(public_key_pem, str):
+            public_key_pem = public_key_pem.encode("utf-8")
+        public_key = serialization.load_pem_public_key(public_key_pem)
+    else:
+        public_key = private_key.public_key()  # type: ignore[union-attr]
+
+    return private_key, public_key
+
+
 class JWTHandler:
     """Handle JWT token creation and validation with revocation support."""
 
     def __init__(
         self,
-        secret_key: str,
-        algorithm: str = "HS256",
+        secret_key: str | None = None,
+        algorithm: str | None = None,
         token_blacklist: "TokenBlacklist | None" = None,
+        verify_cache_size: int = 10_000,
+        *,
+        private_key_pem: bytes | str | None = None,
+        public_key_pem: bytes | str | None = None,
     ):
         """Initialize JWT handler.
 
         Args:
-            secret_key: Secret key for signing tokens
-            algorithm: JWT algorithm
+            secret_key: Secret key for HMAC-signed tokens
+            algorithm: JWT algorithm; defaults to EdDSA when PEM keys are given,
+                otherwise HS256
             token_blacklist: Optional token blacklist for revocation checks
+            verify_cache_size: Maximum verified tokens kept; 0 disables caching
+            private_key_pem: PEM-encoded private key used to sign tokens
+            public_key_pem: PEM-encoded public key used to verify tokens;
+                derived from the private key when omitted
         """
+        asymmetric = private_key_pem is not None or public_key_pem is not None
+
         self.secret_key = secret_key
-        self.algorithm = algorithm
+        self.algorithm = algorithm or ("EdDSA" if asymmetric else "HS256")
         self.token_blacklist = token_blacklist
+        self.verify_cache_size = verify_cache_size
+        # Verified payloads keyed by token digest, stored with their ``exp``
+        self._verified: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+
+        # Parse keys once; PyJWT accepts key objects and skips re-parsing them.
+        self._signing_key: Any = secret_key
+        self._verifying_key: Any = secret_key
+        if asymmetric:
+            self._signing_key, self._verifying_key = _load_key_pair(
+                private_key_pem, public_key_pem
+            )
 
     def create_token(
         self,
@@ -65,7 +113,9 @@ class JWTHandler:
         if additional_claims:
             payload.update(additional_claims)
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        if self._signing_key is None:
+            raise ValueError("JWTHandler has no signing key configured")
+        return jwt.encode(payload, self._signing_key, algorithm=self.algorithm)
 
     def verify_token(self, token: str) -> dict[str, Any]:
         """Verify and decode JWT token without revocation check.
@@ -79,8 +129,31 @@ class JWTHandler:
         Raises:
             jwt.InvalidTokenError: If token is invalid
         """
+        if self.verify_cache_size <= 0:
+            return self._decode(token)
+
+        # Tokens are immutable until they expire, so a successful verification
+        # can be reused until ``exp``; the digest only serves as a map key.
+        key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+        cached = self._verified.get(key)
+        if cached is not None:
+            payload, expires_at = cached
+            if time.time() < expires_at:
+                self._verified.move_to_end(key)
+                return dict(payload)
+            del self._verified[key]
+
+        payload = self._decode(token)
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            self._verified[key] = (payload, float(expires_at))
+            if len(self._verified) > self.verify_cache_size:
+                self._verified.popitem(last=False)
+        return dict(payload)
+
+    def _decode(self, token: str) -> dict[str, Any]:
         return jwt.decode(
-            token, self.secret_key, algorithms=[self.algorithm], issuer="ultimate-mcp"
+            token, self._verifying_key, algorithms=[self.algorithm], issuer="ultimate-mcp"
         )
 
     async def verify_token_with_revocation(self, token: str) -> dict[str, Any]:
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from dataclasses import dataclass
 from functools import lru_cache
+from typing import Any, TypeVar
 
 from pydantic import AliasChoices, Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -61,10 +63,14 @@ class DatabaseConfig(SettingsBase):
     )
     max_connection_pool_size: int = Field(
         default=50,
-        validation_alias=AliasChoices("NEO4J_MAX_POOL_SIZE", "max_connection_pool_size"),
+        validation_alias=AliasChoices(
+            "NEO4J_MAX_POOL_SIZE",
+            "NEO4J_MAX_CONNECTION_POOL_SIZE",
+            "max_connection_pool_size",
+        ),
     )
-    connection_acquisition_timeout: int = Field(
-        default=30,
+    connection_acquisition_timeout: float = Field(
+        default=5.0,
         validation_alias=AliasChoices(
             "NEO4J_ACQUISITION_TIMEOUT",
             "connection_acquisition_timeout",
@@ -91,6 +97,14 @@ class SecurityConfig(SettingsBase):
         default="HS256",
         validation_alias=AliasChoices("JWT_ALGORITHM", "jwt_algorithm"),
     )
+    jwt_private_key_path: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices("JWT_PRIVATE_KEY_PATH", "jwt_private_key_path"),
+    )
+    jwt_public_key_path: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices("JWT_PUBLIC_KEY_PATH", "jwt_public_key_path"),
+    )
     jwt_expiration_hours: int = Field(
         default=24,
         validation_alias=AliasChoices("JWT_EXPIRATION_HOURS", "jwt_expiration_hours"),
@@ -287,15 +301,145 @@ class UltimateMCPConfig(SettingsBase):
             raise ValueError("Metrics should be enabled in production")
 
 
+# Frozen snapshots of the validated settings. Request-path code reads config
+# on every call, and plain slot access is cheaper than going through the
+# settings models; freezing also stops anything mutating shared config.
+@dataclass(slots=True, frozen=True)
+class FrozenDatabaseConfig:
+    """Immutable database configuration."""
+
+    uri: str
+    user: str
+    password: SecretStr | None
+    database: str
+    max_connection_lifetime: int
+    max_connection_pool_size: int
+    connection_acquisition_timeout: float
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenSecurityConfig:
+    """Immutable security configuration."""
+
+    secret_key: SecretStr | None
+    auth_token: SecretStr | None
+    encryption_key: SecretStr | None
+    jwt_algorithm: str
+    jwt_private_key_path: str | None
+    jwt_public_key_path: str | None
+    jwt_expiration_hours: int
+    rate_limit_requests_per_minute: int
+    rate_limit_requests_per_hour: int
+    rate_limit_requests_per_day: int
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenServerConfig:
+    """Immutable server configuration."""
+
+    host: str
+    port: int
+    debug: bool
+    reload: bool
+    allowed_origins: tuple[str, ...]
+    allowed_methods: tuple[str, ...]
+    allowed_headers: tuple[str, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenExecutionConfig:
+    """Immutable code execution configuration."""
+
+    max_execution_time: float
+    max_memory_mb: int
+    max_file_size_mb: int
+    max_processes: int
+    supported_languages: tuple[str, ...]
+    cache_enabled: bool
+    cache_size: int
+    cache_ttl_seconds: int
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenMonitoringConfig:
+    """Immutable monitoring configuration."""
+
+    metrics_enabled: bool
+    metrics_port: int
+    log_level: str
+    log_format: str
+    log_file: str | None
+    health_check_interval: int
+    slow_query_threshold: float
+    enable_profiling: bool
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenRedisConfig:
+    """Immutable Redis configuration."""
+
+    enabled: bool
+    url: str
+    max_connections: int
+    default_ttl: int
+    key_prefix: str
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenConfig:
+    """Immutable snapshot of :class:`UltimateMCPConfig`."""
+
+    environment: str
+    database: FrozenDatabaseConfig
+    security: FrozenSecurityConfig
+    server: FrozenServerConfig
+    execution: FrozenExecutionConfig
+    monitoring: FrozenMonitoringConfig
+    redis: FrozenRedisConfig
+    is_production: bool
+    is_development: bool
+
+    @classmethod
+    def from_settings(cls, settings: UltimateMCPConfig) -> FrozenConfig:
+        """Materialize a validated settings model into a frozen snapshot."""
+        return cls(
+            environment=settings.environment,
+            database=_freeze(FrozenDatabaseConfig, settings.database),
+            security=_freeze(FrozenSecurityConfig, settings.security),
+            server=_freeze(FrozenServerConfig, settings.server),
+            execution=_freeze(FrozenExecutionConfig, settings.execution),
+            monitoring=_freeze(FrozenMonitoringConfig, settings.monitoring),
+            redis=_freeze(FrozenRedisConfig, settings.redis),
+            is_production=settings.is_production,
+            is_development=settings.is_development,
+        )
+
+
+_F = TypeVar("_F")
+
+
+def _freeze(frozen_cls: type[_F], section: SettingsBase) -> _F:
+    """Copy a settings section into its frozen mirror, turning lists into tuples.
+
+    Values are taken from the model's own fields, so a settings field without
+    a frozen counterpart (or vice versa) raises ``TypeError`` instead of being dropped.
+    """
+    values: dict[str, Any] = {}
+    for name in type(section).model_fields:
+        value = getattr(section, name)
+        values[name] = tuple(value) if isinstance(value, list) else value
+    return frozen_cls(**values)
+
+
 @lru_cache
-def get_config() -> UltimateMCPConfig:
-    """Return a cached configuration instance."""
+def get_config() -> FrozenConfig:
+    """Return a cached, immutable configuration snapshot."""
     config = UltimateMCPConfig()
 
     if config.is_production:
         config.validate_production_settings()
 
-    return config
+    return FrozenConfig.from_settings(config)
 
 
 __all__ = [
@@ -306,6 +450,7 @@ __all__ = [
     "ExecutionConfig",
     "MonitoringConfig",
     "RedisConfig",
+    "FrozenConfig",
     "get_config",
     "config",
 ]
@@ -2,14 +2,77 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Any
+import re
+import time
+from typing import Any, NamedTuple
 
 from .neo4j_client import Neo4jClient
 from ..utils.cache import QueryCache, get_cache
 
 logger = logging.getLogger(__name__)
 
+# Write clauses invalidate the cache; word boundaries keep identifiers such
+# as ``reset`` or ``dataset`` from being mistaken for ``SET``.
+_WRITE_RE = re.compile(r"\b(?:CREATE|MERGE|SET|DELETE|REMOVE|DROP)\b", re.IGNORECASE)
+
+# Read-only clauses and schema procedures worth caching
+_READ_RE = re.compile(
+    r"\b(?:MATCH|RETURN|WITH|UNWIND|CALL\s+db\.(?:labels|relationshipTypes|schema))\b",
+    re.IGNORECASE,
+)
+
+# Schema procedures whose results only change when the graph's labels,
+# relationship types or indexes change
+_SCHEMA_RE = re.compile(r"^\s*CALL\s+db\.", re.IGNORECASE)
+
+_SCHEMA_MEMO_TTL = 300.0
+
+# Labels like :User, :Service, etc.
+_LABEL_RE = re.compile(r":(\w+)")
+
+# Tag for cached reads that name no label or relationship type; such results
+# can change with any write, so every write invalidates this tag.
+_ANY_LABEL = "*"
+
+
+class _QueryClass(NamedTuple):
+    """Caching behaviour derived from a Cypher query's text."""
+
+    cacheable: bool
+    invalidates: bool
+    schema: bool
+    labels: tuple[str, ...]
+    # Cache tags a read is stored under, or a write invalidates
+    tags: tuple[str, ...]
+    # Stable across restarts, unlike ``hash()``; only used for log correlation
+    qhash: str
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify(query: str) -> _QueryClass:
+    """Classify a query once; servers replay a small set of templates."""
+    invalidates = _WRITE_RE.search(query) is not None
+    cacheable = not invalidates and _READ_RE.search(query) is not None
+    labels = tuple(dict.fromkeys(_LABEL_RE.findall(query))) if invalidates or cacheable else ()
+    if invalidates:
+        tags = labels + (_ANY_LABEL,)
+    elif cacheable:
+        tags = labels or (_ANY_LABEL,)
+    else:
+        tags = ()
+    return _QueryClass(
+        cacheable=cacheable,
+        invalidates=invalidates,
+        schema=cacheable and _SCHEMA_RE.match(query) is not None,
+        labels=labels,
+        tags=tags,
+        qhash=hashlib.blake2b(query.encode(), digest_size=8).hexdigest(),
+    )
+
 
 class CachedNeo4jClient(Neo4jClient):
     """Neo4j client with intelligent query caching."""
@@ -17,77 +80,143 @@ class CachedNeo4jClient(Neo4jClient):
     def __init__(self, *args, cache: QueryCache | None = None, **kwargs):
         super().__init__(*args, **kwargs)
         self.cache = cache or get_cache()
-        
-        # Queries that should be cached (read-only, expensive operations)
-        self.cacheable_patterns = {
-            "MATCH", "RETURN", "WITH", "UNWIND", "CALL db.labels()", 
-            "CALL db.relationshipTypes()", "CALL db.schema"
-        }
-        
-        # Queries that invalidate cache (write operations)
-        self.invalidating_patterns = {
-            "CREATE", "MERGE", "SET", "DELETE", "REMOVE", "DROP"
-        }
+        # Process-local memo for parameter-less schema procedures, cleared on
+        # every write because any write may add or remove a label or type.
+        # Entries still expire so writes from other processes are picked up.
+        self._schema_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._inflight: dict[str, asyncio.Future[list[dict[str, Any]]]] = {}
+        # Strong references keep scheduled invalidations alive until they finish
+        self._pending_invalidations: set[asyncio.Task[None]] = set()
     
     def _should_cache(self, query: str) -> bool:
         """Determine if query should be cached."""
-        query_upper = query.upper().strip()
-        
-        # Don't cache write operations
-        if any(pattern in query_upper for pattern in self.invalidating_patterns):
-            return False
-        
-        # Cache read operations
-        return any(pattern in query_upper for pattern in self.cacheable_patterns)
+        return _classify(query).cacheable
     
     def _should_invalidate(self, query: str) -> bool:
         """Determine if query should invalidate cache."""
-        query_upper = query.upper().strip()
-        return any(pattern in query_upper for pattern in self.invalidating_patterns)
+        return _classify(query).invalidates
     
     async def execute_read(
         self, query: str, parameters: dict[str, Any] | None = None
     ) -> list[dict[str, Any]]:
         """Execute read query with caching."""
-        # Try cache first for cacheable queries
-        if self._should_cache(query):
-            cached_result = await self.cache.get(query, parameters)
+        query_class = _classify(query)
+        cacheable = query_class.cacheable
+        memoize = query_class.schema and not parameters
+        if memoize:
+            memoized = self._schema_cache.get(query)
+            if memoized is not None and memoized[0] > time.monotonic():
+                return memoized[1]
+        
+        if not cacheable:
+            return await super().execute_read(query, parameters)
+
+        # Concurrent misses for the same query and parameters share one
+        # database read instead of stampeding Neo4j while the cache is cold
+        key = self.cache.make_key(query, parameters)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            cached_result = await self.cache.get_value(key)
             if cached_result is not None:
-                logger.debug("Cache hit", extra={"query_hash": hash(query)})
+                logger.debug("Cache hit", extra={"query_hash": query_class.qhash})
+                if memoize:
+                    self._schema_cache[query] = (time.monotonic() + _SCHEMA_MEMO_TTL, cached_result)
                 return cached_result
-        
-        # Execute query
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = asyncio.ensure_future(
+                    self._read_through(query, parameters, query_class)
+                )
+                self._inflight[key] = inflight
+                inflight.add_done_callback(functools.partial(self._inflight_done, key))
+
+        # Shielded so one cancelled caller does not cancel the read for the rest
+        result = await asyncio.shield(inflight)
+        if memoize and result:
+            self._schema_cache[query] = (time.monotonic() + _SCHEMA_MEMO_TTL, result)
+        return result
+
+    async def _read_through(
+        self, query: str, parameters: dict[str, Any] | None, query_class: _QueryClass
+    ) -> list[dict[str, Any]]:
+        """Read from Neo4j and populate the cache."""
         result = await super().execute_read(query, parameters)
         
-        # Cache the result if appropriate
-        if self._should_cache(query) and result:
+        if result:
             # Use shorter TTL for frequently changing data
             ttl = 60 if "timestamp" in query.lower() else 300
-            await self.cache.set(query, result, parameters, ttl)
-            logger.debug("Cached query result", extra={"query_hash": hash(query), "ttl": ttl})
+            await self.cache.set(
+                query, result, parameters=parameters, ttl=ttl, tags=query_class.tags
+            )
+            logger.debug(
+                "Cached query result", extra={"query_hash": query_class.qhash, "ttl": ttl}
+            )
         
         return result
+
+    def _inflight_done(self, key: str, task: asyncio.Future[list[dict[str, Any]]]) -> None:
+        """Forget a finished shared read, retrieving its error if nobody awaited it."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
     
-    async def execute_write(self, query: str, parameters: dict[str, Any] | None = None) -> None:
-        """Execute write query and invalidate relevant cache entries."""
+    async def execute_write(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None = None,
+        *,
+        await_invalidation: bool = False,
+    ) -> None:
+        """Execute write query and invalidate relevant cache entries.
+
+        Invalidation only affects later reads, so it runs in the background
+        once the write has committed. Pass ``await_invalidation=True`` when
+        the caller reads its own write back through the cache immediately.
+        """
         # Execute the write
         await super().execute_write(query, parameters)
         
         # Invalidate cache for write operations
-        if self._should_invalidate(query):
-            # Extract table/label names for targeted invalidation
-            query_upper = query.upper()
-            if ":" in query:
-                # Extract labels like :User, :Service, etc.
-                import re
-                labels = re.findall(r':(\w+)', query)
-                for label in labels:
-                    await self.cache.invalidate_pattern(label)
-            else:
-                # Broad invalidation for complex queries
-                await self.cache.invalidate_pattern("")
-            
-            logger.debug("Invalidated cache", extra={"query_hash": hash(query)})
+        query_class = _classify(query)
+        if not query_class.invalidates:
+            return
+
+        self._schema_cache.clear()
+
+        # Only entries whose reads named one of the written labels are dropped.
+        # A write naming no label cannot be attributed; it drops label-less
+        # reads and leaves labelled entries to expire by TTL rather than
+        # flushing the whole cache.
+        if await_invalidation:
+            await self._invalidate(query_class.tags, query_class.qhash)
+            return
+
+        task = asyncio.create_task(self._invalidate(query_class.tags, query_class.qhash))
+        self._pending_invalidations.add(task)
+        task.add_done_callback(self._invalidation_done)
+
+    async def _invalidate(self, tags: tuple[str, ...], query_hash: str) -> None:
+        """Drop cached entries stored under any of ``tags``."""
+        removed = await self.cache.invalidate_tags(tags)
+        logger.debug("Invalidated cache", extra={"query_hash": query_hash, "entries": removed})
+
+    def _invalidation_done(self, task: asyncio.Task[None]) -> None:
+        """Release a finished invalidation and log its failure, if any."""
+        self._pending_invalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                "Cache invalidation failed", extra={"error": str(task.exception())}
+            )
+
+    async def flush_invalidations(self) -> None:
+        """Wait for all scheduled cache invalidations to finish."""
+        if self._pending_invalidations:
+            await asyncio.gather(*self._pending_invalidations, return_exceptions=True)
 
+    async def close(self) -> None:
+        """Finish pending invalidations before releasing the driver."""
+        await self.flush_invalidations()
+        await super().close()
 
 __all__ = ["CachedNeo4jClient"]
@@ -48,6 +48,18 @@ class IndexManager:
                 CREATE INDEX lint_result_hash IF NOT EXISTS
                 FOR (n:LintResult) ON (n.code_hash)
             """,
+            "lint_result_timestamp": """
+                CREATE INDEX lint_result_timestamp IF NOT EXISTS
+                FOR (n:LintResult) ON (n.timestamp)
+            """,
+            "lint_result_user_time": """
+                CREATE INDEX lint_result_user_time IF NOT EXISTS
+                FOR (n:LintResult) ON (n.user_id, n.timestamp)
+            """,
+            "lint_result_complexity": """
+                CREATE INDEX lint_result_complexity IF NOT EXISTS
+                FOR (n:LintResult) ON (n.complexity)
+            """,
             "execution_result_timestamp": """
                 CREATE INDEX execution_result_timestamp IF NOT EXISTS
                 FOR (n:ExecutionResult) ON (n.timestamp)
@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Any, Awaitable, Callable, TypeVar
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 
-from neo4j import AsyncGraphDatabase, AsyncManagedTransaction
-from neo4j.exceptions import Neo4jError, ServiceUnavailable, SessionExpired
+from neo4j import AsyncDriver, AsyncGraphDatabase, AsyncManagedTransaction, AsyncSession
+from neo4j.exceptions import DriverError, Neo4jError, ServiceUnavailable, SessionExpired
 from tenacity import (
     retry,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
     retry_if_exception_type,
     before_sleep_log,
 )
@@ -29,6 +33,83 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Graph-wide counts gathered in one round-trip; each subquery aggregates to a
+# single row so the statement always returns exactly one record.
+_GRAPH_METRICS_QUERY = """
+CALL {
+    MATCH (n)
+    RETURN count(n) AS node_count
+}
+CALL {
+    MATCH ()-[r]->()
+    RETURN count(r) AS relationship_count
+}
+CALL {
+    MATCH (n)
+    UNWIND labels(n) AS label
+    WITH label, count(*) AS occurrences
+    RETURN collect({label: label, occurrences: occurrences}) AS labels
+}
+CALL {
+    MATCH ()-[r]->()
+    WITH type(r) AS rel_type, count(*) AS occurrences
+    RETURN collect({rel_type: rel_type, occurrences: occurrences}) AS relationship_types
+}
+RETURN node_count, relationship_count, labels, relationship_types
+"""
+
+
+@dataclass
+class _SharedDriver:
+    driver: AsyncDriver
+    max_pool_size: int
+    refs: int = 0
+    # Sessions open across every client using this driver
+    sessions_in_use: int = 0
+
+
+# The driver owns the connection pool. Clients pointing at the same server with
+# the same credentials share one driver so pooled Bolt/TLS connections are
+# reused process-wide instead of each client building its own pool.
+_DRIVER_CACHE: dict[tuple[str, str, str], _SharedDriver] = {}
+
+
+def _acquire_driver(
+    uri: str, user: str, password: str, **options: Any
+) -> tuple[tuple[str, str, str], _SharedDriver]:
+    """Return the shared driver for ``(uri, user, password)``, creating it if needed.
+
+    Pool options only apply when the driver is first created.
+    """
+    key = (uri, user, password)
+    shared = _DRIVER_CACHE.get(key)
+    if shared is None:
+        shared = _SharedDriver(
+            AsyncGraphDatabase.driver(uri, auth=(user, password), **options),
+            max_pool_size=options["max_connection_pool_size"],
+        )
+        _DRIVER_CACHE[key] = shared
+    shared.refs += 1
+    return key, shared
+
+
+def _release_driver(key: tuple[str, str, str]) -> AsyncDriver | None:
+    """Drop a reference to a shared driver, returning it once it is unused."""
+    shared = _DRIVER_CACHE.get(key)
+    if shared is None:
+        return None
+    shared.refs -= 1
+    if shared.refs > 0:
+        return None
+    del _DRIVER_CACHE[key]
+    return shared.driver
+
+
+DEFAULT_MAX_POOL_SIZE = 50
+# Connections opened by warm_pool() by default; enough to absorb the first
+# burst without a thundering herd of handshakes on every start.
+DEFAULT_WARM_CONNECTIONS = 4
+
 
 class Neo4jClient:
     """Minimal facade around the Neo4j async driver."""
@@ -52,26 +133,25 @@ class Neo4jClient:
             user: Database user
             password: Database password
             database: Database name
-            max_connection_pool_size: Maximum connections in pool (auto-calculated if None)
+            max_connection_pool_size: Maximum connections in pool (default: 50)
             connection_acquisition_timeout: Timeout for acquiring connection (default: 5.0s)
             max_connection_lifetime: Max lifetime of connections in seconds (default: 3600s)
             enable_circuit_breaker: Enable circuit breaker pattern (default: True)
         """
-        # Auto-calculate optimal pool size if not provided
+        # Queries are I/O-bound on the async driver, so the pool is sized for
+        # concurrent tool calls rather than CPU count; small pools serialize them.
         if max_connection_pool_size is None:
-            import multiprocessing
-            cpu_count = multiprocessing.cpu_count()
-            # Formula: pool_size = cpu_count * 2 + spare_connections
-            # Cap at 100 to prevent resource exhaustion
-            max_connection_pool_size = min(cpu_count * 2 + 4, 100)
+            max_connection_pool_size = DEFAULT_MAX_POOL_SIZE
 
         # Use shorter timeout for fail-fast behavior
         if connection_acquisition_timeout is None:
             connection_acquisition_timeout = 5.0
 
-        self._driver = AsyncGraphDatabase.driver(
+        self._driver_key: tuple[str, str, str] | None
+        self._driver_key, self._shared = _acquire_driver(
             uri,
-            auth=(user, password),
+            user,
+            password,
             max_connection_lifetime=max_connection_lifetime,
             max_connection_pool_size=max_connection_pool_size,
             connection_acquisition_timeout=connection_acquisition_timeout,
@@ -80,7 +160,11 @@ class Neo4jClient:
             connection_timeout=10.0,  # Initial connection timeout
             max_transaction_retry_time=15.0,  # Max retry time for transactions
         )
+        self._driver = self._shared.driver
         self._database = database
+        self._max_pool_size = max_connection_pool_size
+        self._sessions_in_use = 0
+        self._probe: tuple[float, GraphMetrics | None] | None = None
 
         logger.info(
             "Neo4j connection pool configured",
@@ -111,12 +195,73 @@ class Neo4jClient:
             self.circuit_registry = None
             logger.info("Circuit breaker disabled for Neo4j client")
 
+    @property
+    def pool_stats(self) -> dict[str, int]:
+        """Session counts for the shared driver pool and for this client alone.
+
+        ``pool_in_use`` and ``pool_size`` describe the driver's pool, which
+        every client with the same server and credentials shares;
+        ``client_sessions_in_use`` counts only this client's sessions.
+        """
+        return {
+            "pool_in_use": self._shared.sessions_in_use,
+            "pool_size": self._shared.max_pool_size,
+            "client_sessions_in_use": self._sessions_in_use,
+        }
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Open a session on the shared pool, counting it while it is held."""
+        shared = self._shared
+        self._sessions_in_use += 1
+        shared.sessions_in_use += 1
+        try:
+            async with self._driver.session(database=self._database) as session:
+                yield session
+        finally:
+            self._sessions_in_use -= 1
+            shared.sessions_in_use -= 1
+
     async def connect(self) -> None:
         await self._driver.verify_connectivity()
         await self._ensure_schema()
 
+    async def warm_pool(self, connections: int | None = None) -> int:
+        """Open pooled connections up front so early requests skip the handshake.
+
+        Runs ``connections`` (default: ``DEFAULT_WARM_CONNECTIONS``, never more
+        than the pool size) concurrent ``RETURN 1`` sessions; each one forces
+        the driver to establish its own connection. Returns how many
+        succeeded. Failures are logged, not raised.
+        """
+        requested = DEFAULT_WARM_CONNECTIONS if connections is None else connections
+        count = min(requested, self._shared.max_pool_size)
+
+        async def ping() -> None:
+            async with self._session() as session:
+                result = await session.run("RETURN 1")
+                await result.consume()
+
+        outcomes = await asyncio.gather(*(ping() for _ in range(count)), return_exceptions=True)
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if failures:
+            logger.warning(
+                "Neo4j pool warm-up incomplete",
+                extra={"requested": count, "failed": len(failures), "error": str(failures[0])},
+            )
+        return count - len(failures)
+
     async def close(self) -> None:
-        await self._driver.close()
+        """Release this client's hold on the shared driver.
+
+        The driver and its pool are closed once no client uses them.
+        """
+        if self._driver_key is None:
+            return
+        driver = _release_driver(self._driver_key)
+        self._driver_key = None
+        if driver is not None:
+            await driver.close()
 
     async def execute_read(
         self, query: str, parameters: dict[str, Any] | None = None
@@ -148,9 +293,11 @@ class Neo4jClient:
         else:
             return await self._execute_read_internal(query, parameters)
 
+    # Jittered backoff keeps callers that failed together from retrying in
+    # lockstep against a pool or cluster that is still recovering.
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=wait_exponential_jitter(max=10, jitter=1),
         retry=retry_if_exception_type((ServiceUnavailable, SessionExpired)),
         before_sleep=before_sleep_log(logger, logging.WARNING),
         reraise=True,
@@ -160,11 +307,72 @@ class Neo4jClient:
     ) -> list[dict[str, Any]]:
         """Internal read implementation with retry logic."""
         params = parameters or {}
-        async with self._driver.session(database=self._database) as session:
+        async with self._session() as session:
             result = await session.run(query, **params)
             records = await result.data()
             return records
 
+    async def execute_read_stream(
+        self, query: str, parameters: dict[str, Any] | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield read results record by record instead of buffering them.
+
+        Records are pulled from the Bolt cursor as they arrive, so callers can
+        process rows while the remainder of the result is still in flight.
+        Retries and the circuit breaker are not applied because a partially
+        consumed stream cannot be replayed.
+
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+
+        Yields:
+            Result records as dictionaries
+        """
+        params = parameters or {}
+        async with self._session() as session:
+            result = await session.run(query, **params)
+            async for record in result:
+                yield record.data()
+
+    async def fetch_many(
+        self, template: str, rows: list[Any], row_key: str = "row"
+    ) -> list[dict[str, Any]]:
+        """Run a read template for many inputs in a single round-trip.
+
+        The template is prefixed with ``UNWIND $batch AS <row_key>`` so each
+        entry of ``rows`` is bound to ``row_key`` server-side, replacing a loop
+        of one query per input.
+
+        Args:
+            template: Cypher read query referencing ``row_key``
+            rows: Values to unwind, one per input
+            row_key: Variable name each input is bound to
+
+        Returns:
+            Combined result records for all inputs
+        """
+        if not rows:
+            return []
+        return await self.execute_read(
+            f"UNWIND $batch AS {row_key} {template}", {"batch": list(rows)}
+        )
+
+    async def get_nodes(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch graph nodes by key with one batched query.
+
+        Args:
+            keys: Node keys to look up
+
+        Returns:
+            Mapping of key to node properties; missing keys are omitted
+        """
+        records = await self.fetch_many(
+            "MATCH (n:GraphNode {key: row}) RETURN row AS key, n AS node",
+            list(dict.fromkeys(keys)),
+        )
+        return {record["key"]: record["node"] for record in records}
+
     async def execute_write(self, query: str, parameters: dict[str, Any] | None = None) -> None:
         """Execute write query with circuit breaker and retry logic.
 
@@ -192,7 +400,7 @@ class Neo4jClient:
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=wait_exponential_jitter(max=10, jitter=1),
         retry=retry_if_exception_type((ServiceUnavailable, SessionExpired)),
         before_sleep=before_sleep_log(logger, logging.WARNING),
         reraise=True,
@@ -200,57 +408,67 @@ class Neo4jClient:
     async def _execute_write_internal(self, query: str, parameters: dict[str, Any] | None = None) -> None:
         """Internal write implementation with retry logic."""
         params = parameters or {}
-        async with self._driver.session(database=self._database) as session:
+        async with self._session() as session:
             await session.execute_write(lambda tx: tx.run(query, **params))
 
     async def execute_write_transaction(
         self, handler: Callable[[AsyncManagedTransaction], Awaitable[T]]
     ) -> T:
-        async with self._driver.session(database=self._database) as session:
+        async with self._session() as session:
             return await session.execute_write(handler)
 
     async def health_check(self) -> bool:
         try:
             await self.execute_read("RETURN 1 AS ok")
             return True
-        except Neo4jError:
+        except (Neo4jError, DriverError):
             return False
 
-    async def get_metrics(self) -> GraphMetrics:
-        async with self._driver.session(database=self._database) as session:
-            node_result = await session.run("MATCH (n) RETURN count(n) AS count")
-            node_record = await node_result.single()
-            node_count = int(node_record["count"]) if node_record else 0
+    async def cached_metrics(self, max_age: float = 2.0) -> GraphMetrics | None:
+        """Graph metrics memoized for ``max_age`` seconds; ``None`` when unreachable.
 
-            rel_result = await session.run("MATCH ()-[r]->() RETURN count(r) AS count")
-            rel_record = await rel_result.single()
-            relationship_count = int(rel_record["count"]) if rel_record else 0
+        Frequent ``/metrics`` scrapes within the TTL reach Neo4j once.
+        """
+        now = time.monotonic()
+        probe = self._probe
+        if probe is not None and now - probe[0] < max_age:
+            return probe[1]
 
-            labels_result = await session.run(
-                "MATCH (n) UNWIND labels(n) AS label RETURN label, count(*) AS occurrences"
-            )
-            label_rows = await labels_result.data()
-            labels = {row["label"]: int(row["occurrences"]) for row in label_rows}
+        metrics: GraphMetrics | None
+        try:
+            metrics = await self.get_metrics()
+        except (Neo4jError, DriverError):
+            metrics = None
+        self._probe = (now, metrics)
+        return metrics
 
-            rel_types_result = await session.run(
-                "MATCH ()-[r]->() RETURN type(r) AS rel_type, count(*) AS occurrences"
+    async def get_metrics(self) -> GraphMetrics:
+        async with self._session() as session:
+            result = await session.run(_GRAPH_METRICS_QUERY)
+            record = await result.single()
+
+        if record is None:
+            return GraphMetrics(
+                node_count=0,
+                relationship_count=0,
+                labels={},
+                relationship_types={},
+                average_degree=0.0,
             )
-            rel_rows = await rel_types_result.data()
-            relationship_types = {row["rel_type"]: int(row["occurrences"]) for row in rel_rows}
-
-            degree = 0.0
 
         return GraphMetrics(
-            node_count=node_count,
-            relationship_count=relationship_count,
-            labels=labels,
-            relationship_types=relationship_types,
-            average_degree=degree,
+            node_count=int(record["node_count"]),
+            relationship_count=int(record["relationship_count"]),
+            labels={row["label"]: int(row["occurrences"]) for row in record["labels"]},
+            relationship_types={
+                row["rel_type"]: int(row["occurrences"]) for row in record["relationship_types"]
+            },
+            average_degree=0.0,
         )
 
     async def _ensure_schema(self) -> None:
         """Ensure database schema including constraints and indexes."""
-        async with self._driver.session(database=self._database) as session:
+        async with self._session() as session:
             await session.execute_write(self._create_constraints)
             await session.execute_write(self._create_performance_indexes)
 
@@ -314,6 +532,23 @@ class Neo4jClient:
                 "CREATE INDEX lint_result_timestamp IF NOT EXISTS FOR "
                 "(n:LintResult) ON (n.timestamp)"
             ),
+            # Analytics filter per user over a time window and rank hotspots
+            # by complexity
+            (
+                "CREATE INDEX lint_result_user_time IF NOT EXISTS FOR "
+                "(n:LintResult) ON (n.user_id, n.timestamp)"
+            ),
+            (
+                "CREATE INDEX lint_result_complexity IF NOT EXISTS FOR "
+                "(n:LintResult) ON (n.complexity)"
+            ),
+            
+            # Daily complexity rollups are merged on (date, language, user_id)
+            # and range-scanned by date for trend queries
+            (
+                "CREATE INDEX complexity_rollup_key IF NOT EXISTS FOR "
+                "(n:ComplexityDailyRollup) ON (n.date, n.language, n.user_id)"
+            ),
             
             # Indexes for test results
             (
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 from typing import Any, Awaitable, Callable, TypeVar
 
-from neo4j.exceptions import Neo4jError
+from neo4j.exceptions import Neo4jError, ServiceUnavailable, SessionExpired
 
 from .neo4j_client import Neo4jClient
 from ..utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
@@ -87,21 +88,27 @@ class EnhancedNeo4jClient(Neo4jClient):
             return await self._execute_with_backoff(func)
     
     async def _execute_with_backoff(self, func: Callable[[], Awaitable[_T]]) -> _T:
-        """Execute function with exponential backoff retries."""
+        """Execute function with exponential backoff retries.
+
+        Only errors the driver reports as retryable (transient errors, leader
+        switches, lost connections) are retried; permanent failures such as
+        syntax, constraint or authentication errors are raised immediately.
+        """
         delay = self._initial_backoff
         last_error: Exception | None = None
         for attempt in range(1, self._max_retries + 1):
             try:
                 return await func()
-            except Neo4jError as exc:  # pragma: no cover - depends on server behaviour
+            except (Neo4jError, ServiceUnavailable, SessionExpired) as exc:
                 last_error = exc
                 logger.warning(
                     f"Neo4j operation failed (attempt {attempt}/{self._max_retries})",
                     extra={"error": str(exc), "attempt": attempt},
                 )
-                if attempt == self._max_retries:
+                if attempt == self._max_retries or not exc.is_retryable():
                     raise
-                await asyncio.sleep(delay)
+                # Jitter keeps clients that failed together from retrying in lockstep
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
                 delay *= 2
         assert last_error is not None
         raise last_error
@@ -3,20 +3,26 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import hashlib
 import logging
+import queue
+import re
+import sys
 import time
 import uuid
 from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 from typing import Any
 
 import structlog
 from pydantic import BaseModel
 from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastmcp import FastMCP
 from slowapi import Limiter
@@ -25,6 +31,7 @@ from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .analytics.complexity_analytics import ComplexityAnalytics
 from .audit import AuditLogger
 from .auth import JWTHandler, Permission, RBACManager, Role, TokenBlacklist
 from .config import config
@@ -35,6 +42,7 @@ from .tools import (
     ExecutionResponse,
     ExecutionTool,
 )
+from .utils.cache import get_cache, init_cache
 from .utils.enhanced_security import (
     EnhancedSecurityManager,
     RateLimitConfig,
@@ -47,6 +55,18 @@ from .utils.enhanced_security import (
 ExecutionRequest.model_rebuild()
 ExecutionResponse.model_rebuild()
 
+# Rendered log lines are handed to a queue and written to stdout by a listener
+# thread, so a burst of logging never blocks the event loop on write().
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_structlog_output = logging.getLogger("ultimate_mcp.enhanced_server")
+_structlog_output.addHandler(QueueHandler(_log_queue))
+_structlog_output.setLevel(logging.DEBUG)  # level filtering happens in structlog
+_structlog_output.propagate = False
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -59,20 +79,68 @@ structlog.configure(
     wrapper_class=structlog.make_filtering_bound_logger(
         getattr(logging, config.monitoring.log_level.upper())
     ),
-    logger_factory=structlog.WriteLoggerFactory(),
+    logger_factory=lambda *args: _structlog_output,
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
 
+def _client_ip(request: Request) -> str:
+    """Return the client address, resolving it at most once per request."""
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is None:
+        client_ip = get_remote_address(request)
+        request.state.client_ip = client_ip
+    return client_ip
+
+
+def _user_agent(request: Request) -> str | None:
+    """Return the User-Agent header, read at most once per request."""
+    try:
+        return request.state.user_agent
+    except AttributeError:
+        user_agent = request.headers.get("user-agent")
+        request.state.user_agent = user_agent
+        return user_agent
+
+
+# Every JSON body (endpoints, error handlers, middleware short-circuits) is
+# encoded with orjson when it is installed, falling back to the stdlib encoder.
+try:
+    import orjson  # noqa: F401
+
+    FastJSONResponse: type[JSONResponse] = ORJSONResponse
+except ImportError:  # pragma: no cover - optional dependency
+    FastJSONResponse = JSONResponse
+
+
+_MAX_REQUEST_ID_LENGTH = 128
+# Same allow-list as server.py: short IDs of plain token characters only
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,%d}" % _MAX_REQUEST_ID_LENGTH)
+
+# Probe endpoints hit every few seconds by orchestrators; logging them would
+# dominate log volume on an otherwise idle server.
+_NOLOG_PATHS = frozenset({"/health", "/metrics"})
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware for comprehensive request logging and monitoring."""
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with logging and metrics."""
-        request_id = str(uuid.uuid4())
-        start_time = time.time()
+        if request.url.path in _NOLOG_PATHS:
+            return await call_next(request)
+
+        # Honour an upstream request id so logs join across hops; validate it
+        # since it is echoed into logs and response headers.
+        request_id = request.headers.get("x-request-id")
+        if not request_id or not _VALID_REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        start_time = time.perf_counter()
+        # Resolved once here and reused by the limiter, security context and audit logging
+        request.state.client_ip = get_remote_address(request)
+        request.state.user_agent = request.headers.get("user-agent")
         
         # Add request context
         structlog.contextvars.clear_contextvars()
@@ -80,8 +148,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             request_id=request_id,
             method=request.method,
             path=request.url.path,
-            client_ip=get_remote_address(request),
-            user_agent=request.headers.get("user-agent", ""),
+            client_ip=request.state.client_ip,
+            user_agent=request.state.user_agent or "",
         )
         
         logger.info("Request started")
@@ -90,7 +158,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             
             # Log successful request
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             logger.info(
                 "Request completed",
                 status_code=response.status_code,
@@ -104,7 +172,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             return response
             
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             logger.error(
                 "Request failed",
                 error=str(e),
@@ -113,7 +181,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             )
             
             # Return structured error response
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error",
@@ -124,6 +192,48 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             )
 
 
+# Security headers are fixed at startup, so they are built once rather than per response
+_SECURITY_HEADERS = {
+    # Prevent MIME type sniffing
+    "X-Content-Type-Options": "nosniff",
+    # Prevent clickjacking attacks
+    "X-Frame-Options": "DENY",
+    # Enable browser XSS protection (deprecated but still useful for old browsers)
+    "X-XSS-Protection": "1; mode=block",
+    # Control referrer information
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    # Prevent browser feature access
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=(), payment=(), usb=()",
+}
+
+# HSTS - Force HTTPS
+_HSTS_HEADER = {"Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload"}
+
+# Content Security Policy - Comprehensive rules
+_CSP_HEADER = {
+    "Content-Security-Policy": "; ".join([
+        "default-src 'self'",
+        "script-src 'self' 'unsafe-inline'",  # Allow inline for dev, should be 'self' in prod
+        "style-src 'self' 'unsafe-inline'",
+        "img-src 'self' data: https:",
+        "font-src 'self' data:",
+        "connect-src 'self'",
+        "frame-ancestors 'none'",
+        "base-uri 'self'",
+        "form-action 'self'",
+        "object-src 'none'",
+        "upgrade-insecure-requests",
+    ]),
+}
+
+# Cache control for sensitive endpoints
+_NO_STORE_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, private",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Comprehensive security headers middleware following OWASP guidelines."""
 
@@ -138,56 +248,21 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.enable_hsts = enable_hsts
         self.enable_csp = enable_csp
+        headers = dict(_SECURITY_HEADERS)
+        if enable_hsts:
+            headers.update(_HSTS_HEADER)
+        if enable_csp:
+            headers.update(_CSP_HEADER)
+        self._headers = headers
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Add comprehensive security headers to response."""
         response = await call_next(request)
+        response.headers.update(self._headers)
 
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Prevent clickjacking attacks
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Enable browser XSS protection (deprecated but still useful for old browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Prevent browser feature access
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=(), payment=(), usb=()"
-        )
-
-        # HSTS - Force HTTPS
-        if self.enable_hsts:
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains; preload"
-            )
-
-        # Content Security Policy - Comprehensive rules
-        if self.enable_csp:
-            csp_directives = [
-                "default-src 'self'",
-                "script-src 'self' 'unsafe-inline'",  # Allow inline for dev, should be 'self' in prod
-                "style-src 'self' 'unsafe-inline'",
-                "img-src 'self' data: https:",
-                "font-src 'self' data:",
-                "connect-src 'self'",
-                "frame-ancestors 'none'",
-                "base-uri 'self'",
-                "form-action 'self'",
-                "object-src 'none'",
-                "upgrade-insecure-requests",
-            ]
-            response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        # Cache control for sensitive endpoints
-        if "/auth" in request.url.path or "/token" in request.url.path:
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
+        path = request.url.path
+        if "/auth" in path or "/token" in path:
+            response.headers.update(_NO_STORE_HEADERS)
 
         return response
 
@@ -208,9 +283,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         """Apply security policies."""
 
         # Rate limiting
-        client_ip = get_remote_address(request)
-        if client_ip is None:
-            client_ip = "unknown"
+        client_ip = _client_ip(request) or "unknown"
 
         if not self.security_manager.check_rate_limit(client_ip, self.rate_limit_config):
             logger.warning(
@@ -218,7 +291,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 client_ip=client_ip,
                 path=request.url.path,
             )
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=429,
                 content={"error": "Rate limit exceeded", "retry_after": 60},
                 headers={"Retry-After": "60"},
@@ -237,25 +310,33 @@ health_checker: HealthChecker | None = None
 audit_logger: AuditLogger | None = None
 rbac_manager: RBACManager | None = None
 jwt_handler: JWTHandler | None = None
+complexity_analytics: ComplexityAnalytics | None = None
+execution_tool: ExecutionTool | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Enhanced application lifespan with proper resource management."""
     global neo4j_client, security_manager, metrics_collector, health_checker
-    global audit_logger, rbac_manager, jwt_handler
+    global audit_logger, rbac_manager, jwt_handler, complexity_analytics, execution_tool
     
     logger.info("Starting Ultimate MCP server", version="2.0.0")
     
     try:
+        # Uptime is measured from the start of startup, on the monotonic clock
+        app.state.start_time = time.monotonic()
         # Initialize components, allowing tests to inject preconfigured instances
         client = neo4j_client
         if client is None:
+            database = config.database
             client = Neo4jClient(
-                uri=config.database.uri,
-                user=config.database.user,
-                password=config.database.password,
-                database=config.database.database,
+                uri=database.uri,
+                user=database.user,
+                password=database.password.get_secret_value() if database.password else "",
+                database=database.database,
+                max_connection_pool_size=database.max_connection_pool_size,
+                connection_acquisition_timeout=database.connection_acquisition_timeout,
+                max_connection_lifetime=database.max_connection_lifetime,
             )
         neo4j_client = client
 
@@ -267,6 +348,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         metrics_collector = MetricsCollector()
         health_checker = HealthChecker(neo4j_client)
         
+        # Shared query cache (Redis when enabled, in-memory otherwise)
+        query_cache = init_cache(
+            config.redis.url if config.redis.enabled else None,
+            max_connections=config.redis.max_connections,
+        )
+        
         # Connect to database
         await neo4j_client.connect()
         logger.info("Database connection established")
@@ -274,7 +361,29 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         # Initialize Phase 1 components
         audit_logger = AuditLogger(neo4j_client=neo4j_client)
         rbac_manager = RBACManager(neo4j_client=neo4j_client)
-        jwt_handler = JWTHandler(secret_key=config.security.secret_key)
+        security = config.security
+        if security.jwt_private_key_path or security.jwt_public_key_path:
+            jwt_handler = JWTHandler(
+                private_key_pem=(
+                    Path(security.jwt_private_key_path).read_bytes()
+                    if security.jwt_private_key_path else None
+                ),
+                public_key_pem=(
+                    Path(security.jwt_public_key_path).read_bytes()
+                    if security.jwt_public_key_path else None
+                ),
+            )
+        else:
+            jwt_handler = JWTHandler(
+                secret_key=(
+                    security.secret_key.get_secret_value() if security.secret_key else None
+                ),
+                algorithm=security.jwt_algorithm,
+            )
+        
+        complexity_analytics = ComplexityAnalytics(neo4j_client, cache=query_cache)
+        # One tool per process; each instance owns a worker process pool
+        execution_tool = ExecutionTool(neo4j_client)
         
         # Store in app state for access in endpoints
         app.state.audit_logger = audit_logger
@@ -284,13 +393,16 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         app.state.metrics_collector = metrics_collector
         app.state.health_checker = health_checker
         app.state.neo4j_client = neo4j_client
+        app.state.query_cache = query_cache
+        app.state.complexity_analytics = complexity_analytics
+        app.state.execution_tool = execution_tool
         app.state.config = config
-        app.state.start_time = time.time()
         
         logger.info("Audit logging, RBAC, and JWT authentication initialized")
         
-        # Start health monitoring
-        asyncio.create_task(health_checker.start_monitoring())
+        # Start health monitoring; the checker owns the monitoring task and
+        # cancels it in stop_monitoring()
+        await health_checker.start_monitoring()
         logger.info("Enhanced Ultimate MCP server started successfully")
         
         yield
@@ -302,6 +414,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         # Cleanup resources
         if health_checker:
             await health_checker.stop_monitoring()
+        if execution_tool:
+            await execution_tool.shutdown()
+            execution_tool = None
+        await get_cache().close()
         if neo4j_client:
             await neo4j_client.close()
         
@@ -314,6 +430,7 @@ app = FastAPI(
     description="Enhanced Model Context Protocol platform with comprehensive monitoring",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs" if not config.is_production else None,
     redoc_url="/redoc" if not config.is_production else None,
 )
@@ -321,16 +438,17 @@ app = FastAPI(
 # Add middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=config.server.allowed_origins,
+    # Origins are checked with ``in`` on every CORS request
+    allow_origins=frozenset(config.server.allowed_origins),
     allow_credentials=True,
     allow_methods=config.server.allowed_methods,
     allow_headers=config.server.allowed_headers,
 )
 
 # Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=_client_ip)
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, lambda r, e: JSONResponse(
+app.add_exception_handler(RateLimitExceeded, lambda r, e: FastJSONResponse(
     status_code=429,
     content={"error": "Rate limit exceeded", "detail": str(e)}
 ))
@@ -356,8 +474,8 @@ async def get_security_context(
     # Create base security context
     context = security_manager.create_security_context(
         token=token,
-        ip_address=get_remote_address(request),
-        user_agent=request.headers.get("user-agent"),
+        ip_address=_client_ip(request),
+        user_agent=_user_agent(request),
     )
     
     # Extract roles from JWT if token provided and JWT handler available
@@ -372,8 +490,8 @@ async def get_security_context(
                 await audit_logger.log_authentication(
                     success=True,
                     user_id=context.user_id,
-                    ip_address=get_remote_address(request),
-                    user_agent=request.headers.get("user-agent"),
+                    ip_address=_client_ip(request),
+                    user_agent=_user_agent(request),
                     request_id=str(uuid.uuid4()),
                 )
         except Exception as e:
@@ -381,8 +499,8 @@ async def get_security_context(
             if audit_logger:
                 await audit_logger.log_authentication(
                     success=False,
-                    ip_address=get_remote_address(request),
-                    user_agent=request.headers.get("user-agent"),
+                    ip_address=_client_ip(request),
+                    user_agent=_user_agent(request),
                     request_id=str(uuid.uuid4()),
                     error_message=str(e),
                 )
@@ -459,7 +577,7 @@ async def get_status() -> dict[str, Any]:
         "version": "2.0.0",
         "environment": config.environment,
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "uptime": time.time() - app.state.start_time if hasattr(app.state, "start_time") else 0,
+        "uptime": time.monotonic() - app.state.start_time if hasattr(app.state, "start_time") else 0,
         "database": await neo4j_client.health_check() if neo4j_client else False,
         "security": {
             "rate_limiting": True,
@@ -498,7 +616,7 @@ async def assign_user_role(
                 resource="roles",
                 action="assign",
                 granted=True,
-                ip_address=get_remote_address(request),
+                ip_address=_client_ip(request),
                 request_id=str(uuid.uuid4()),
                 details={"target_user": user_id, "role": role_enum.value},
             )
@@ -584,6 +702,29 @@ async def query_audit_log(
     }
 
 
+@app.get("/api/v1/analytics/complexity", response_class=FastJSONResponse)
+async def get_complexity_report(
+    request: Request,
+    days: int = 30,
+    hotspot_limit: int = 10,
+    security_context: SecurityContext = Depends(get_security_context),
+) -> JSONResponse:
+    """Return the code complexity report."""
+    await ensure_permission("graph", "query", request, security_context)
+    if not complexity_analytics:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Complexity analytics not initialized",
+        )
+    
+    report = await complexity_analytics.generate_complexity_report(
+        days=days, hotspot_limit=hotspot_limit
+    )
+    # The report is already JSON-compatible, so hand it straight to the
+    # encoder instead of walking it again with jsonable_encoder.
+    return FastJSONResponse(report)
+
+
 # Enhanced tool endpoints with security
 @app.post("/api/v1/execute", response_model=ExecutionResponse)
 @limiter.limit("10/minute")
@@ -594,10 +735,9 @@ async def execute_code(
     """Execute code with enhanced security and monitoring."""
     await ensure_permission("tools", "execute", request, security_context)
 
-    execution_payload = await request.json()
-    execution_request = ExecutionRequest.model_validate(execution_payload)
+    execution_request = ExecutionRequest.model_validate_json(await request.body())
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     code_hash = hashlib.sha256(execution_request.code.encode()).hexdigest()
     
     # Check permissions for code execution
@@ -608,13 +748,17 @@ async def execute_code(
             detail="Public users limited to 1000 characters of code",
         )
     
-    tool = ExecutionTool(neo4j_client)
+    if not execution_tool:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Execution tool not initialized",
+        )
     
     try:
-        result = await tool.run(execution_request)
+        result = await execution_tool.run(execution_request)
         
         # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter() - start_time) * 1000
         
         # Log successful execution
         if audit_logger:
@@ -624,7 +768,7 @@ async def execute_code(
                 language=execution_request.language,
                 success=result.return_code == 0,
                 duration_ms=duration_ms,
-                ip_address=get_remote_address(request),
+                ip_address=_client_ip(request),
                 request_id=str(uuid.uuid4()),
             )
         
@@ -641,7 +785,7 @@ async def execute_code(
         
     except Exception as e:
         # Log failed execution
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter() - start_time) * 1000
         
         if audit_logger:
             await audit_logger.log_code_execution(
@@ -650,7 +794,7 @@ async def execute_code(
                 language=execution_request.language,
                 success=False,
                 duration_ms=duration_ms,
-                ip_address=get_remote_address(request),
+                ip_address=_client_ip(request),
                 request_id=str(uuid.uuid4()),
                 error_message=str(e),
             )
@@ -681,8 +825,9 @@ async def enhanced_execute(
     )
     
     # Execute with public security context
-    tool = ExecutionTool(neo4j_client)
-    result = await tool.run(request)
+    if not execution_tool:
+        raise RuntimeError("Execution tool not initialized")
+    result = await execution_tool.run(request)
     
     return {
         "id": result.id,
@@ -701,7 +846,7 @@ app.mount("/mcp", mcp.http_app())
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
     """Enhanced HTTP exception handler."""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -722,7 +867,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         path=request.url.path,
     )
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -63,7 +63,7 @@ class MetricsCollector:
         self.execution_counts = defaultdict(int)
         self.language_counts = defaultdict(int)
         self.user_sessions = set()
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
     async def record_request(
         self, 
@@ -191,7 +191,7 @@ class MetricsCollector:
         system_metrics = self.get_system_metrics()
         app_metrics = self.get_application_metrics()
         
-        uptime = time.time() - self.start_time
+        uptime = time.monotonic() - self.start_time
         
         return {
             "timestamp": time.time(),
@@ -255,9 +255,9 @@ class HealthChecker:
     async def check_database_health(self) -> Dict[str, Any]:
         """Check Neo4j database health."""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             is_healthy = await self.neo4j_client.health_check()
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
             
             return {
                 "status": "healthy" if is_healthy else "unhealthy",
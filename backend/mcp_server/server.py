@@ -2,33 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
+import hmac
 import json
 import logging
+import re
+import time
 import uuid
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Awaitable, Callable, cast
+from typing import Annotated, Any, Callable, cast
 
 import structlog
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.routing import APIRouter
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastmcp import Context as MCPContext
 from fastmcp import FastMCP
 from fastmcp.prompts import Message, PromptMessage
 from pydantic import AliasChoices, BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.types import Message as ASGIMessage
+from structlog.contextvars import bound_contextvars
 
 try:
     from ..agent_integration.client import AgentDiscovery
@@ -53,20 +55,7 @@ from .tools import (
     TestResponse,
     TestTool,
 )
-
-# Ensure Pydantic models are fully built for runtime validation under Python 3.13.
-LintRequest.model_rebuild()
-LintResponse.model_rebuild()
-TestRequest.model_rebuild()
-TestResponse.model_rebuild()
-GraphUpsertPayload.model_rebuild()
-GraphUpsertResponse.model_rebuild()
-GraphQueryPayload.model_rebuild()
-GraphQueryResponse.model_rebuild()
-ExecutionRequest.model_rebuild()
-ExecutionResponse.model_rebuild()
-GenerationRequest.model_rebuild()
-GenerationResponse.model_rebuild()
+from .utils.user_rate_limit import TokenBucket
 
 
 class PromptDefinition(BaseModel):
@@ -88,11 +77,6 @@ class PromptResponse(BaseModel):
     prompt: PromptDefinition
 
 
-PromptDefinition.model_rebuild()
-PromptCatalog.model_rebuild()
-PromptRequest.model_rebuild()
-PromptResponse.model_rebuild()
-
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
@@ -297,14 +281,29 @@ def _register_resource(definition: ResourceDefinition) -> None:
 
 PROMPT_INDEX: dict[str, PromptDefinition] = {prompt.slug: prompt for prompt in PROMPT_DEFINITIONS}
 
+# Log lines and default JSON responses use orjson when it is installed.
+try:
+    import orjson
+
+    FastJSONResponse: type[JSONResponse] = ORJSONResponse
+
+    def _log_dumps(obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+except ImportError:  # pragma: no cover - optional dependency
+    FastJSONResponse = JSONResponse
+
+    def _log_dumps(obj: Any, **kwargs: Any) -> str:
+        return json.dumps(obj, default=str)
+
+
 structlog.configure(
     processors=[
+        structlog.contextvars.merge_contextvars,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.add_log_level,
         structlog.processors.EventRenamer("message"),
-        structlog.processors.JSONRenderer(
-            serializer=lambda obj, **kwargs: json.dumps(obj, default=str)
-        ),
+        structlog.processors.JSONRenderer(serializer=_log_dumps),
     ],
     wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
 )
@@ -344,17 +343,30 @@ class Settings:
             max_request_bytes: int = Field(
                 default=524_288, validation_alias=AliasChoices("MAX_REQUEST_BYTES")
             )
+            neo4j_max_pool_size: int | None = Field(
+                default=None,
+                validation_alias=AliasChoices(
+                    "NEO4J_MAX_POOL_SIZE", "NEO4J_MAX_CONNECTION_POOL_SIZE"
+                ),
+            )
+            neo4j_acquisition_timeout: float | None = Field(
+                default=None, validation_alias=AliasChoices("NEO4J_ACQUISITION_TIMEOUT")
+            )
+            use_uvloop: bool = Field(
+                default=False, validation_alias=AliasChoices("USE_UVLOOP")
+            )
 
         data = _Settings()
         self.neo4j_uri = data.neo4j_uri
         self.neo4j_user = data.neo4j_user
         self.neo4j_password = data.neo4j_password
         self.neo4j_database = data.neo4j_database
-        self.allowed_origins = [
-            origin.strip()
-            for origin in data.allowed_origins.split(",")
-            if origin
-        ]
+        # Explicit origins only; "*" would let any site call the API from a browser.
+        self.allowed_origins = sorted(
+            {origin.strip() for origin in data.allowed_origins.split(",") if origin.strip()}
+        )
+        if "*" in self.allowed_origins:
+            raise ValueError("ALLOWED_ORIGINS must list explicit origins, not '*'")
         if data.auth_token in {"", "change-me"}:
             raise ValueError("AUTH_TOKEN must be set to a non-default value")
         if data.neo4j_password in {"", "password123"}:
@@ -363,10 +375,29 @@ class Settings:
         self.auth_token = data.auth_token
         self.rate_limit_rps = data.rate_limit_rps
         self.max_request_bytes = data.max_request_bytes
+        self.neo4j_max_pool_size = data.neo4j_max_pool_size
+        self.neo4j_acquisition_timeout = data.neo4j_acquisition_timeout
+        self.use_uvloop = data.use_uvloop
+
+
+def _install_uvloop() -> None:
+    """Use uvloop for launchers that do not pick it themselves.
+
+    Uvicorn already selects uvloop when it is installed (``--loop auto``);
+    this covers other launchers that create the default asyncio loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("USE_UVLOOP is set but uvloop is not installed")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 settings = Settings()
-RATE_LIMIT = f"{settings.rate_limit_rps}/second"
+if settings.use_uvloop:
+    _install_uvloop()
+rate_limiter = TokenBucket(settings.rate_limit_rps)
 
 
 class ToolRegistry:
@@ -383,10 +414,10 @@ neo4j_client = Neo4jClient(
     settings.neo4j_user,
     settings.neo4j_password,
     settings.neo4j_database,
+    max_connection_pool_size=settings.neo4j_max_pool_size,
+    connection_acquisition_timeout=settings.neo4j_acquisition_timeout,
 )
 
-limiter = Limiter(key_func=get_remote_address)
-http_bearer = HTTPBearer(auto_error=False)
 
 mcp_server = FastMCP(
     name="Ultimate MCP",
@@ -405,148 +436,207 @@ for resource_definition in RESOURCE_DEFINITIONS:
 
 @mcp_server.tool(name="lint_code", description="Run static analysis on supplied code.")
 async def mcp_lint_code(payload: LintRequest, context: MCPContext) -> LintResponse:
-    if registry.lint is None:
-        raise RuntimeError("Lint tool not initialised")
     await context.info("Executing lint tool")
-    return await registry.lint.run(payload)
+    return await cast(LintTool, registry.lint).run(payload)
 
 
 @mcp_server.tool(name="run_tests", description="Execute a pytest suite in isolation.")
 async def mcp_run_tests(payload: TestRequest, context: MCPContext) -> TestResponse:
-    if registry.tests is None:
-        raise RuntimeError("Test tool not initialised")
     await context.info("Executing run_tests tool")
-    return await registry.tests.run(payload)
+    return await cast(TestTool, registry.tests).run(payload)
 
 
 @mcp_server.tool(name="graph_upsert", description="Create or update graph nodes and relationships.")
 async def mcp_graph_upsert(payload: GraphUpsertPayload, context: MCPContext) -> GraphUpsertResponse:
-    if registry.graph is None:
-        raise RuntimeError("Graph tool not initialised")
     await context.debug("Executing graph upsert")
-    return await registry.graph.upsert(payload)
+    return await cast(GraphTool, registry.graph).upsert(payload)
 
 
 @mcp_server.tool(name="graph_query", description="Execute a read-only Cypher query.")
 async def mcp_graph_query(payload: GraphQueryPayload, context: MCPContext) -> GraphQueryResponse:
-    if registry.graph is None:
-        raise RuntimeError("Graph tool not initialised")
     await context.debug("Executing graph query")
-    return await registry.graph.query(payload)
+    return await cast(GraphTool, registry.graph).query(payload)
 
 
 @mcp_server.tool(name="execute_code", description="Run trusted Python code with sandboxing.")
 async def mcp_execute_code(payload: ExecutionRequest, context: MCPContext) -> ExecutionResponse:
-    if registry.execute is None:
-        raise RuntimeError("Execution tool not initialised")
     await context.info("Executing code snippet")
-    return await registry.execute.run(payload)
+    return await cast(ExecutionTool, registry.execute).run(payload)
 
 
 @mcp_server.tool(name="generate_code", description="Render a template into source code.")
 async def mcp_generate_code(payload: GenerationRequest, context: MCPContext) -> GenerationResponse:
-    if registry.generate is None:
-        raise RuntimeError("Generation tool not initialised")
     await context.info("Rendering template")
-    return await registry.generate.run(payload)
+    return await cast(GenerationTool, registry.generate).run(payload)
 
 
 mcp_asgi = mcp_server.http_app(path="/")
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Add security headers, enforce payload limits, and attach request IDs."""
+_BODY_TOO_LARGE = b'{"detail":"Request body too large"}'
+_INVALID_CONTENT_LENGTH = b'{"detail":"Invalid Content-Length header"}'
+_RATE_LIMITED = b'{"detail":"Rate limit exceeded"}'
+_UNEXPECTED_ERROR = b'{"detail":"Unexpected error"}'
+
+# Client-supplied request IDs are echoed into logs and response headers, so
+# only short IDs of plain token characters are trusted (same bound as
+# enhanced_server's _MAX_REQUEST_ID_LENGTH).
+_MAX_REQUEST_ID_LENGTH = 128
+_VALID_REQUEST_ID = re.compile(rb"[A-Za-z0-9._:-]{1,%d}" % _MAX_REQUEST_ID_LENGTH)
+
+
+async def _reject(send: Send, status_code: int, body: bytes) -> None:
+    # Header list is built per call: outer middleware (CORS) mutates it in place.
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        if request.headers.get("content-length"):
+_STATIC_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("Referrer-Policy", "no-referrer"),
+    ("Content-Security-Policy", "default-src 'self'"),
+)
+
+
+class RequestContextMiddleware:
+    """Add security headers, enforce payload limits, and attach request IDs.
+
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware`` so requests are
+    not routed through an extra task group and memory stream.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._max_bytes = settings.max_request_bytes
+        self._static_headers = _STATIC_HEADERS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # One pass over the raw header pairs; ASGI lowercases header names.
+        content_length = request_id = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+            elif name == b"x-request-id" and _VALID_REQUEST_ID.fullmatch(value):
+                request_id = value.decode("ascii")
+
+        if content_length:
             try:
-                if int(request.headers["content-length"]) > settings.max_request_bytes:
-                    raise HTTPException(
-                        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        "Request body too large",
-                    )
-            except ValueError as error:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    "Invalid Content-Length header",
-                ) from error
-
-        request_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
-        request.state.request_id = request_id
-        logger.info(
-            "request.start",
-            method=request.method,
-            path=request.url.path,
-            request_id=request_id,
-            client=str(request.client),
-        )
-        response = await call_next(request)
-        response.headers["X-Request-Id"] = request_id
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
-        logger.info(
-            "request.end",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            request_id=request_id,
-        )
-        return response
+                too_large = int(content_length) > self._max_bytes
+            except ValueError:
+                await _reject(send, 400, _INVALID_CONTENT_LENGTH)
+                return
+            if too_large:
+                await _reject(send, 413, _BODY_TOO_LARGE)
+                return
+
+        request_id = request_id or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        client = scope.get("client")
+        static_headers = self._static_headers
+        started = time.perf_counter()
+
+        async def send_with_headers(message: ASGIMessage) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-Id"] = request_id
+                for name, value in static_headers:
+                    headers[name] = value
+                logger.info(
+                    "request",
+                    client=client[0] if client else None,
+                    status_code=message["status"],
+                    duration_ms=round((time.perf_counter() - started) * 1000, 2),
+                )
+            await send(message)
+
+        # Bound for the whole request so log lines from tools carry the same ids.
+        with bound_contextvars(request_id=request_id, method=scope["method"], path=scope["path"]):
+            await self.app(scope, receive, send_with_headers)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # The container runs uvicorn with --loop uvloop; log the loop actually in
+    # use so a silent fallback to the selector loop is visible.
+    logger.info("startup", event_loop=type(asyncio.get_running_loop()).__module__)
     await neo4j_client.connect()
+    await neo4j_client.warm_pool()
     registry.lint = LintTool(neo4j_client)
     registry.tests = TestTool(neo4j_client)
     registry.graph = GraphTool(neo4j_client)
     registry.execute = ExecutionTool(neo4j_client)
     registry.generate = GenerationTool(neo4j_client)
+    # The MCP tool wrappers call the registry without None checks; this is the
+    # single place that guarantees every tool exists before requests arrive.
+    if not all(
+        (
+            registry.lint,
+            registry.tests,
+            registry.graph,
+            registry.execute,
+            registry.generate,
+        )
+    ):
+        raise RuntimeError("Tool registry incomplete after startup")
     app.state.settings = settings
     app.state.neo4j = neo4j_client
     app.state.tools = registry
     app.state.agent_discovery = AgentDiscovery(base_url="http://localhost:8000")
 
     async with AsyncExitStack() as stack:
+        # Registered first so the driver closes last, even if the MCP lifespan fails.
+        stack.push_async_callback(neo4j_client.close)
         await stack.enter_async_context(mcp_asgi.lifespan(app))
         yield
 
-    await neo4j_client.close()
+
+class RateLimited(Exception):
+    """Raised by ``_check_rate_limit`` when the caller's bucket is empty."""
 
 
 def rate_limit_handler(request: Request, exc: Exception) -> Response:
-    if isinstance(exc, RateLimitExceeded):
-        detail = "Rate limit exceeded"
-    else:
-        detail = "Unexpected error"
-    body = json.dumps({"detail": detail})
+    body = _RATE_LIMITED if isinstance(exc, RateLimited) else _UNEXPECTED_ERROR
     return Response(content=body, status_code=429, media_type="application/json")
 
-app = FastAPI(title="Ultimate MCP Platform", lifespan=lifespan)
+app = FastAPI(
+    title="Ultimate MCP Platform",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 app.add_middleware(RequestContextMiddleware)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+app.add_exception_handler(RateLimited, rate_limit_handler)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.allowed_origins,
+    allow_origins=frozenset(settings.allowed_origins),
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Requested-With"],
     allow_credentials=False,
 )
-app.add_middleware(SlowAPIMiddleware)
 
 app.mount("/mcp", mcp_asgi)
 
 
-def _require_auth(credentials: HTTPAuthorizationCredentials | None = Depends(http_bearer)) -> None:
-    if settings.auth_token is None:
+def _require_auth(request: Request) -> None:
+    expected = settings.auth_token
+    if expected is None:
         return
-    if credentials is None or credentials.credentials != settings.auth_token:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), expected.encode()):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing bearer token",
@@ -554,44 +644,46 @@ def _require_auth(credentials: HTTPAuthorizationCredentials | None = Depends(htt
         )
 
 
-def _get_lint_tool(request: Request) -> LintTool:
-    tools = cast(ToolRegistry, request.app.state.tools)
-    tool = tools.lint
-    if tool is None:
-        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Lint tool not available")
-    return tool
+def _tool_dependency(name: str, label: str) -> Callable[[Request], Any]:
+    """Build a dependency that returns ``registry.<name>`` or answers 503."""
+    detail = f"{label} tool not available"
+
+    def dependency(request: Request) -> Any:
+        tool = getattr(request.app.state.tools, name)
+        if tool is None:
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail)
+        return tool
+
+    return dependency
 
 
-def _get_test_tool(request: Request) -> TestTool:
-    tools = cast(ToolRegistry, request.app.state.tools)
-    tool = tools.tests
-    if tool is None:
-        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Test tool not available")
-    return tool
+LintToolDep = Annotated[LintTool, Depends(_tool_dependency("lint", "Lint"))]
+TestToolDep = Annotated[TestTool, Depends(_tool_dependency("tests", "Test"))]
+GraphToolDep = Annotated[GraphTool, Depends(_tool_dependency("graph", "Graph"))]
+ExecToolDep = Annotated[ExecutionTool, Depends(_tool_dependency("execute", "Execution"))]
+GenToolDep = Annotated[GenerationTool, Depends(_tool_dependency("generate", "Generation"))]
 
 
-def _get_graph_tool(request: Request) -> GraphTool:
-    tools = cast(ToolRegistry, request.app.state.tools)
-    tool = tools.graph
-    if tool is None:
-        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Graph tool not available")
-    return tool
+def _model_response(model: BaseModel) -> Response:
+    """Serialize a tool result straight to JSON bytes with Pydantic's encoder."""
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
-def _get_exec_tool(request: Request) -> ExecutionTool:
-    tools = cast(ToolRegistry, request.app.state.tools)
-    tool = tools.execute
-    if tool is None:
-        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Execution tool not available")
-    return tool
+def _check_rate_limit(request: Request) -> None:
+    client = request.client
+    if not rate_limiter.allow(client.host if client else "127.0.0.1"):
+        raise RateLimited
 
 
-def _get_gen_tool(request: Request) -> GenerationTool:
-    tools = cast(ToolRegistry, request.app.state.tools)
-    tool = tools.generate
-    if tool is None:
-        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Generation tool not available")
-    return tool
+_iso_cache: list[Any] = [0, ""]
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601, formatted at most once per second."""
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache[:] = [now, datetime.fromtimestamp(now, tz=timezone.utc).isoformat()]
+    return _iso_cache[1]
 
 
 router = APIRouter()
@@ -599,17 +691,21 @@ router = APIRouter()
 
 @router.get("/health")
 async def health() -> dict[str, Any]:
+    # Liveness stays on a cheap RETURN 1; the graph-wide aggregation is
+    # reserved for /metrics.
     return {
         "service": "ok",
         "neo4j": await neo4j_client.health_check(),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
 @router.get("/metrics")
 async def metrics() -> dict[str, Any]:
-    metrics = await neo4j_client.get_metrics()
-    return metrics.model_dump()
+    metrics = await neo4j_client.cached_metrics()
+    if metrics is None:
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Neo4j unavailable")
+    return {**metrics.model_dump(), **neo4j_client.pool_stats}
 
 
 @router.get("/prompts", response_model=list[PromptDefinition])
@@ -625,74 +721,72 @@ async def get_prompt_route(slug: str) -> PromptDefinition:
     return prompt
 
 
-@router.post("/lint_code")
-@limiter.limit(RATE_LIMIT)
+# Every tool route is rate limited; the dependency is attached once here.
+tool_router = APIRouter(dependencies=[Depends(_check_rate_limit)])
+
+
+@tool_router.post("/lint_code")
 async def lint_code(
     request: Request,
-    tool: LintTool = Depends(_get_lint_tool),
-) -> JSONResponse:
-    payload = LintRequest.model_validate(await request.json())
+    tool: LintToolDep,
+) -> Response:
+    payload = LintRequest.model_validate_json(await request.body())
     result = await tool.run(payload)
-    return JSONResponse(result.model_dump(exclude_defaults=False))
+    return _model_response(result)
 
 
-@router.post("/run_tests")
-@limiter.limit(RATE_LIMIT)
+@tool_router.post("/run_tests")
 async def run_tests(
     request: Request,
-    tool: TestTool = Depends(_get_test_tool),
+    tool: TestToolDep,
     __: None = Depends(_require_auth),
-) -> JSONResponse:
-    payload = TestRequest.model_validate(await request.json())
+) -> Response:
+    payload = TestRequest.model_validate_json(await request.body())
     result = await tool.run(payload)
-    return JSONResponse(result.model_dump(exclude_defaults=False))
+    return _model_response(result)
 
 
-@router.post("/graph_upsert")
-@limiter.limit(RATE_LIMIT)
+@tool_router.post("/graph_upsert")
 async def graph_upsert(
     request: Request,
-    tool: GraphTool = Depends(_get_graph_tool),
+    tool: GraphToolDep,
     __: None = Depends(_require_auth),
-) -> JSONResponse:
-    payload = GraphUpsertPayload.model_validate(await request.json())
+) -> Response:
+    payload = GraphUpsertPayload.model_validate_json(await request.body())
     result = await tool.upsert(payload)
-    return JSONResponse(result.model_dump(exclude_defaults=False))
+    return _model_response(result)
 
 
-@router.post("/graph_query")
-@limiter.limit(RATE_LIMIT)
+@tool_router.post("/graph_query")
 async def graph_query(
     request: Request,
-    tool: GraphTool = Depends(_get_graph_tool),
-) -> JSONResponse:
-    payload = GraphQueryPayload.model_validate(await request.json())
+    tool: GraphToolDep,
+) -> Response:
+    payload = GraphQueryPayload.model_validate_json(await request.body())
     result = await tool.query(payload)
-    return JSONResponse(result.model_dump(exclude_defaults=False))
+    return _model_response(result)
 
 
-@router.post("/execute_code")
-@limiter.limit(RATE_LIMIT)
+@tool_router.post("/execute_code")
 async def execute_code(
     request: Request,
-    tool: ExecutionTool = Depends(_get_exec_tool),
+    tool: ExecToolDep,
     __: None = Depends(_require_auth),
-) -> JSONResponse:
-    payload = ExecutionRequest.model_validate(await request.json())
+) -> Response:
+    payload = ExecutionRequest.model_validate_json(await request.body())
     result = await tool.run(payload)
-    return JSONResponse(result.model_dump(exclude_defaults=False))
+    return _model_response(result)
 
 
-@router.post("/generate_code")
-@limiter.limit(RATE_LIMIT)
+@tool_router.post("/generate_code")
 async def generate_code(
     request: Request,
-    tool: GenerationTool = Depends(_get_gen_tool),
+    tool: GenToolDep,
     __: None = Depends(_require_auth),
-) -> JSONResponse:
-    payload = GenerationRequest.model_validate(await request.json())
+) -> Response:
+    payload = GenerationRequest.model_validate_json(await request.body())
     result = await tool.run(payload)
-    return JSONResponse(result.model_dump(exclude_defaults=False))
+    return _model_response(result)
 
 
 @mcp_server.tool(name="list_prompts", description="List the built-in system prompts.")
@@ -720,6 +814,7 @@ async def mcp_get_prompt(payload: PromptRequest, context: MCPContext) -> PromptR
 
 
 app.include_router(router)
+app.include_router(tool_router)
 
 
 __all__ = ["app", "settings", "mcp_server", "PROMPT_DEFINITIONS", "RESOURCE_DEFINITIONS"]
@@ -4,14 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import sys
+import tempfile
 import time
 import uuid
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from typing import Any
 
 from pydantic import BaseModel, Field
 
+from ..utils.process_output import collect_output
 from .exec_tool import ExecutionRequest, ExecutionResponse, ExecutionResult
 
 
@@ -21,6 +22,9 @@ class AsyncExecutionTool:
     def __init__(self, max_concurrent: int = 5):
         self.max_concurrent = max_concurrent
         self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Per-run working directories are created on tmpfs when available.
+        shm = Path("/dev/shm")
+        self._tmp_root = shm if shm.is_dir() else None
     
     async def run(self, request: ExecutionRequest) -> ExecutionResponse:
         """Execute code asynchronously without blocking the event loop."""
@@ -41,54 +45,40 @@ class AsyncExecutionTool:
     
     async def _execute_python_async(self, request: ExecutionRequest) -> ExecutionResult:
         """Execute Python code using async subprocess."""
-        with TemporaryDirectory(prefix="ultimate_mcp_exec_") as tmp:
-            script_path = Path(tmp) / "snippet.py"
-            script_path.write_text(request.code, encoding="utf-8")
-            
-            cmd = [sys.executable, str(script_path)]
-            start = time.perf_counter()
-            
-            try:
-                # Use asyncio.create_subprocess_exec for non-blocking execution
-                process = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=tmp,
-                )
-                
-                # Wait for completion with timeout
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=request.timeout_seconds
-                )
-                
-                duration = time.perf_counter() - start
-                
-                return ExecutionResult(
-                    id=str(uuid.uuid4()),
-                    language="python",
-                    return_code=process.returncode or 0,
-                    stdout=stdout.decode("utf-8") if stdout else "",
-                    stderr=stderr.decode("utf-8") if stderr else "",
-                    duration_seconds=duration,
-                )
-                
-            except asyncio.TimeoutError:
-                # Kill the process if it times out
-                if process.returncode is None:
-                    process.kill()
-                    await process.wait()
-                
-                duration = time.perf_counter() - start
-                return ExecutionResult(
-                    id=str(uuid.uuid4()),
-                    language="python",
-                    return_code=-1,
-                    stdout="",
-                    stderr=f"Execution timed out after {request.timeout_seconds} seconds",
-                    duration_seconds=duration,
-                )
+        start = time.perf_counter()
+        # Each run gets a fresh, empty cwd that is removed afterwards, so files
+        # one request writes can never be seen (or imported) by the next.
+        with tempfile.TemporaryDirectory(
+            prefix="ultimate_mcp_exec_", dir=self._tmp_root, ignore_cleanup_errors=True
+        ) as workdir:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-I",  # Isolated: the cwd is not put on sys.path, PYTHON* vars ignored
+                "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=workdir,
+                start_new_session=True,
+            )
+            # The script is piped to ``python -``; output is capped per stream
+            # and whatever was read survives a timeout
+            stdout, stderr, timed_out = await collect_output(
+                process, request.timeout_seconds, stdin=request.code_bytes
+            )
+        duration = time.perf_counter() - start
+
+        stderr_text = stderr.decode("utf-8", errors="replace")
+        if timed_out:
+            stderr_text += f"\nExecution timed out after {request.timeout_seconds} seconds"
+        return ExecutionResult(
+            id=str(uuid.uuid4()),
+            language="python",
+            return_code=-1 if timed_out else process.returncode or 0,
+            stdout=stdout.decode("utf-8", errors="replace"),
+            stderr=stderr_text,
+            duration_seconds=duration,
+        )
 
 
 __all__ = ["AsyncExecutionTool"]
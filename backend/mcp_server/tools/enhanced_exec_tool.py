@@ -25,9 +25,22 @@ from pydantic import BaseModel, Field
 
 from ..database.neo4j_client_enhanced import EnhancedNeo4jClient
 from ..utils.enhanced_security import SecurityContext, SecurityLevel, ensure_safe_python
+from ..utils.process_output import collect_output
 
 logger = logging.getLogger(__name__)
 
+# Metrics are stored on every ExecutionResult node; orjson encodes them in C.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:  # pragma: no cover - optional dependency
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
 
 @dataclass
 class ExecutionLimits:
@@ -289,6 +302,7 @@ class EnhancedExecutionTool:
                     "stderr": asyncio.subprocess.PIPE,
                     "cwd": sandbox_path,
                     "env": env,
+                    "start_new_session": True,
                 }
                 if resource is not None:
                     kwargs["preexec_fn"] = _preexec  # type: ignore[assignment]
@@ -298,20 +312,14 @@ class EnhancedExecutionTool:
                     **kwargs,
                 )
                 
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=request.timeout_seconds
+                stdout, stderr, timed_out = await collect_output(
+                    process, request.timeout_seconds
                 )
                 
                 return_code = process.returncode
-                
-            except asyncio.TimeoutError:
-                if process:
-                    process.kill()
-                    await process.wait()
-                return_code = -1
-                stdout = b""
-                stderr = b"Execution timed out"
+                if timed_out:
+                    return_code = -1
+                    stderr += b"\nExecution timed out"
             
             except Exception as e:
                 return_code = -1
@@ -356,22 +364,17 @@ class EnhancedExecutionTool:
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
                     cwd=sandbox_path,
+                    start_new_session=True,
                 )
                 
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=request.timeout_seconds
+                stdout, stderr, timed_out = await collect_output(
+                    process, request.timeout_seconds
                 )
                 
                 return_code = process.returncode
-                
-            except asyncio.TimeoutError:
-                if process:
-                    process.kill()
-                    await process.wait()
-                return_code = -1
-                stdout = b""
-                stderr = b"Execution timed out"
+                if timed_out:
+                    return_code = -1
+                    stderr += b"\nExecution timed out"
             
             except Exception as e:
                 return_code = -1
@@ -420,22 +423,17 @@ class EnhancedExecutionTool:
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
                     cwd=sandbox_path,
+                    start_new_session=True,
                 )
                 
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=request.timeout_seconds
+                stdout, stderr, timed_out = await collect_output(
+                    process, request.timeout_seconds
                 )
                 
                 return_code = process.returncode
-                
-            except asyncio.TimeoutError:
-                if process:
-                    process.kill()
-                    await process.wait()
-                return_code = -1
-                stdout = b""
-                stderr = b"Execution timed out"
+                if timed_out:
+                    return_code = -1
+                    stderr += b"\nExecution timed out"
             
             except Exception as e:
                 return_code = -1
@@ -497,7 +495,7 @@ class EnhancedExecutionTool:
                 "stdout": result.stdout,
                 "stderr": result.stderr,
                 "duration_seconds": result.duration_seconds,
-                "metrics": json.dumps(result.metrics),
+                "metrics": _dumps(result.metrics),
                 "security_warnings": result.security_warnings,
                 "cached": result.cached,
                 "user_id": security_context.user_id if security_context else None,
@@ -10,6 +10,7 @@ import sys
 import time
 import uuid
 from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -28,6 +29,11 @@ class ExecutionRequest(BaseModel):
     language: str = Field(default="python", description="Language of the provided code.")
     timeout_seconds: float = Field(default=8.0, ge=0.5, le=60.0)
 
+    @cached_property
+    def code_bytes(self) -> bytes:
+        """UTF-8 encoding of ``code``, computed once per request."""
+        return self.code.encode("utf-8")
+
 
 class ExecutionResponse(BaseModel):
     id: str
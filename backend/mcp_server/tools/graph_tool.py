@@ -52,29 +52,41 @@ class GraphTool:
         Returns:
             Response with updated graph metrics
         """
+        # Group inputs by label set / relationship type so each group is one
+        # UNWIND statement instead of one statement per node or relationship.
+        node_batches: dict[str, list[dict[str, Any]]] = {}
+        for node in payload.nodes:
+            ensure_valid_identifier(node.key, field="node.key")
+            labels = ["GraphNode"] + [self._normalise_label(l) for l in node.labels]
+            node_batches.setdefault(":".join(labels), []).append(
+                {"key": node.key, "props": node.properties}
+            )
+
+        rel_batches: dict[str, list[dict[str, Any]]] = {}
+        for rel in payload.relationships:
+            ensure_valid_identifier(rel.start, field="relationship.start")
+            ensure_valid_identifier(rel.end, field="relationship.end")
+            rel_batches.setdefault(self._normalise_label(rel.type), []).append(
+                {"start": rel.start, "end": rel.end, "props": rel.properties}
+            )
+
         # Use single transaction for all operations (much faster)
         async def batch_upsert(tx):
-            # Batch upsert all nodes
-            for node in payload.nodes:
-                ensure_valid_identifier(node.key, field="node.key")
-                labels = ["GraphNode"] + [self._normalise_label(l) for l in node.labels]
-                label_fragment = ":".join(labels)
+            for label_fragment, rows in node_batches.items():
                 await tx.run(
-                    f"MERGE (n:{label_fragment} {{key: $key}}) SET n += $props",
-                    {"key": node.key, "props": node.properties}
+                    "UNWIND $batch AS row "
+                    f"MERGE (n:{label_fragment} {{key: row.key}}) SET n += row.props",
+                    {"batch": rows},
                 )
 
-            # Batch upsert all relationships
-            for rel in payload.relationships:
-                ensure_valid_identifier(rel.start, field="relationship.start")
-                ensure_valid_identifier(rel.end, field="relationship.end")
-                rel_type = self._normalise_label(rel.type)
+            for rel_type, rows in rel_batches.items():
                 await tx.run(
-                    f"MATCH (start:GraphNode {{key: $start}}) "
-                    f"MATCH (end:GraphNode {{key: $end}}) "
+                    "UNWIND $batch AS row "
+                    "MATCH (start:GraphNode {key: row.start}) "
+                    "MATCH (end:GraphNode {key: row.end}) "
                     f"MERGE (start)-[r:{rel_type}]->(end) "
-                    "SET r += $props",
-                    {"start": rel.start, "end": rel.end, "props": rel.properties}
+                    "SET r += row.props",
+                    {"batch": rows},
                 )
 
         logger.info(
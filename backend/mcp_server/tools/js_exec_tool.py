@@ -3,24 +3,72 @@
 from __future__ import annotations
 
 import asyncio
-import json
-import sys
+import functools
+import shutil
+import tempfile
 import time
 import uuid
-from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Any
+from collections import deque
+from typing import TYPE_CHECKING, cast
 
+from ..utils.process_output import collect_output
 from .exec_tool import ExecutionRequest, ExecutionResponse, ExecutionResult
 
+if TYPE_CHECKING:
+    from .async_exec_tool import AsyncExecutionTool
+
+# Safety wrapper around user code, kept as bytes so each call only
+# concatenates the already-encoded source between the two halves.
+_JS_PREFIX = b"""
+// Security and safety wrapper for user code
+(async function() {
+    // Disable dangerous globals
+    if (typeof global !== 'undefined') {
+        delete global.process;
+        delete global.require;
+    }
+    
+    // Set execution timeout
+    const timeoutId = setTimeout(() => {
+        console.error('Script execution timed out');
+        process.exit(124);
+    }, 25000); // 25 second internal timeout
+    
+    try {
+        // User code execution
+"""
+_JS_SUFFIX = b"""
+        
+        // Clear timeout if execution completes
+        clearTimeout(timeoutId);
+    } catch (error) {
+        clearTimeout(timeoutId);
+        console.error('Runtime error:', error.message);
+        process.exit(1);
+    }
+})().catch(error => {
+    console.error('Async error:', error.message);
+    process.exit(1);
+});
+"""
+
 
 class JavaScriptExecutionTool:
-    """JavaScript code execution with Node.js runtime."""
+    """JavaScript code execution with Node.js runtime.
+
+    Each execution still gets its own ``node`` process, but processes are
+    spawned ahead of time as ``node -`` (runtime booted, waiting on stdin), so
+    a request only pays for piping its script in rather than V8 start-up.
+    Processes are never reused, keeping one request's code isolated from the next.
+    """
     
     def __init__(self, max_concurrent: int = 3, node_timeout: int = 30):
         self.max_concurrent = max_concurrent
         self.node_timeout = node_timeout
         self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._node = shutil.which("node")
+        self._idle: deque[asyncio.subprocess.Process] = deque()
+        self._spawning: set[asyncio.Task[None]] = set()
     
     async def run(self, request: ExecutionRequest) -> ExecutionResponse:
         """Execute JavaScript code using Node.js."""
@@ -38,145 +86,118 @@ class JavaScriptExecutionTool:
                 stderr=result.stderr,
                 duration_seconds=result.duration_seconds,
             )
+
+    async def close(self) -> None:
+        """Stop warm processes that were never handed a script."""
+        for task in list(self._spawning):
+            task.cancel()
+        await asyncio.gather(*self._spawning, return_exceptions=True)
+        while self._idle:
+            process = self._idle.popleft()
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            cast(str, self._node), "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=tempfile.gettempdir(),
+            start_new_session=True,
+            env={
+                "NODE_ENV": "sandbox",
+                "NODE_OPTIONS": "--max-old-space-size=128",  # Limit memory
+            },
+        )
+
+    async def _add_idle(self) -> None:
+        self._idle.append(await self._spawn())
+
+    def _refill(self) -> None:
+        """Top the warm pool back up in the background."""
+        missing = self.max_concurrent - len(self._idle) - len(self._spawning)
+        for _ in range(missing):
+            task = asyncio.create_task(self._add_idle())
+            self._spawning.add(task)
+            task.add_done_callback(self._spawning.discard)
+
+    async def _acquire(self) -> asyncio.subprocess.Process:
+        while self._idle:
+            process = self._idle.popleft()
+            if process.returncode is None:
+                return process
+        return await self._spawn()
     
     async def _execute_javascript_async(self, request: ExecutionRequest) -> ExecutionResult:
-        """Execute JavaScript code using Node.js subprocess."""
-        with TemporaryDirectory(prefix="ultimate_mcp_js_") as tmp:
-            # Create package.json for isolated environment
-            package_json = {
-                "name": "mcp-execution",
-                "version": "1.0.0",
-                "type": "module",
-                "dependencies": {}
-            }
-            
-            package_path = Path(tmp) / "package.json"
-            package_path.write_text(json.dumps(package_json, indent=2))
-            
-            # Write the JavaScript code
-            script_path = Path(tmp) / "script.js"
-            
-            # Wrap user code with safety measures
-            wrapped_code = self._wrap_javascript_code(request.code)
-            script_path.write_text(wrapped_code, encoding="utf-8")
-            
-            start = time.perf_counter()
-            
-            try:
-                # Check if Node.js is available
-                node_check = await asyncio.create_subprocess_exec(
-                    "node", "--version",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await node_check.communicate()
-                
-                if node_check.returncode != 0:
-                    return ExecutionResult(
-                        id=str(uuid.uuid4()),
-                        language="javascript",
-                        return_code=1,
-                        stdout="",
-                        stderr="Node.js not available on system",
-                        duration_seconds=0.0,
-                    )
-                
-                # Execute JavaScript with Node.js
-                process = await asyncio.create_subprocess_exec(
-                    "node", str(script_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=tmp,
-                    env={
-                        "NODE_ENV": "sandbox",
-                        "NODE_OPTIONS": "--max-old-space-size=128",  # Limit memory
-                    }
-                )
-                
-                # Wait for completion with timeout
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=min(request.timeout_seconds, self.node_timeout)
-                )
-                
-                duration = time.perf_counter() - start
-                
-                return ExecutionResult(
-                    id=str(uuid.uuid4()),
-                    language="javascript",
-                    return_code=process.returncode or 0,
-                    stdout=stdout.decode("utf-8") if stdout else "",
-                    stderr=stderr.decode("utf-8") if stderr else "",
-                    duration_seconds=duration,
-                )
-                
-            except asyncio.TimeoutError:
-                # Kill the process if it times out
-                if process.returncode is None:
-                    process.kill()
-                    await process.wait()
-                
-                duration = time.perf_counter() - start
-                return ExecutionResult(
-                    id=str(uuid.uuid4()),
-                    language="javascript",
-                    return_code=-1,
-                    stdout="",
-                    stderr=f"Execution timed out after {request.timeout_seconds} seconds",
-                    duration_seconds=duration,
-                )
+        """Execute JavaScript code in a pre-spawned Node.js process."""
+        if self._node is None:
+            return ExecutionResult(
+                id=str(uuid.uuid4()),
+                language="javascript",
+                return_code=1,
+                stdout="",
+                stderr="Node.js not available on system",
+                duration_seconds=0.0,
+            )
+
+        # Wrap user code with safety measures
+        wrapped_code = self._wrap_javascript_code(request.code_bytes)
+        start = time.perf_counter()
+        
+        try:
+            process = await self._acquire()
+            self._refill()
             
-            except Exception as e:
-                duration = time.perf_counter() - start
-                return ExecutionResult(
-                    id=str(uuid.uuid4()),
-                    language="javascript",
-                    return_code=1,
-                    stdout="",
-                    stderr=f"Execution error: {e}",
-                    duration_seconds=duration,
-                )
+            # Output is capped per stream; whatever was read survives a timeout
+            stdout, stderr, timed_out = await collect_output(
+                process,
+                min(request.timeout_seconds, self.node_timeout),
+                stdin=wrapped_code,
+            )
+            duration = time.perf_counter() - start
+
+            stderr_text = stderr.decode("utf-8", errors="replace")
+            if timed_out:
+                stderr_text += f"\nExecution timed out after {request.timeout_seconds} seconds"
+            return ExecutionResult(
+                id=str(uuid.uuid4()),
+                language="javascript",
+                return_code=-1 if timed_out else process.returncode or 0,
+                stdout=stdout.decode("utf-8", errors="replace"),
+                stderr=stderr_text,
+                duration_seconds=duration,
+            )
+
+        except Exception as e:
+            duration = time.perf_counter() - start
+            return ExecutionResult(
+                id=str(uuid.uuid4()),
+                language="javascript",
+                return_code=1,
+                stdout="",
+                stderr=f"Execution error: {e}",
+                duration_seconds=duration,
+            )
     
-    def _wrap_javascript_code(self, user_code: str) -> str:
+    def _wrap_javascript_code(self, user_code: bytes) -> bytes:
         """Wrap user code with safety measures and timeout."""
-        return f"""
-// Security and safety wrapper for user code
-(async function() {{
-    // Disable dangerous globals
-    if (typeof global !== 'undefined') {{
-        delete global.process;
-        delete global.require;
-    }}
-    
-    // Set execution timeout
-    const timeoutId = setTimeout(() => {{
-        console.error('Script execution timed out');
-        process.exit(124);
-    }}, 25000); // 25 second internal timeout
-    
-    try {{
-        // User code execution
-        {user_code}
-        
-        // Clear timeout if execution completes
-        clearTimeout(timeoutId);
-    }} catch (error) {{
-        clearTimeout(timeoutId);
-        console.error('Runtime error:', error.message);
-        process.exit(1);
-    }}
-}})().catch(error => {{
-    console.error('Async error:', error.message);
-    process.exit(1);
-}});
-"""
+        return _JS_PREFIX + user_code + _JS_SUFFIX
+
+
+@functools.lru_cache(maxsize=1)
+def _get_python_tool() -> AsyncExecutionTool:
+    """Shared Python executor, imported and built once per process."""
+    from .async_exec_tool import AsyncExecutionTool
+
+    return AsyncExecutionTool()
 
 
 class MultiLanguageExecutionTool:
     """Multi-language execution tool supporting Python and JavaScript."""
     
     def __init__(self):
-        self.python_tool = None  # Will be injected
         self.js_tool = JavaScriptExecutionTool()
     
     async def run(self, request: ExecutionRequest) -> ExecutionResponse:
@@ -184,10 +205,7 @@ class MultiLanguageExecutionTool:
         language = request.language.lower()
         
         if language == "python":
-            if not self.python_tool:
-                from .async_exec_tool import AsyncExecutionTool
-                self.python_tool = AsyncExecutionTool()
-            return await self.python_tool.run(request)
+            return await _get_python_tool().run(request)
         
         elif language in ["javascript", "js", "node"]:
             return await self.js_tool.run(request)
@@ -9,10 +9,12 @@ import shutil
 import subprocess
 import uuid
 from dataclasses import dataclass
+from functools import cached_property
 from tempfile import NamedTemporaryFile
 
 from pydantic import BaseModel, Field
 
+from ..analytics.complexity_analytics import ROLLUP_UPSERT_CLAUSE, invalidate_complexity_cache
 from ..database.models import LintResult
 from ..database.neo4j_client import Neo4jClient
 from ..utils.validation import ensure_supported_language
@@ -28,6 +30,11 @@ class LintRequest(BaseModel):
     code: str = Field(..., description="Source code to lint.")
     language: str = Field(default="python", description="Programming language identifier.")
 
+    @cached_property
+    def code_bytes(self) -> bytes:
+        """UTF-8 encoding of ``code``, computed once and shared by hashing and linting."""
+        return self.code.encode("utf-8")
+
 
 class LintResponse(BaseModel):
     id: str
@@ -60,9 +67,11 @@ class LintTool:
             }
         )
         complexity = self._estimate_complexity(tree)
-        code_hash = hashlib.sha256(request.code.encode("utf-8")).hexdigest()
+        code_hash = hashlib.sha256(request.code_bytes, usedforsecurity=False).hexdigest()
 
-        outcome = await asyncio.to_thread(self._run_external_linter, request.code, request.language)
+        outcome = await asyncio.to_thread(
+            self._run_external_linter, request.code_bytes, request.language
+        )
         record_id = str(uuid.uuid4())
 
         lint_result = LintResult(
@@ -93,8 +102,8 @@ class LintTool:
         payload = result.model_dump()
         await self._neo4j.execute_write(
             """
-            MERGE (r:LintResult {id: $id})
-            SET r += {
+            MERGE (l:LintResult {id: $id})
+            SET l += {
                 code_hash: $code_hash,
                 language: $language,
                 functions: $functions,
@@ -105,11 +114,13 @@ class LintTool:
                 linter_output: $linter_output,
                 created_at: datetime($created_at)
             }
-            """,
+            """
+            + ROLLUP_UPSERT_CLAUSE,
             {**payload, "created_at": result.created_at.isoformat()},
         )
+        await invalidate_complexity_cache()
 
-    def _run_external_linter(self, code: str, language: str) -> _LinterOutcome:
+    def _run_external_linter(self, code: bytes, language: str) -> _LinterOutcome:
         if language != "python":
             return _LinterOutcome(0, "External linting unavailable for non-Python languages.")
 
@@ -117,7 +128,7 @@ class LintTool:
             cmd = ["ruff", "check", "--quiet", "--stdin-filename", "snippet.py", "-"]
             completed = subprocess.run(  # noqa: S603
                 cmd,
-                input=code.encode("utf-8"),
+                input=code,
                 capture_output=True,
                 check=False,
             )
@@ -125,7 +136,7 @@ class LintTool:
             return _LinterOutcome(completed.returncode, output.strip())
 
         if shutil.which("flake8"):
-            with NamedTemporaryFile("w", suffix=".py", delete=False) as handle:
+            with NamedTemporaryFile("wb", suffix=".py", delete=False) as handle:
                 handle.write(code)
                 temp_path = handle.name
             cmd = ["flake8", temp_path]
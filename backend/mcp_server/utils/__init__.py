@@ -6,6 +6,7 @@ from .cache import (
     CacheWarmer,
     InMemoryCache,
     QueryCache,
+    TinyLFUCache,
     get_cache,
     init_cache,
 )
@@ -53,6 +54,7 @@ __all__ = [
     "InMemoryCache",
     "PayloadValidationError",
     "QueryCache",
+    "TinyLFUCache",
     "RateLimitConfig",
     "SecurityContext",
     "SecurityLevel",
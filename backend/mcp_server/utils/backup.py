@@ -3,18 +3,41 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
 import logging
 import os
 import shutil
 from datetime import datetime, timedelta
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import Optional
 
+from .process_output import collect_output
+
+try:
+    import zstandard  # type: ignore[import-untyped]
+
+    ZSTD_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# neo4j-admin reads and writes "<database>.dump" inside --to-path/--from-path
+_DUMP_NAME = "neo4j.dump"
+# Matches plain and compressed (.dump.zst / .dump.gz) backups
+_BACKUP_GLOB = "neo4j_backup_*.dump*"
+_COPY_CHUNK = 1 << 20
+
 
 class Neo4jBackupManager:
-    """Automated Neo4j backup management."""
+    """Automated Neo4j backup management.
+
+    ``backup_dir`` must be bind-mounted into the Neo4j container at
+    ``/backups`` (see ``deployment/docker-compose.yml``) so dumps are written
+    and read in place rather than streamed through ``docker cp``.
+    """
     
     def __init__(
         self,
@@ -22,11 +45,16 @@ class Neo4jBackupManager:
         container_name: str = "ultimate_mcp_neo4j",
         retention_days: int = 7,
         max_backups: int = 10,
+        compress: bool = False,
     ):
         self.backup_dir = Path(backup_dir)
         self.container_name = container_name
         self.retention_days = retention_days
         self.max_backups = max_backups
+        # Compress finished dumps with zstd (gzip when zstandard is missing)
+        self.compress = compress
+        # stat() results per backup file, dropped when the file is removed
+        self._stat_cache: dict[Path, os.stat_result] = {}
         
         # Ensure backup directory exists
         self.backup_dir.mkdir(parents=True, exist_ok=True)
@@ -39,45 +67,30 @@ class Neo4jBackupManager:
         
         try:
             # Create backup using neo4j-admin dump
-            cmd = [
-                "docker", "exec", self.container_name,
+            returncode, stderr = await self._docker_exec(
                 "neo4j-admin", "database", "dump", "neo4j",
                 "--to-path=/backups",
-                f"--overwrite-destination=true"
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                "--overwrite-destination=true",
             )
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0:
-                # Copy backup from container to host
-                copy_cmd = [
-                    "docker", "cp",
-                    f"{self.container_name}:/backups/neo4j.dump",
-                    str(backup_path)
-                ]
-                
-                copy_process = await asyncio.create_subprocess_exec(
-                    *copy_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                
-                await copy_process.communicate()
-                
-                if copy_process.returncode == 0:
+            if returncode == 0:
+                # The dump lands directly in the host-mounted backup directory;
+                # a same-filesystem rename gives it its timestamped name.
+                dump_path = self.backup_dir / _DUMP_NAME
+                if dump_path.exists():
+                    dump_path.rename(backup_path)
+                    if self.compress:
+                        backup_path = await asyncio.to_thread(self._compress, backup_path)
                     logger.info("Backup created successfully", extra={
                         "backup_path": str(backup_path),
-                        "size_mb": backup_path.stat().st_size / (1024 * 1024)
+                        "size_mb": self._stat(backup_path).st_size / (1024 * 1024)
                     })
                     return backup_path
                 else:
-                    logger.error("Failed to copy backup from container")
+                    logger.error("Dump not found in backup directory", extra={
+                        "expected_path": str(dump_path),
+                        "hint": "mount the backup directory at /backups in the container",
+                    })
             else:
                 logger.error("Backup creation failed", extra={
                     "stderr": stderr.decode() if stderr else "No error output"
@@ -95,53 +108,34 @@ class Neo4jBackupManager:
             return False
         
         try:
-            # Stop Neo4j service
-            stop_cmd = ["docker", "exec", self.container_name, "neo4j", "stop"]
-            await asyncio.create_subprocess_exec(*stop_cmd)
-            
-            # Wait for service to stop
-            await asyncio.sleep(5)
-            
-            # Copy backup to container
-            copy_cmd = [
-                "docker", "cp",
-                str(backup_path),
-                f"{self.container_name}:/backups/restore.dump"
-            ]
-            
-            copy_process = await asyncio.create_subprocess_exec(
-                *copy_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            
-            await copy_process.communicate()
+            # Stage the dump under the name neo4j-admin loads from /backups before
+            # stopping the service, so decompression does not extend downtime.
+            # A hard link avoids copying when the backup is on the same volume.
+            staged_path = self.backup_dir / _DUMP_NAME
+            staged_path.unlink(missing_ok=True)
+            if backup_path.suffix in (".zst", ".gz"):
+                await asyncio.to_thread(self._decompress, backup_path, staged_path)
+            else:
+                try:
+                    os.link(backup_path, staged_path)
+                except OSError:
+                    await asyncio.to_thread(shutil.copyfile, backup_path, staged_path)
             
-            if copy_process.returncode != 0:
-                logger.error("Failed to copy backup to container")
-                return False
+            # Stop Neo4j service; waiting for the command replaces a fixed sleep
+            await self._docker_exec("neo4j", "stop")
             
             # Restore database
-            restore_cmd = [
-                "docker", "exec", self.container_name,
+            returncode, stderr = await self._docker_exec(
                 "neo4j-admin", "database", "load", "neo4j",
                 "--from-path=/backups",
-                "--overwrite-destination=true"
-            ]
-            
-            restore_process = await asyncio.create_subprocess_exec(
-                *restore_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                "--overwrite-destination=true",
             )
+            staged_path.unlink(missing_ok=True)
             
-            stdout, stderr = await restore_process.communicate()
+            # Start Neo4j service again whether or not the load succeeded
+            await self._docker_exec("neo4j", "start")
             
-            if restore_process.returncode == 0:
-                # Start Neo4j service
-                start_cmd = ["docker", "exec", self.container_name, "neo4j", "start"]
-                await asyncio.create_subprocess_exec(*start_cmd)
-                
+            if returncode == 0:
                 logger.info("Database restored successfully", extra={
                     "backup_path": str(backup_path)
                 })
@@ -157,36 +151,36 @@ class Neo4jBackupManager:
         return False
     
     async def cleanup_old_backups(self) -> None:
-        """Remove old backups based on retention policy."""
+        """Remove backups beyond the ``max_backups`` most recent ones.
+
+        Removed backups are logged as "old" when past ``retention_days`` and
+        as "excess" otherwise. Deletions run concurrently off the event loop.
+        """
         try:
-            backups = list(self.backup_dir.glob("neo4j_backup_*.dump"))
-            backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            backups = await asyncio.to_thread(self._scan)
+            victims = backups[self.max_backups:]
+            if not victims:
+                return
             
-            # Remove backups older than retention period
-            cutoff_time = datetime.now() - timedelta(days=self.retention_days)
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).timestamp()
+            results = await asyncio.gather(
+                *(asyncio.to_thread(path.unlink) for path, _ in victims),
+                return_exceptions=True,
+            )
             
             removed_count = 0
-            for backup in backups:
-                backup_time = datetime.fromtimestamp(backup.stat().st_mtime)
-                
-                # Keep max_backups most recent, regardless of age
-                if len(backups) - removed_count <= self.max_backups:
-                    break
-                
-                if backup_time < cutoff_time:
-                    backup.unlink()
-                    removed_count += 1
-                    logger.info("Removed old backup", extra={"path": str(backup)})
-            
-            # Also enforce max backup count
-            remaining_backups = list(self.backup_dir.glob("neo4j_backup_*.dump"))
-            remaining_backups.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            if len(remaining_backups) > self.max_backups:
-                for backup in remaining_backups[self.max_backups:]:
-                    backup.unlink()
-                    removed_count += 1
-                    logger.info("Removed excess backup", extra={"path": str(backup)})
+            for (path, stat), result in zip(victims, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to remove backup", extra={
+                        "path": str(path), "error": str(result)
+                    })
+                    continue
+                self._stat_cache.pop(path, None)
+                removed_count += 1
+                if stat.st_mtime < cutoff:
+                    logger.info("Removed old backup", extra={"path": str(path)})
+                else:
+                    logger.info("Removed excess backup", extra={"path": str(path)})
             
             if removed_count > 0:
                 logger.info("Backup cleanup completed", extra={"removed": removed_count})
@@ -195,28 +189,95 @@ class Neo4jBackupManager:
             logger.error("Backup cleanup failed", extra={"error": str(e)})
     
     async def list_backups(self) -> list[dict]:
-        """List available backups with metadata."""
+        """List available backups with metadata, newest first."""
         backups = []
         
         try:
-            for backup_path in self.backup_dir.glob("neo4j_backup_*.dump"):
-                stat = backup_path.stat()
+            now = datetime.now()
+            for backup_path, stat in await asyncio.to_thread(self._scan):
+                modified = datetime.fromtimestamp(stat.st_mtime)
                 backups.append({
                     "name": backup_path.name,
                     "path": str(backup_path),
                     "size_mb": round(stat.st_size / (1024 * 1024), 2),
-                    "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "age_days": (datetime.now() - datetime.fromtimestamp(stat.st_mtime)).days,
+                    "created_at": modified.isoformat(),
+                    "age_days": (now - modified).days,
                 })
-            
-            # Sort by creation time, newest first
-            backups.sort(key=lambda x: x["created_at"], reverse=True)
         
         except Exception as e:
             logger.error("Failed to list backups", extra={"error": str(e)})
         
         return backups
     
+    async def _docker_exec(self, *command: str) -> tuple[Optional[int], bytes]:
+        """Run ``command`` in the Neo4j container and wait for it to finish."""
+        process = await asyncio.create_subprocess_exec(
+            "docker", "exec", self.container_name, *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        # Verbose dump/load output is truncated, never a reason to kill them
+        _, stderr, _ = await collect_output(process, None, kill_on_overflow=False)
+        return process.returncode, stderr
+
+    def _stat(self, path: Path) -> os.stat_result:
+        """Return the cached ``stat()`` of a backup file; backups are immutable."""
+        stat = self._stat_cache.get(path)
+        if stat is None:
+            stat = self._stat_cache[path] = path.stat()
+        return stat
+
+    def _scan(self) -> list[tuple[Path, os.stat_result]]:
+        """List backups with their stats in one directory pass, newest first.
+
+        ``scandir`` entries usually carry the stat data already, and files
+        that vanished since the last scan are dropped from the stat cache.
+        """
+        backups: list[tuple[Path, os.stat_result]] = []
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if not fnmatch(entry.name, _BACKUP_GLOB):
+                    continue
+                path = Path(entry.path)
+                stat = self._stat_cache.get(path)
+                if stat is None:
+                    stat = self._stat_cache[path] = entry.stat()
+                backups.append((path, stat))
+        for stale in self._stat_cache.keys() - {path for path, _ in backups}:
+            del self._stat_cache[stale]
+        backups.sort(key=lambda item: item[1].st_mtime, reverse=True)
+        return backups
+
+    @staticmethod
+    def _compress(path: Path) -> Path:
+        """Stream-compress ``path`` next to itself and delete the original."""
+        suffix = ".zst" if zstandard is not None else ".gz"
+        target = path.with_name(path.name + suffix)
+        partial = path.with_name(f".{target.name}.partial")
+        with path.open("rb") as src:
+            if zstandard is not None:
+                with partial.open("wb") as dst:
+                    zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+            else:
+                with gzip.open(partial, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, _COPY_CHUNK)
+        partial.replace(target)
+        path.unlink()
+        return target
+
+    @staticmethod
+    def _decompress(path: Path, target: Path) -> None:
+        """Stream-decompress a ``.zst`` or ``.gz`` backup into ``target``."""
+        with path.open("rb") as src, target.open("wb") as dst:
+            if path.suffix == ".zst":
+                if zstandard is None:
+                    raise RuntimeError("zstandard is required to restore .zst backups")
+                zstandard.ZstdDecompressor().copy_stream(src, dst)
+            else:
+                with gzip.open(src, "rb") as inflated:
+                    shutil.copyfileobj(inflated, dst, _COPY_CHUNK)
+
     async def schedule_backups(self, interval_hours: int = 24) -> None:
         """Schedule automatic backups."""
         logger.info("Starting backup scheduler", extra={"interval_hours": interval_hours})
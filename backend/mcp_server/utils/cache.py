@@ -11,7 +11,7 @@ import logging
 import time
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Generic, TypeVar
+from typing import Any, Awaitable, Callable, Generic, Iterable, TypeVar
 
 try:
     import redis.asyncio as redis  # type: ignore[import-untyped]
@@ -21,18 +21,75 @@ except ImportError:  # pragma: no cover - optional dependency
     redis = None
     REDIS_AVAILABLE = False
 
+# Cache keys only index local and Redis entries, so a fast non-cryptographic
+# 128-bit digest replaces SHA-256 on every lookup.
+try:
+    import xxhash  # type: ignore[import-not-found]
+
+    def _new_hasher() -> Any:
+        return xxhash.xxh3_128()
+
+except ImportError:  # pragma: no cover - optional dependency
+
+    def _new_hasher() -> Any:
+        return hashlib.blake2b(digest_size=16, usedforsecurity=False)
+
 logger = logging.getLogger(__name__)
 
 R = TypeVar("R")
 
 
+def _canonical_digest(*values: Any) -> str:
+    """Digest ``values`` from a type-tagged, length-prefixed byte encoding.
+
+    Stable across processes (dict keys are sorted, nothing depends on
+    ``hash()``) and streamed into the hasher without building a JSON string.
+    Values of other types are encoded by their ``repr``.
+    """
+    hasher = _new_hasher()
+    update = hasher.update
+    stack: list[Any] = list(reversed(values))
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str:
+            data = value.encode("utf-8")
+            update(b"s%d:" % len(data))
+            update(data)
+        elif value is None:
+            update(b"n")
+        elif kind is bool:
+            update(b"t" if value else b"f")
+        elif kind is int:
+            update(b"i%d;" % value)
+        elif kind is float:
+            update(b"g%r;" % value)
+        elif kind is dict:
+            update(b"d%d:" % len(value))
+            for key in sorted(value, key=str, reverse=True):
+                stack.append(value[key])
+                stack.append(key)
+        elif kind is list or kind is tuple:
+            update(b"l%d:" % len(value))
+            stack.extend(reversed(value))
+        elif kind is bytes:
+            update(b"b%d:" % len(value))
+            update(value)
+        else:
+            data = repr(value).encode("utf-8")
+            update(b"r%d:" % len(data))
+            update(data)
+    return hasher.hexdigest()
+
+
 @dataclass
 class CacheEntry(Generic[R]):
-    """Cache entry containing value, expiry, and hit count."""
+    """Cache entry containing value, expiry, hit count, and CLOCK reference bit."""
 
     value: R
     expires_at: float
     hits: int = 0
+    referenced: bool = False
 
     def is_expired(self, now: float | None = None) -> bool:
         return (now or time.monotonic()) >= self.expires_at
@@ -45,6 +102,7 @@ class CacheMetrics:
     hits: int = 0
     misses: int = 0
     evictions: int = 0
+    rejections: int = 0
 
     @property
     def hit_rate(self) -> float:
@@ -53,7 +111,13 @@ class CacheMetrics:
 
 
 class InMemoryCache:
-    """Async-safe LRU cache with TTL and metrics."""
+    """Async-safe cache with TTL, metrics, and CLOCK (second-chance) eviction.
+
+    Hits only mark the entry as referenced instead of reordering the store;
+    eviction walks from the oldest entry, moving referenced ones to the back
+    once before dropping the first unreferenced one. This approximates LRU
+    while keeping the read path free of ``move_to_end``.
+    """
 
     def __init__(self, max_size: int = 1024, default_ttl: float = 300.0) -> None:
         if max_size <= 0:
@@ -67,22 +131,28 @@ class InMemoryCache:
         self._lock = asyncio.Lock()
         self.metrics = CacheMetrics()
 
-    async def get(self, key: str) -> Any | None:
-        now = time.monotonic()
-        async with self._lock:
-            entry = self._store.get(key)
-            if entry is None:
-                self.metrics.misses += 1
-                return None
-            if entry.is_expired(now):
-                self._store.pop(key, None)
-                self.metrics.misses += 1
-                return None
+    def get_nowait(self, key: str) -> Any | None:
+        """Look up ``key`` without awaiting.
+
+        Reads take no lock: nothing here yields to the event loop, so the
+        lookup, reference bit, and counter updates cannot interleave with a writer.
+        """
+        entry = self._store.get(key)
+        if entry is None:
+            self.metrics.misses += 1
+            return None
+        if entry.is_expired():
+            self._store.pop(key, None)
+            self.metrics.misses += 1
+            return None
 
-            self.metrics.hits += 1
-            entry.hits += 1
-            self._store.move_to_end(key)
-            return entry.value
+        self.metrics.hits += 1
+        entry.hits += 1
+        entry.referenced = True
+        return entry.value
+
+    async def get(self, key: str) -> Any | None:
+        return self.get_nowait(key)
 
     async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None:
         expires_at = time.monotonic() + (ttl or self.default_ttl)
@@ -90,15 +160,31 @@ class InMemoryCache:
             self._store[key] = CacheEntry(value=value, expires_at=expires_at)
             self._store.move_to_end(key)
             while len(self._store) > self.max_size:
-                self._store.popitem(last=False)
+                del self._store[self._next_victim()[0]]
                 self.metrics.evictions += 1
 
+    def _next_victim(self) -> tuple[str, CacheEntry[Any]]:
+        """Return the eviction candidate, giving referenced entries a second chance."""
+        while True:
+            key, entry = next(iter(self._store.items()))
+            if not entry.referenced:
+                return key, entry
+            entry.referenced = False
+            self._store.move_to_end(key)
+
     async def delete(self, key: str) -> bool:
         async with self._lock:
             existed = key in self._store
             self._store.pop(key, None)
             return existed
 
+    async def delete_prefix(self, prefix: str) -> int:
+        async with self._lock:
+            stale_keys = [key for key in self._store if key.startswith(prefix)]
+            for key in stale_keys:
+                self._store.pop(key, None)
+            return len(stale_keys)
+
     async def clear(self) -> None:
         async with self._lock:
             self._store.clear()
@@ -125,21 +211,19 @@ class InMemoryCache:
                 "hits": self.metrics.hits,
                 "misses": self.metrics.misses,
                 "evictions": self.metrics.evictions,
+                "rejections": self.metrics.rejections,
                 "hit_rate": self.metrics.hit_rate,
             },
         }
 
     def _generate_key(self, prefix: str, *args: Any, **kwargs: Any) -> str:
-        serialized = json.dumps(
-            {"args": args, "kwargs": kwargs},
-            default=repr,
-            sort_keys=True,
-            separators=(",", ":"),
-        )
-        digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
-        return f"{prefix}:{digest}"
-
-    def cached(self, *, ttl: float | None = None) -> Callable[[Callable[..., R]], Callable[..., Awaitable[R]]]:
+        # A digest of the full encoding, never hash(): distinct arguments with
+        # equal hashes (hash(-1) == hash(-2)) must not share an entry.
+        return f"{prefix}:{_canonical_digest(args, kwargs)}"
+
+    def cached(
+        self, *, ttl: float | None = None
+    ) -> Callable[[Callable[..., R]], Callable[..., Awaitable[R]]]:
         def decorator(func: Callable[..., R]) -> Callable[..., Awaitable[R]]:
             is_coroutine = asyncio.iscoroutinefunction(func)
             prefix = func.__qualname__
@@ -147,7 +231,7 @@ class InMemoryCache:
             @functools.wraps(func)
             async def wrapper(*args: Any, **kwargs: Any) -> R:
                 key = self._generate_key(prefix, *args, **kwargs)
-                cached_result = await self.get(key)
+                cached_result = self.get_nowait(key)
                 if cached_result is not None:
                     return cached_result  # type: ignore[return-value]
 
@@ -164,6 +248,88 @@ class InMemoryCache:
         return decorator
 
 
+# Halves every 4-bit counter packed in a byte-sized slot in one C-level pass
+_HALVE = bytes(value >> 1 for value in range(256))
+
+
+class FrequencySketch:
+    """Count-min sketch of 4-bit counters estimating how often keys are requested.
+
+    Counters are halved once ``sample_size`` increments have been recorded so
+    estimates follow recent popularity rather than all-time totals.
+    """
+
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+    _MAX_COUNT = 15
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        # Roughly ten counters per cached entry, split across the hash rows
+        width = 1 << max(4, (capacity * 10 // len(self._SEEDS) - 1).bit_length())
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self.sample_size = capacity * 10
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        h = hash(key)
+        return [((h * seed) >> 20) & self._mask for seed in self._SEEDS]
+
+    def increment(self, key: str) -> None:
+        added = False
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self._reset()
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _reset(self) -> None:
+        for row in self._rows:
+            row[:] = row.translate(_HALVE)
+        self._additions //= 2
+
+
+class TinyLFUCache(InMemoryCache):
+    """LRU cache with TinyLFU admission.
+
+    Every lookup is recorded in a frequency sketch. When the cache is full, a
+    new key only displaces the CLOCK eviction candidate if it has been
+    requested more often, so one-off queries cannot flush hot entries.
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl: float = 300.0) -> None:
+        super().__init__(max_size=max_size, default_ttl=default_ttl)
+        self._sketch = FrequencySketch(max_size)
+
+    def get_nowait(self, key: str) -> Any | None:
+        self._sketch.increment(key)
+        return super().get_nowait(key)
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        now = time.monotonic()
+        expires_at = now + (ttl or self.default_ttl)
+        async with self._lock:
+            if key not in self._store and len(self._store) >= self.max_size:
+                victim_key, victim = self._next_victim()
+                if not victim.is_expired(now) and (
+                    self._sketch.estimate(key) <= self._sketch.estimate(victim_key)
+                ):
+                    self.metrics.rejections += 1
+                    return
+            self._store[key] = CacheEntry(value=value, expires_at=expires_at)
+            self._store.move_to_end(key)
+            while len(self._store) > self.max_size:
+                del self._store[self._next_victim()[0]]
+                self.metrics.evictions += 1
+
+
 class CacheWarmer:
     """Background task that periodically cleans expired cache entries."""
 
@@ -202,6 +368,77 @@ class CacheWarmer:
             self._running = False
 
 
+class _RedisPipeline:
+    """Coalesce Redis commands issued concurrently into one pipeline round-trip.
+
+    Commands queued while the event loop is busy with other callers are sent
+    together by a background task as a non-transactional pipeline, so a burst
+    of cache lookups costs one RTT instead of one each.
+    """
+
+    def __init__(self, client: Any, *, max_batch: int = 256, window: float = 0.0) -> None:
+        self._client = client
+        self._max_batch = max_batch
+        self._window = window
+        self._queue: asyncio.Queue[tuple[str, tuple[Any, ...], asyncio.Future[Any]]] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def execute(self, command: str, *args: Any) -> Any:
+        queue = self._queue
+        if queue is None or self._task is None or self._task.done():
+            queue = self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run(queue), name="redis-pipeline")
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        queue.put_nowait((command, args, future))
+        return await future
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(
+        self, queue: asyncio.Queue[tuple[str, tuple[Any, ...], asyncio.Future[Any]]]
+    ) -> None:
+        batch: list[tuple[str, tuple[Any, ...], asyncio.Future[Any]]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                # Let every caller scheduled in this loop iteration (or window) enqueue
+                await asyncio.sleep(self._window)
+                while len(batch) < self._max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                results: list[Any]
+                try:
+                    async with self._client.pipeline(transaction=False) as pipe:
+                        for command, args, _ in batch:
+                            getattr(pipe, command)(*args)
+                        results = await pipe.execute(raise_on_error=False)
+                except Exception as error:
+                    results = [error] * len(batch)
+
+                for (_, _, future), result in zip(batch, results):
+                    if future.done():
+                        continue  # Caller was cancelled
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                batch = []
+        finally:
+            # Shutting down (or crashed): fail the in-flight batch and everything
+            # still queued so no caller waits forever.
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            closed = ConnectionError("Redis pipeline closed")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(closed)
+
+
 class QueryCache:
     """High-performance query cache with Redis backend and in-memory fallback."""
 
@@ -211,43 +448,81 @@ class QueryCache:
         *,
         default_ttl: float = 300.0,
         max_memory_size: int = 1024,
+        max_connections: int | None = None,
+        tiny_lfu: bool = False,
     ) -> None:
         self.default_ttl = default_ttl
-        self.memory_cache = InMemoryCache(max_size=max_memory_size, default_ttl=default_ttl)
+        memory_cache_cls = TinyLFUCache if tiny_lfu else InMemoryCache
+        self.memory_cache = memory_cache_cls(max_size=max_memory_size, default_ttl=default_ttl)
+        # Tag index for targeted invalidation; bounded so keys evicted from the
+        # cache without an explicit invalidation cannot accumulate forever.
+        self._key_tags: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+        self._tag_keys: dict[str, set[str]] = {}
+        self._max_tracked_keys = max_memory_size * 8
+        # Redis writes run in the background; past the limit new entries stay
+        # in the memory cache only rather than growing the backlog.
+        self._pending_writes: set[asyncio.Task[None]] = set()
+        self._pending_limit = 1024
+        # Local counters; also cover increments made while Redis was unreachable
+        self._counters: dict[str, int] = {}
         self.redis_client: "redis.Redis[str] | None" = None
+        self._redis_pool: "redis.BlockingConnectionPool | None" = None
+        self._pipeline: _RedisPipeline | None = None
 
         if redis_url and REDIS_AVAILABLE:
             try:
-                self.redis_client = redis.from_url(
+                # Bounded pool shared by concurrent commands; callers past the
+                # limit wait for a free connection instead of failing over.
+                self._redis_pool = redis.BlockingConnectionPool.from_url(
                     redis_url,
                     decode_responses=True,
                     socket_timeout=2.0,
+                    socket_keepalive=True,
+                    health_check_interval=30,
                     retry_on_timeout=True,
+                    max_connections=max_connections or 32,
+                    timeout=2.0,
                 )
+                self.redis_client = redis.Redis(connection_pool=self._redis_pool)
+                self._pipeline = _RedisPipeline(self.redis_client)
                 logger.info("Redis cache initialised", extra={"url": redis_url})
             except Exception as error:  # pragma: no cover - best effort
-                logger.warning("Redis initialisation failed; falling back to memory cache", extra={"error": str(error)})
+                logger.warning(
+                    "Redis initialisation failed; falling back to memory cache",
+                    extra={"error": str(error)},
+                )
                 self.redis_client = None
+                self._redis_pool = None
         elif redis_url:
-            logger.warning("redis.asyncio not installed; using in-memory cache", extra={"url": redis_url})
+            logger.warning(
+                "redis.asyncio not installed; using in-memory cache",
+                extra={"url": redis_url},
+            )
 
     @staticmethod
-    def _make_key(query: str, parameters: dict[str, Any] | None = None) -> str:
-        payload = json.dumps(parameters or {}, sort_keys=True, separators=(",", ":"))
-        digest = hashlib.sha256(f"{query}:{payload}".encode("utf-8")).hexdigest()
-        return f"query:{digest}"
+    def make_key(query: str, parameters: dict[str, Any] | None = None) -> str:
+        # Shared through Redis, so the key must not depend on per-process hash()
+        return f"query:{_canonical_digest(query, parameters or {})}"
+
+    async def get(
+        self, query: str, parameters: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]] | None:
+        return await self.get_value(self.make_key(query, parameters))
 
-    async def get(self, query: str, parameters: dict[str, Any] | None = None) -> list[dict[str, Any]] | None:
-        key = self._make_key(query, parameters)
+    async def get_value(self, key: str) -> Any | None:
+        """Return a JSON-compatible value stored under an explicit key."""
         if self.redis_client:
             try:
-                cached = await self.redis_client.get(key)
+                cached = await self._redis("get", key)
                 if cached:
                     return json.loads(cached)
             except Exception as error:
-                logger.warning("Redis get failed; falling back to memory cache", extra={"error": str(error), "key": key})
+                logger.warning(
+                    "Redis get failed; falling back to memory cache",
+                    extra={"error": str(error), "key": key},
+                )
 
-        return await self.memory_cache.get(key)
+        return self.memory_cache.get_nowait(key)
 
     async def set(
         self,
@@ -256,33 +531,170 @@ class QueryCache:
         *,
         parameters: dict[str, Any] | None = None,
         ttl: float | None = None,
+        tags: Iterable[str] = (),
     ) -> None:
-        key = self._make_key(query, parameters)
+        """Cache a query result, indexed under ``tags`` for ``invalidate_tags``."""
+        key = self.make_key(query, parameters)
+        await self.set_value(key, result, ttl=ttl)
+        tags = tuple(tags)
+        if tags:
+            self._track(key, tags)
+
+    def _track(self, key: str, tags: tuple[str, ...]) -> None:
+        self._untrack(key)
+        self._key_tags[key] = tags
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+        while len(self._key_tags) > self._max_tracked_keys:
+            self._untrack(next(iter(self._key_tags)))
+
+    def _untrack(self, key: str) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    async def set_value(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        """Store a JSON-compatible value under an explicit key.
+
+        Only the memory cache is written inline. The Redis write is detached,
+        and the memory copy serves reads until it lands.
+        """
         ttl = ttl or self.default_ttl
+        await self.memory_cache.set(key, value, ttl=ttl)
 
         if self.redis_client:
-            try:
-                await self.redis_client.setex(key, ttl, json.dumps(result, separators=(",", ":")))
+            if len(self._pending_writes) >= self._pending_limit:
+                logger.warning(
+                    "Redis write backlog full; keeping entry in memory cache",
+                    extra={"key": key, "pending": len(self._pending_writes)},
+                )
                 return
+            task = asyncio.create_task(self._write_through(key, value, ttl))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+
+    async def _write_through(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            await self._redis("setex", key, ttl, json.dumps(value, separators=(",", ":")))
+        except Exception as error:
+            logger.warning(
+                "Redis set failed; storing in memory cache",
+                extra={"error": str(error), "key": key},
+            )
+            return
+        # Redis is authoritative once written; a lingering memory copy could
+        # outlive an invalidation issued by another process.
+        await self.memory_cache.delete(key)
+
+    async def flush(self) -> None:
+        """Wait for background Redis writes issued so far to finish."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    async def incr(self, key: str) -> int:
+        """Increment a counter shared through Redis when configured."""
+        if self.redis_client:
+            try:
+                value = int(await self._redis("incr", key))
+                self._counters[key] = max(value, self._counters.get(key, 0))
+                return self._counters[key]
             except Exception as error:
-                logger.warning("Redis set failed; storing in memory cache", extra={"error": str(error), "key": key})
+                logger.warning(
+                    "Redis incr failed; using local counter",
+                    extra={"error": str(error), "key": key},
+                )
+        value = self._counters[key] = self._counters.get(key, 0) + 1
+        return value
 
-        await self.memory_cache.set(key, result, ttl=ttl)
+    async def get_counter(self, key: str) -> int:
+        """Return a counter maintained by ``incr`` (0 when never incremented)."""
+        local = self._counters.get(key, 0)
+        if self.redis_client:
+            try:
+                shared = await self._redis("get", key)
+                return max(int(shared or 0), local)
+            except Exception as error:
+                logger.warning(
+                    "Redis get failed; using local counter",
+                    extra={"error": str(error), "key": key},
+                )
+        return local
 
     async def invalidate_pattern(self, pattern: str) -> None:
+        await self.flush()
         if self.redis_client:
             try:
                 keys = await self.redis_client.keys(f"query:*{pattern}*")
                 if keys:
                     await self.redis_client.delete(*keys)
             except Exception as error:
-                logger.warning("Redis invalidate failed", extra={"error": str(error), "pattern": pattern})
+                logger.warning(
+                    "Redis invalidate failed",
+                    extra={"error": str(error), "pattern": pattern},
+                )
 
         await self.memory_cache.clear()
 
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete only the entries cached under any of ``tags``."""
+        keys: set[str] = set()
+        for tag in tags:
+            keys.update(self._tag_keys.get(tag, ()))
+        if not keys:
+            return 0
+
+        for key in keys:
+            self._untrack(key)
+
+        # Writes issued before the invalidation must not land after it
+        await self.flush()
+        if self.redis_client:
+            try:
+                await self.redis_client.delete(*keys)
+            except Exception as error:
+                logger.warning(
+                    "Redis invalidate failed",
+                    extra={"error": str(error), "keys": len(keys)},
+                )
+
+        for key in keys:
+            await self.memory_cache.delete(key)
+        return len(keys)
+
+    async def invalidate_prefix(self, prefix: str) -> None:
+        """Delete every entry whose explicit key starts with ``prefix``."""
+        await self.flush()
+        if self.redis_client:
+            try:
+                keys = [key async for key in self.redis_client.scan_iter(match=f"{prefix}*")]
+                if keys:
+                    await self.redis_client.delete(*keys)
+            except Exception as error:
+                logger.warning(
+                    "Redis invalidate failed",
+                    extra={"error": str(error), "prefix": prefix},
+                )
+
+        await self.memory_cache.delete_prefix(prefix)
+
+    async def _redis(self, command: str, *args: Any) -> Any:
+        """Run a Redis command, pipelined with concurrent ones when possible."""
+        if self._pipeline is not None:
+            return await self._pipeline.execute(command, *args)
+        return await getattr(self.redis_client, command)(*args)
+
     async def close(self) -> None:
+        await self.flush()
+        if self._pipeline is not None:
+            await self._pipeline.close()
         if self.redis_client:
             await self.redis_client.close()
+        if self._redis_pool is not None:
+            # Clients built on an explicit pool leave disconnecting to its owner
+            await self._redis_pool.disconnect()
 
 
 _cache_instance: QueryCache | None = None
@@ -291,11 +703,12 @@ _cache_instance: QueryCache | None = None
 def get_cache() -> QueryCache:
     global _cache_instance
     if _cache_instance is None:
-        _cache_instance = QueryCache()
+        _cache_instance = QueryCache(tiny_lfu=True)
     return _cache_instance
 
 
 def init_cache(redis_url: str | None = None, **kwargs: Any) -> QueryCache:
     global _cache_instance
+    kwargs.setdefault("tiny_lfu", True)
     _cache_instance = QueryCache(redis_url, **kwargs)
     return _cache_instance
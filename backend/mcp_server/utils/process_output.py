@@ -0,0 +1,130 @@
+"""Bounded collection of subprocess output and process-group cleanup.
+
+Callers should start children with ``start_new_session=True`` so each one
+leads its own process group; timeouts and output overruns then signal the
+whole group, taking down anything the child spawned as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+from collections import deque
+
+DEFAULT_OUTPUT_LIMIT = 1 << 20  # 1 MiB per stream
+_CHUNK_SIZE = 4096
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    """Send ``sig`` to the process group led by ``process``."""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        # Group already empty, or the child was not started as a group leader
+        if process.returncode is None:
+            process.send_signal(sig)
+
+
+async def terminate(process: asyncio.subprocess.Process, grace: float = 0.5) -> None:
+    """SIGTERM the process group, then SIGKILL whatever survives ``grace`` seconds."""
+    _signal_group(process, signal.SIGTERM)
+    try:
+        async with asyncio.timeout(grace):
+            await process.wait()
+    except TimeoutError:
+        pass
+    _signal_group(process, signal.SIGKILL)
+    await process.wait()
+
+
+async def _drain(
+    process: asyncio.subprocess.Process,
+    stream: asyncio.StreamReader | None,
+    buffer: deque[bytes],
+    limit: int,
+    kill: bool,
+) -> None:
+    """Read ``stream`` into ``buffer``, keeping at most ``limit`` bytes.
+
+    With ``kill`` the child's process group is killed once ``limit`` is hit.
+
+    Reading continues (discarding data) until EOF so the pipe is seen to close
+    and ``process.wait()`` can complete.
+    """
+    if stream is None:
+        return
+    remaining = limit
+    while chunk := await stream.read(_CHUNK_SIZE):
+        if kill and len(chunk) > remaining >= 0:
+            _signal_group(process, signal.SIGKILL)
+        if remaining > 0:
+            buffer.append(chunk[:remaining])
+        else:
+            # Buffered reads return without suspending; yield so the timeout
+            # still fires if something else keeps the pipe full.
+            await asyncio.sleep(0)
+        remaining -= len(chunk)
+
+
+async def _feed(process: asyncio.subprocess.Process, data: bytes) -> None:
+    stdin = process.stdin
+    if stdin is None:
+        return
+    try:
+        stdin.write(data)
+        await stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # Child exited before reading all of its input
+    finally:
+        stdin.close()
+
+
+async def collect_output(
+    process: asyncio.subprocess.Process,
+    timeout: float | None,
+    *,
+    stdin: bytes | None = None,
+    limit: int = DEFAULT_OUTPUT_LIMIT,
+    kill_on_overflow: bool = True,
+) -> tuple[bytes, bytes, bool]:
+    """Wait for ``process`` while keeping at most ``limit`` bytes of each stream.
+
+    Drop-in replacement for ``wait_for(process.communicate(stdin), timeout)``
+    that never buffers unbounded output: a child that writes more than
+    ``limit`` bytes to either stream is killed. Trusted long-running commands
+    pass ``kill_on_overflow=False`` to truncate the output instead. On timeout
+    the process group is terminated and output read up to that point is
+    returned.
+
+    Returns ``(stdout, stderr, timed_out)``.
+    """
+    stdout: deque[bytes] = deque()
+    stderr: deque[bytes] = deque()
+    tasks = [
+        _drain(process, process.stdout, stdout, limit, kill_on_overflow),
+        _drain(process, process.stderr, stderr, limit, kill_on_overflow),
+        process.wait(),
+    ]
+    if stdin is not None:
+        tasks.append(_feed(process, stdin))
+
+    # Shielded so the readers keep draining through termination; otherwise a
+    # full pipe could stop the exit from ever being observed.
+    pending = asyncio.gather(*tasks)
+    timed_out = False
+    try:
+        async with asyncio.timeout(timeout):
+            await asyncio.shield(pending)
+    except TimeoutError:
+        timed_out = True
+        await terminate(process)
+        await pending
+    except asyncio.CancelledError:
+        pending.cancel()
+        _signal_group(process, signal.SIGKILL)
+        raise
+    return b"".join(stdout), b"".join(stderr), timed_out
+
+
+__all__ = ["DEFAULT_OUTPUT_LIMIT", "collect_output", "terminate"]
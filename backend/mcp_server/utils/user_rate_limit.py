@@ -96,6 +96,53 @@ class UserRateLimiter:
         return len(window)
 
 
+class TokenBucket:
+    """Per-key token bucket refilled continuously from ``time.monotonic``.
+
+    ``allow`` never awaits, so on a single event loop each check is atomic and
+    needs no lock.
+    """
+
+    __slots__ = ("capacity", "rate", "buckets", "max_keys")
+
+    def __init__(self, rate: float, capacity: float | None = None, max_keys: int = 10_000):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.buckets: dict[str, list[float]] = {}
+        self.max_keys = max_keys
+
+    def allow(self, key: str) -> bool:
+        """Take one token for ``key``; return False when the bucket is empty."""
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self._prune(now)
+            self.buckets[key] = [self.capacity - 1.0, now]
+            return True
+
+        tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1.0:
+            bucket[0] = tokens
+            return False
+        bucket[0] = tokens - 1.0
+        return True
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled completely; they hold no state."""
+        refill_time = self.capacity / self.rate
+        buckets = {
+            key: bucket
+            for key, bucket in self.buckets.items()
+            if now - bucket[1] < refill_time
+        }
+        if len(buckets) >= self.max_keys:
+            # Every key is active: forget the oldest half rather than grow unbounded.
+            buckets = dict(list(buckets.items())[len(buckets) // 2:])
+        self.buckets = buckets
+
+
 class UserRateLimitMiddleware:
     """Middleware for user-based rate limiting."""
     
@@ -5,7 +5,13 @@ from __future__ import annotations
 import asyncio
 
 import pytest
-from mcp_server.utils.cache import CacheWarmer, InMemoryCache
+from mcp_server.utils.cache import (
+    CacheWarmer,
+    FrequencySketch,
+    InMemoryCache,
+    QueryCache,
+    TinyLFUCache,
+)
 
 
 @pytest.fixture
@@ -22,6 +28,18 @@ async def test_cache_set_and_get(cache):
     assert result == "value1"
 
 
+@pytest.mark.asyncio
+async def test_cache_reads_do_not_wait_for_the_write_lock(cache):
+    """Hits are served while a writer holds the lock."""
+    await cache.set("key1", "value1")
+
+    async with cache._lock:
+        assert cache.get_nowait("key1") == "value1"
+        assert await asyncio.wait_for(cache.get("key1"), timeout=0.1) == "value1"
+
+    assert cache.metrics.hits == 2
+
+
 @pytest.mark.asyncio
 async def test_cache_get_missing(cache):
     """Test getting non-existent key."""
@@ -71,6 +89,22 @@ async def test_cache_lru_eviction(cache):
     assert await cache.get("key5") == "value5"  # New entry
 
 
+@pytest.mark.asyncio
+async def test_cache_hits_do_not_reorder_the_store(cache):
+    """Test hits only set the reference bit; eviction gives them a second chance."""
+    for i in range(5):
+        await cache.set(f"key{i}", f"value{i}")
+
+    await cache.get("key0")
+    await cache.get("key1")
+    assert list(cache._store) == [f"key{i}" for i in range(5)]
+
+    await cache.set("key5", "value5")
+
+    assert list(cache._store) == ["key3", "key4", "key5", "key0", "key1"]
+    assert not cache._store["key0"].referenced
+
+
 @pytest.mark.asyncio
 async def test_cache_update_existing(cache):
     """Test updating existing entry."""
@@ -332,3 +366,263 @@ async def test_cache_generate_key_consistency():
     # Different args should generate different keys
     key3 = cache._generate_key("func", 1, 3, x=3)
     assert key1 != key3
+
+
+@pytest.mark.asyncio
+async def test_cache_decorator_separates_arguments_with_equal_hashes(cache):
+    """Test arguments whose hash() collides do not share a cached result."""
+    assert hash(-1) == hash(-2)
+
+    @cache.cached()
+    async def times_ten(value: int) -> int:
+        return value * 10
+
+    assert await times_ten(-1) == -10
+    assert await times_ten(-2) == -20
+
+
+def test_cache_generate_key_handles_unhashable_arguments():
+    """Unhashable arguments fall back to the canonical digest."""
+    cache = InMemoryCache()
+
+    key = cache._generate_key("func", [1, 2], options={"b": [3], "a": None})
+
+    assert key == cache._generate_key("func", [1, 2], options={"a": None, "b": [3]})
+    assert key != cache._generate_key("func", [1, 2], options={"a": None, "b": ["3"]})
+
+
+def test_query_cache_make_key_is_a_namespaced_128_bit_digest():
+    """Query keys keep their namespace and depend on query and parameters."""
+    key = QueryCache.make_key("MATCH (n) RETURN n", {"b": 2, "a": 1})
+
+    assert key == QueryCache.make_key("MATCH (n) RETURN n", {"a": 1, "b": 2})
+    assert key != QueryCache.make_key("MATCH (n) RETURN n", {"a": 1})
+    prefix, digest = key.split(":")
+    assert prefix == "query"
+    assert len(digest) == 32
+
+
+@pytest.mark.asyncio
+async def test_cache_delete_prefix(cache):
+    """Test deleting entries by key prefix."""
+    await cache.set("report:1", "a")
+    await cache.set("report:2", "b")
+    await cache.set("other", "c")
+
+    removed = await cache.delete_prefix("report:")
+
+    assert removed == 2
+    assert await cache.get("report:1") is None
+    assert await cache.get("other") == "c"
+
+
+def test_frequency_sketch_estimates_and_ages():
+    """Test the sketch counts requests and halves counters after a sample."""
+    sketch = FrequencySketch(capacity=8)
+    for _ in range(5):
+        sketch.increment("hot")
+    sketch.increment("cold")
+
+    assert sketch.estimate("hot") >= 5
+    assert sketch.estimate("hot") > sketch.estimate("cold")
+    assert sketch.estimate("never") <= sketch.estimate("cold")
+
+    before = sketch.estimate("hot")
+    for i in range(sketch.sample_size):
+        sketch.increment(f"noise{i}")
+    assert sketch.estimate("hot") < before
+
+
+@pytest.mark.asyncio
+async def test_tinylfu_rejects_one_hit_wonders():
+    """Test a scan of one-off keys cannot displace frequently read entries."""
+    cache = TinyLFUCache(max_size=3, default_ttl=60.0)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key)
+        for _ in range(3):
+            assert await cache.get(key) == key
+
+    for i in range(10):
+        assert await cache.get(f"scan{i}") is None
+        await cache.set(f"scan{i}", i)
+
+    for key in ("a", "b", "c"):
+        assert await cache.get(key) == key
+    assert cache.metrics.rejections == 10
+    assert cache.get_stats()["metrics"]["rejections"] == 10
+
+
+@pytest.mark.asyncio
+async def test_tinylfu_admits_popular_newcomer():
+    """Test a key requested more often than the LRU victim is admitted."""
+    cache = TinyLFUCache(max_size=2, default_ttl=60.0)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    for _ in range(4):
+        await cache.get("new")
+
+    await cache.set("new", 3)
+
+    assert await cache.get("new") == 3
+    assert await cache.get("a") is None
+    assert cache.metrics.evictions == 1
+
+
+def test_query_cache_memory_policy():
+    """Test the query cache selects TinyLFU admission on request."""
+    assert type(QueryCache().memory_cache) is InMemoryCache
+    assert isinstance(QueryCache(tiny_lfu=True).memory_cache, TinyLFUCache)
+
+
+@pytest.mark.asyncio
+async def test_query_cache_invalidates_by_tag():
+    """Test tag invalidation only drops entries stored under those tags."""
+    cache = QueryCache()
+    await cache.set("MATCH (s:Service) RETURN s", [{"s": 1}], tags=("Service",))
+    await cache.set("MATCH (d:Database) RETURN d", [{"d": 1}], tags=("Database",))
+    await cache.set("MATCH (s:Service)--(d:Database) RETURN s", [{"s": 2}], tags=("Service", "Database"))
+
+    removed = await cache.invalidate_tags(["Service"])
+
+    assert removed == 2
+    assert await cache.get("MATCH (s:Service) RETURN s") is None
+    assert await cache.get("MATCH (d:Database) RETURN d") == [{"d": 1}]
+    assert await cache.invalidate_tags(["Service"]) == 0
+    assert cache._tag_keys == {"Database": {cache.make_key("MATCH (d:Database) RETURN d")}}
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, str], batches: list[list[tuple[str, ...]]]) -> None:
+        self._store = store
+        self._batches = batches
+        self._commands: list[tuple[str, ...]] = []
+
+    async def __aenter__(self) -> "_FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def get(self, key: str) -> None:
+        self._commands.append(("get", key))
+
+    def incr(self, key: str) -> None:
+        self._commands.append(("incr", key))
+
+    def setex(self, key: str, ttl: float, value: str) -> None:
+        self._commands.append(("setex", key, value))
+
+    async def execute(self, raise_on_error: bool = True) -> list[object]:
+        self._batches.append(self._commands)
+        results: list[object] = []
+        for command in self._commands:
+            if command[0] == "get":
+                results.append(self._store.get(command[1]))
+            elif command[0] == "incr":
+                value = str(int(self._store.get(command[1], "0")) + 1)
+                self._store[command[1]] = value
+                results.append(int(value))
+            else:
+                self._store[command[1]] = command[2]
+                results.append(True)
+        return results
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.batches: list[list[tuple[str, ...]]] = []
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        assert transaction is False
+        return _FakePipeline(self.store, self.batches)
+
+    async def close(self) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_query_cache_pipelines_concurrent_redis_commands():
+    """Test concurrent Redis reads and writes share one pipeline round-trip."""
+    from mcp_server.utils.cache import _RedisPipeline
+
+    cache = QueryCache()
+    cache.redis_client = _FakeRedis()  # type: ignore[assignment]
+    cache._pipeline = _RedisPipeline(cache.redis_client)
+
+    await asyncio.gather(*(cache.set_value(f"k{i}", [i]) for i in range(5)))
+    await cache.flush()
+    values = await asyncio.gather(*(cache.get_value(f"k{i}") for i in range(6)))
+    await cache.close()
+
+    assert values == [[0], [1], [2], [3], [4], None]
+    assert [len(batch) for batch in cache.redis_client.batches] == [5, 6]
+
+
+@pytest.mark.asyncio
+async def test_query_cache_writes_redis_in_the_background():
+    """Test set returns before the Redis write and memory covers it until it lands."""
+    from mcp_server.utils.cache import _RedisPipeline
+
+    cache = QueryCache()
+    cache.redis_client = _FakeRedis()  # type: ignore[assignment]
+    cache._pipeline = _RedisPipeline(cache.redis_client)
+
+    await cache.set_value("k", [1])
+    assert cache.redis_client.store == {}
+    assert cache.memory_cache.get_nowait("k") == [1]
+
+    await cache.flush()
+    assert cache.redis_client.store == {"k": "[1]"}
+    assert cache.memory_cache.get_nowait("k") is None
+    assert await cache.get_value("k") == [1]
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_query_cache_counters_are_shared_through_redis():
+    """Test counters live in Redis so every process sees the same generation."""
+    from mcp_server.utils.cache import _RedisPipeline
+
+    cache = QueryCache()
+    assert await cache.get_counter("gen") == 0
+    assert await cache.incr("gen") == 1
+
+    shared = _FakeRedis()
+    shared.store["gen"] = "5"
+    cache.redis_client = shared  # type: ignore[assignment]
+    cache._pipeline = _RedisPipeline(shared)
+
+    assert await cache.incr("gen") == 6
+    assert await cache.get_counter("gen") == 6
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_pipeline_close_fails_pending_commands():
+    """Test closing the pipeline resolves in-flight and queued commands."""
+    from mcp_server.utils.cache import _RedisPipeline
+
+    started = asyncio.Event()
+
+    class _StuckPipeline(_FakePipeline):
+        async def execute(self, raise_on_error: bool = True) -> list[object]:
+            started.set()
+            await asyncio.Event().wait()
+            return []
+
+    class _StuckRedis(_FakeRedis):
+        def pipeline(self, transaction: bool = True) -> _FakePipeline:
+            return _StuckPipeline(self.store, self.batches)
+
+    pipeline = _RedisPipeline(_StuckRedis())
+    in_flight = asyncio.create_task(pipeline.execute("get", "a"))
+    await started.wait()
+    queued = asyncio.create_task(pipeline.execute("get", "b"))
+    await asyncio.sleep(0)
+
+    await pipeline.close()
+
+    for task in (in_flight, queued):
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(task, timeout=1.0)
@@ -0,0 +1,238 @@
+"""Tests for the caching Neo4j client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from mcp_server.database.cached_neo4j_client import CachedNeo4jClient, _classify
+from mcp_server.utils.cache import QueryCache
+
+
+@pytest.fixture
+def cached_client():
+    """Create a cached client without connecting to a database."""
+    return CachedNeo4jClient(
+        "bolt://localhost:7687",
+        "neo4j",
+        "password",
+        "neo4j",
+        cache=QueryCache(),
+        enable_circuit_breaker=False,
+    )
+
+
+@pytest.mark.parametrize(
+    ("query", "cacheable"),
+    [
+        ("MATCH (n:Service) RETURN n", True),
+        ("match (n) return count(n)", True),
+        ("CALL db.labels()", True),
+        ("CALL db.relationshipTypes()", True),
+        ("MATCH (n) SET n.flag = true", False),
+        ("MERGE (n:Service {name: $name})", False),
+        ("MATCH (n) WHERE n.reset_at > 0 RETURN n.dataset", True),
+        ("SHOW INDEXES", False),
+    ],
+)
+def test_should_cache(cached_client, query, cacheable):
+    """Test only read-only queries are cached."""
+    assert cached_client._should_cache(query) is cacheable
+
+
+@pytest.mark.parametrize(
+    ("query", "invalidates"),
+    [
+        ("CREATE (n:Service)", True),
+        ("match (n) detach delete n", True),
+        ("MATCH (n) REMOVE n.flag", True),
+        ("MATCH (n) RETURN n.offset", False),
+        ("MATCH (n:Asset) RETURN n", False),
+    ],
+)
+def test_should_invalidate(cached_client, query, invalidates):
+    """Test write clauses trigger invalidation on whole words only."""
+    assert cached_client._should_invalidate(query) is invalidates
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_labels_once_classified(cached_client, monkeypatch):
+    """Test writes invalidate per label using the memoized classification."""
+    invalidated = []
+
+    async def record(tags):
+        invalidated.append(tags)
+        return 0
+
+    async def no_write(self, query, parameters=None):
+        return None
+
+    monkeypatch.setattr(cached_client.cache, "invalidate_tags", record)
+    monkeypatch.setattr(
+        "mcp_server.database.neo4j_client.Neo4jClient.execute_write", no_write
+    )
+    query = "MERGE (s:Service {name: $name})-[:DEPENDS_ON]->(d:Database)"
+
+    _classify.cache_clear()
+    await cached_client.execute_write(query, {"name": "api"})
+    await cached_client.execute_write(query, {"name": "worker"})
+    await cached_client.flush_invalidations()
+
+    assert invalidated == [("Service", "DEPENDS_ON", "Database", "*")] * 2
+    assert _classify.cache_info().misses == 1
+
+
+@pytest.mark.asyncio
+async def test_write_returns_before_invalidation(cached_client, monkeypatch):
+    """Test writes schedule invalidation instead of waiting for it."""
+    release = asyncio.Event()
+    invalidated = []
+
+    async def slow_invalidate(tags):
+        await release.wait()
+        invalidated.append(tags)
+        return 0
+
+    async def no_write(self, query, parameters=None):
+        return None
+
+    monkeypatch.setattr(cached_client.cache, "invalidate_tags", slow_invalidate)
+    monkeypatch.setattr(
+        "mcp_server.database.neo4j_client.Neo4jClient.execute_write", no_write
+    )
+
+    await cached_client.execute_write("CREATE (n:Service)")
+    assert invalidated == []
+    assert len(cached_client._pending_invalidations) == 1
+
+    release.set()
+    await cached_client.flush_invalidations()
+    assert invalidated == [("Service", "*")]
+    assert not cached_client._pending_invalidations
+
+    await cached_client.execute_write("CREATE (n)", await_invalidation=True)
+    assert invalidated == [("Service", "*"), ("*",)]
+
+
+@pytest.mark.parametrize(
+    ("query", "tags"),
+    [
+        ("MATCH (n:Service)-[:CALLS]->(m:Service) RETURN n", ("Service", "CALLS")),
+        ("MATCH (n) RETURN count(n)", ("*",)),
+        ("MERGE (n:Service)-[:CALLS]->(m:Api)", ("Service", "CALLS", "Api", "*")),
+        ("MATCH (n) SET n.flag = true", ("*",)),
+        ("SHOW INDEXES", ()),
+    ],
+)
+def test_query_tags(query, tags):
+    """Test reads are tagged by label and writes invalidate their labels."""
+    assert _classify(query).tags == tags
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_only_matching_reads(cached_client, monkeypatch):
+    """Test a labelled write keeps unrelated cached reads warm."""
+    reads = {
+        "MATCH (s:Service) RETURN s": [{"s": 1}],
+        "MATCH (d:Database) RETURN d": [{"d": 1}],
+        "MATCH (n) RETURN count(n) AS total": [{"total": 2}],
+    }
+    calls = []
+
+    async def read(self, query, parameters=None):
+        calls.append(query)
+        return reads[query]
+
+    async def no_write(self, query, parameters=None):
+        return None
+
+    monkeypatch.setattr("mcp_server.database.neo4j_client.Neo4jClient.execute_read", read)
+    monkeypatch.setattr(
+        "mcp_server.database.neo4j_client.Neo4jClient.execute_write", no_write
+    )
+
+    for query in reads:
+        await cached_client.execute_read(query)
+    await cached_client.execute_write(
+        "MERGE (s:Service {name: $name})", {"name": "api"}, await_invalidation=True
+    )
+    for query in reads:
+        assert await cached_client.execute_read(query) == reads[query]
+
+    assert calls == list(reads) + [
+        "MATCH (s:Service) RETURN s",
+        "MATCH (n) RETURN count(n) AS total",
+    ]
+
+
+def test_query_hash_is_stable_hex():
+    """Test log correlation hashes are short, stable hex digests."""
+    qhash = _classify("MATCH (n:Service) RETURN n").qhash
+
+    assert qhash == "7a58e13ebaf5b7b4"
+    assert _classify("MATCH (n:Service) RETURN n ").qhash != qhash
+
+
+@pytest.mark.asyncio
+async def test_schema_procedures_memoized_until_write(cached_client, monkeypatch):
+    """Test schema procedures skip the cache backend until a write happens."""
+    calls = []
+
+    async def read(self, query, parameters=None):
+        calls.append(query)
+        return [{"label": "Service"}]
+
+    async def no_write(self, query, parameters=None):
+        return None
+
+    monkeypatch.setattr("mcp_server.database.neo4j_client.Neo4jClient.execute_read", read)
+    monkeypatch.setattr(
+        "mcp_server.database.neo4j_client.Neo4jClient.execute_write", no_write
+    )
+
+    await cached_client.execute_read("CALL db.labels()")
+    backend_get = cached_client.cache.get
+    monkeypatch.setattr(cached_client.cache, "get", None)
+    assert await cached_client.execute_read("CALL db.labels()") == [{"label": "Service"}]
+    monkeypatch.setattr(cached_client.cache, "get", backend_get)
+
+    await cached_client.execute_write("CREATE (n:Database)", await_invalidation=True)
+    assert cached_client._schema_cache == {}
+    await cached_client.execute_read("CALL db.labels()")
+
+    assert calls == ["CALL db.labels()"] * 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_read(cached_client, monkeypatch):
+    """Test identical concurrent misses run a single database read."""
+    calls = []
+    release = asyncio.Event()
+
+    async def slow_read(self, query, parameters=None):
+        calls.append(parameters)
+        await release.wait()
+        return [{"name": parameters["name"]}]
+
+    monkeypatch.setattr(
+        "mcp_server.database.neo4j_client.Neo4jClient.execute_read", slow_read
+    )
+    query = "MATCH (s:Service {name: $name}) RETURN s.name AS name"
+
+    readers = [
+        asyncio.create_task(cached_client.execute_read(query, {"name": "api"}))
+        for _ in range(5)
+    ]
+    other = asyncio.create_task(cached_client.execute_read(query, {"name": "db"}))
+    await asyncio.sleep(0)
+    readers[0].cancel()
+    release.set()
+
+    results = await asyncio.gather(*readers[1:], other)
+
+    assert calls == [{"name": "api"}, {"name": "db"}]
+    assert results[:-1] == [[{"name": "api"}]] * 4
+    assert results[-1] == [{"name": "db"}]
+    assert not cached_client._inflight
+    assert await cached_client.execute_read(query, {"name": "api"}) == [{"name": "api"}]
+    assert len(calls) == 2
@@ -0,0 +1,344 @@
+"""Tests for complexity analytics."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp_server.analytics import complexity_analytics
+from mcp_server.analytics.complexity_analytics import (
+    COMPLEXITY_GENERATION_KEY,
+    ComplexityAnalytics,
+    LanguageComplexity,
+    invalidate_complexity_cache,
+)
+from mcp_server.utils.cache import QueryCache
+
+
+def _bucket_row(**overrides):
+    """Build an aggregated bucket row as returned by Neo4j."""
+    row = {
+        "avg_complexity": 4.0,
+        "max_complexity": 12.0,
+        "min_complexity": 1.0,
+        "high_complexity_count": 1,
+        "complexity_distribution": {"0-2": 2, "3-5": 3, "6-10": 0, "11+": 1},
+    }
+    row.update(overrides)
+    return row
+
+
+def _stream_of(rows):
+    """Build an ``execute_read_stream`` side effect yielding ``rows``."""
+    async def stream(query, parameters=None):
+        for row in rows:
+            yield row
+    return stream
+
+
+@pytest.fixture
+def mock_neo4j_client():
+    """Create mock Neo4j client."""
+    client = AsyncMock()
+    client.execute_read = AsyncMock(return_value=[])
+    client.execute_read_stream = MagicMock(side_effect=_stream_of([]))
+    return client
+
+
+@pytest.fixture
+def query_cache():
+    """Create an isolated in-memory query cache."""
+    return QueryCache()
+
+
+@pytest.fixture
+def analytics(mock_neo4j_client, query_cache):
+    """Create analytics instance."""
+    return ComplexityAnalytics(mock_neo4j_client, cache=query_cache)
+
+
+@pytest.mark.asyncio
+async def test_report_uses_single_round_trip(analytics, mock_neo4j_client):
+    """Test report fetches trends, languages and hotspots in one query."""
+    mock_neo4j_client.execute_read.return_value = [{
+        "trends": [_bucket_row(day=date(2025, 1, 1), total_functions=6)],
+        "languages": [_bucket_row(language="python", sample_size=6)],
+        "hotspots": [{
+            "code_hash": "abc",
+            "complexity": 25.0,
+            "functions": ["f"],
+            "classes": None,
+            "language": "python",
+            "timestamp": None,
+            "issues": None,
+        }],
+    }]
+
+    report = await analytics.generate_complexity_report(days=7)
+
+    assert mock_neo4j_client.execute_read.call_count == 1
+    query, params = mock_neo4j_client.execute_read.call_args.args
+    assert query.count("CALL {") == 3
+    assert params["days"] == 7
+
+    assert type(report["trends"][0]) is dict
+    assert report["trends"][0]["date"] == "2025-01-01"
+    assert report["trends"][0]["metrics"]["complexity_distribution"]["3-5"] == 3
+    assert report["language_comparison"][0]["sample_size"] == 6
+    assert report["complexity_hotspots"][0]["refactor_priority"] == "HIGH"
+    assert report["complexity_hotspots"][0]["classes"] == []
+    assert report["summary"]["languages_analyzed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_report_handles_empty_database(analytics, mock_neo4j_client):
+    """Test report falls back to empty sections without data."""
+    mock_neo4j_client.execute_read.return_value = []
+
+    report = await analytics.generate_complexity_report()
+
+    assert report["trends"] == []
+    assert report["language_comparison"] == []
+    assert report["complexity_hotspots"] == []
+    assert report["summary"]["current_avg_complexity"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_complexity_trends_converts_rows(analytics, mock_neo4j_client):
+    """Test trend rows are converted into metrics."""
+    mock_neo4j_client.execute_read_stream.side_effect = _stream_of([
+        _bucket_row(day=date(2025, 1, 2), total_functions=6),
+    ])
+
+    trends = await analytics.get_complexity_trends(days=3, user_id="user-1")
+
+    _, params = mock_neo4j_client.execute_read_stream.call_args.args
+    assert params == {"days": 3, "user_id": "user-1"}
+    assert trends[0].metrics.total_functions == 6
+    assert trends[0].metrics.max_complexity == 12.0
+
+
+@pytest.mark.asyncio
+async def test_trends_share_one_parameterized_query(analytics, mock_neo4j_client):
+    """Test user-scoped and global trends reuse the same query text."""
+    await analytics.get_complexity_trends(days=3)
+    await analytics.get_complexity_trends(days=3, user_id="user-1")
+
+    global_call, user_call = mock_neo4j_client.execute_read_stream.call_args_list
+    assert global_call.args[0] == user_call.args[0]
+    assert global_call.args[1] == {"days": 3, "user_id": None}
+
+
+@pytest.mark.parametrize(
+    ("avg", "grade"),
+    [
+        (1.0, "A"), (2.0, "A"), (4.0, "B"), (5.0, "B"), (9.5, "C"),
+        (10.0, "C"), (15.0, "D"), (15.5, "F"), (30.0, "F"),
+    ],
+)
+def test_calculate_complexity_grade(analytics, avg, grade):
+    """Test complexity grade boundaries."""
+    assert analytics._calculate_complexity_grade(avg) == grade
+
+
+@pytest.mark.asyncio
+async def test_trends_aggregate_daily_rollups(analytics, mock_neo4j_client):
+    """Test trend queries read rollups rather than raw lint results."""
+    await analytics.get_complexity_trends(days=30)
+    await analytics.get_language_complexity_comparison(days=30)
+
+    assert mock_neo4j_client.execute_read_stream.call_count == 2
+    for call in mock_neo4j_client.execute_read_stream.call_args_list:
+        query = call.args[0]
+        assert "ComplexityDailyRollup" in query
+        assert "LintResult" not in query
+
+
+@pytest.mark.asyncio
+async def test_rebuild_daily_rollups(analytics, mock_neo4j_client):
+    """Test rollup rebuild clears and recreates the window."""
+    mock_neo4j_client.execute_write = AsyncMock()
+
+    await analytics.rebuild_daily_rollups(days=14)
+
+    delete_call, create_call = mock_neo4j_client.execute_write.call_args_list
+    assert "DETACH DELETE" in delete_call.args[0]
+    assert "CREATE (:ComplexityDailyRollup" in create_call.args[0]
+    assert create_call.args[1] == {"days": 14}
+
+
+@pytest.mark.asyncio
+async def test_report_is_cached_until_invalidated(analytics, mock_neo4j_client, query_cache):
+    """Test repeated reports hit the cache until ingest invalidates it."""
+    await analytics.generate_complexity_report(days=7)
+    await analytics.generate_complexity_report(days=7)
+    assert mock_neo4j_client.execute_read.call_count == 1
+
+    await analytics.generate_complexity_report(days=14)
+    assert mock_neo4j_client.execute_read.call_count == 2
+
+    await invalidate_complexity_cache(query_cache)
+    await analytics.generate_complexity_report(days=7)
+    assert mock_neo4j_client.execute_read.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bumps_generation_without_scanning(analytics, query_cache):
+    """Test ingest retires cached results with one counter bump, not a key scan."""
+    await analytics.generate_complexity_report(days=7)
+    stored = len(query_cache.memory_cache._store)
+
+    await invalidate_complexity_cache(query_cache)
+
+    assert len(query_cache.memory_cache._store) == stored
+    assert await query_cache.get_counter(COMPLEXITY_GENERATION_KEY) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_languages_keep_model_type(analytics, mock_neo4j_client):
+    """Test cached results are returned as the declared models."""
+    mock_neo4j_client.execute_read_stream.side_effect = _stream_of([
+        _bucket_row(language="python", sample_size=6),
+    ])
+
+    first = await analytics.get_language_complexity_comparison(days=30)
+    second = await analytics.get_language_complexity_comparison(days=30)
+
+    assert mock_neo4j_client.execute_read_stream.call_count == 1
+    assert isinstance(second[0], LanguageComplexity)
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_reports_bounded_by_semaphore(analytics, mock_neo4j_client, monkeypatch):
+    """Test concurrent reports never exceed the shared query slots."""
+    monkeypatch.setattr(complexity_analytics, "_report_sem", asyncio.Semaphore(2))
+    in_flight = 0
+    peak = 0
+
+    async def slow_read(query, parameters=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return []
+
+    mock_neo4j_client.execute_read.side_effect = slow_read
+
+    async with asyncio.TaskGroup() as tg:
+        for days in range(1, 7):
+            tg.create_task(analytics.generate_complexity_report(days=days))
+
+    assert mock_neo4j_client.execute_read.call_count == 6
+    assert peak == 2
+
+
+def test_recommendations_cover_each_rule(analytics):
+    """Test recommendations reflect averages, hotspots and languages."""
+    metrics = {"avg_complexity": 12.0, "high_complexity_count": 3}
+    hotspots = [{}] * 6
+    languages = [
+        {"language": "python", "metrics": {"avg_complexity": 16.0}},
+        {"language": "go", "metrics": {"avg_complexity": 4.0}},
+    ]
+
+    recommendations = analytics._generate_recommendations(metrics, hotspots, languages)
+
+    assert len(recommendations) == 4
+    assert recommendations[1].startswith("Refactor 3 high-complexity functions.")
+    assert recommendations[3].startswith("python:")
+
+    calm = analytics._generate_recommendations(
+        {"avg_complexity": 1.0, "high_complexity_count": 0}, [], []
+    )
+    assert calm == [
+        "Code complexity is within acceptable ranges. "
+        "Continue following good coding practices."
+    ]
+
+
+@pytest.mark.asyncio
+async def test_users_stats_batched_in_one_query(analytics, mock_neo4j_client):
+    """Test multi-user statistics are fetched with a single UNWIND query."""
+    mock_neo4j_client.execute_read.return_value = [
+        {
+            "user_id": "alice",
+            "avg_complexity": 4.0,
+            "max_complexity": 8.0,
+            "min_complexity": 1.0,
+            "total_submissions": 4,
+            "high_complexity_count": 1,
+            "clean_code_count": 2,
+            "languages_used": ["python"],
+        },
+    ]
+
+    stats = await analytics.get_users_complexity_stats(["alice", "bob", "alice"], days=7)
+
+    assert mock_neo4j_client.execute_read.call_count == 1
+    query, params = mock_neo4j_client.execute_read.call_args.args
+    assert "UNWIND $user_ids" in query
+    assert params == {"user_ids": ["alice", "bob"], "days": 7}
+
+    assert stats["alice"]["high_complexity_rate"] == 25.0
+    assert stats["alice"]["complexity_grade"] == "B"
+    assert stats["bob"]["no_data"] is True
+
+
+@pytest.mark.asyncio
+async def test_single_user_stats_delegate_to_batch(analytics, mock_neo4j_client):
+    """Test the single-user helper reuses the batched query."""
+    stats = await analytics.get_user_complexity_stats("carol", days=3)
+
+    _, params = mock_neo4j_client.execute_read.call_args.args
+    assert params == {"user_ids": ["carol"], "days": 3}
+    assert stats == {"user_id": "carol", "period_days": 3, "no_data": True}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include_issues", [False, True])
+async def test_hotspots_fetch_issues_on_request(analytics, mock_neo4j_client, include_issues):
+    """Test linter output is only selected when explicitly requested."""
+    await analytics.get_complexity_hotspots(include_issues=include_issues)
+
+    query, params = mock_neo4j_client.execute_read_stream.call_args.args
+    assert "$include_issues" in query
+    assert params["include_issues"] is include_issues
+
+
+@pytest.mark.asyncio
+async def test_report_hotspots_omit_issues(analytics, mock_neo4j_client):
+    """Test the report query never selects raw linter output."""
+    await analytics.generate_complexity_report()
+
+    query, _ = mock_neo4j_client.execute_read.call_args.args
+    assert "linter_output" not in query
+
+
+@pytest.mark.asyncio
+async def test_language_comparison_limited_to_requested_languages(
+    analytics, mock_neo4j_client
+):
+    """Test language comparison only aggregates the requested languages."""
+    await analytics.get_language_complexity_comparison(days=30)
+    await analytics.get_language_complexity_comparison(
+        days=30, languages=["python", "go", "python"]
+    )
+
+    all_call, subset_call = mock_neo4j_client.execute_read_stream.call_args_list
+    assert all_call.args[1] == {"days": 30, "languages": None}
+    assert subset_call.args[1] == {"days": 30, "languages": ["go", "python"]}
+
+
+@pytest.mark.asyncio
+async def test_language_comparison_cache_ignores_language_order(
+    analytics, mock_neo4j_client
+):
+    """Test reordered language filters share one cache entry."""
+    await analytics.get_language_complexity_comparison(days=30, languages=["python", "js"])
+    await analytics.get_language_complexity_comparison(days=30, languages=["js", "python"])
+
+    assert mock_neo4j_client.execute_read_stream.call_count == 1
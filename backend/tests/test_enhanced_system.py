@@ -1,10 +1,11 @@
 """Comprehensive tests for enhanced Ultimate MCP system."""
 
 import asyncio
+import dataclasses
 from unittest.mock import AsyncMock
 
 import pytest
-from mcp_server.config import UltimateMCPConfig
+from mcp_server.config import FrozenConfig, UltimateMCPConfig
 from mcp_server.monitoring import HealthChecker, MetricsCollector
 from mcp_server.utils.enhanced_security import (
     EnhancedSecurityManager,
@@ -335,6 +336,28 @@ class TestConfiguration:
         with pytest.raises(ValueError):
             config.validate_production_settings()
 
+    
+    def test_frozen_snapshot_mirrors_settings(self):
+        """Test the frozen snapshot carries every settings field and is immutable."""
+        settings = UltimateMCPConfig(server={"allowed_origins": "https://a.example,https://b.example"})
+        frozen = FrozenConfig.from_settings(settings)
+        
+        for section in ("database", "security", "server", "execution", "monitoring", "redis"):
+            model = getattr(settings, section)
+            snapshot = getattr(frozen, section)
+            assert {field.name for field in dataclasses.fields(snapshot)} == set(
+                type(model).model_fields
+            )
+            for name in type(model).model_fields:
+                value = getattr(model, name)
+                expected = tuple(value) if isinstance(value, list) else value
+                assert getattr(snapshot, name) == expected
+        
+        assert frozen.server.allowed_origins == ("https://a.example", "https://b.example")
+        assert frozen.is_development is True
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            frozen.server.debug = True  # type: ignore[misc]
+
 
 class TestIntegration:
     """Integration tests for enhanced system."""
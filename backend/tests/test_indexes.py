@@ -62,6 +62,9 @@ async def test_create_all_indexes_includes_result_indexes(
 
     # Check for result indexes
     assert "lint_result_hash" in results
+    assert "lint_result_timestamp" in results
+    assert "lint_result_user_time" in results
+    assert "lint_result_complexity" in results
     assert "execution_result_timestamp" in results
     assert "test_result_timestamp" in results
 
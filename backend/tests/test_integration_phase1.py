@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from fastapi.testclient import TestClient
 from mcp_server.auth import Role
+from pydantic import SecretStr
 
 
 @pytest.fixture
@@ -31,7 +32,10 @@ def test_app(mock_neo4j):
             mock_config.database.user = "neo4j"
             mock_config.database.password = "test"
             mock_config.database.database = "neo4j"
-            mock_config.security.secret_key = "test-secret-key"
+            mock_config.security.secret_key = SecretStr("test-secret-key")
+            mock_config.security.jwt_algorithm = "HS256"
+            mock_config.security.jwt_private_key_path = None
+            mock_config.security.jwt_public_key_path = None
             mock_config.security.encryption_key = None
             mock_config.server.allowed_origins = ["*"]
             mock_config.server.allowed_methods = ["*"]
@@ -93,6 +97,70 @@ def test_audit_log_query_requires_admin_permission(test_app):
     assert response.status_code in [401, 403]
 
 
+def test_complexity_report_endpoint(test_app, mock_neo4j):
+    """Test the complexity report is served from the analytics engine."""
+    response = test_app.get("/api/v1/analytics/complexity?days=7")
+    
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["period_days"] == 7
+    assert data["summary"]["total_hotspots"] == 0
+    assert data["recommendations"]
+    assert mock_neo4j.execute_read.await_count >= 1
+
+
+def test_client_ip_resolved_once_per_request(test_app):
+    """Test the client address is parsed once and reused across the request."""
+    with patch(
+        "mcp_server.enhanced_server.get_remote_address", return_value="10.0.0.1"
+    ) as remote_address:
+        response = test_app.get("/api/v1/analytics/complexity?days=3")
+
+    assert response.status_code == 200
+    assert remote_address.call_count == 1
+
+
+def test_request_id_propagated_from_upstream(test_app):
+    """Test an incoming X-Request-ID is reused instead of generating one."""
+    response = test_app.get("/status", headers={"X-Request-ID": "lb-1234"})
+    assert response.headers["X-Request-ID"] == "lb-1234"
+
+    generated = test_app.get("/status").headers["X-Request-ID"]
+    assert len(generated) == 32
+    assert generated != "lb-1234"
+
+
+@pytest.mark.parametrize("bad_id", ["x" * 129, "id with spaces", "id;drop=1"])
+def test_invalid_upstream_request_id_replaced(test_app, bad_id):
+    """Test a non-token X-Request-ID is replaced with a generated one."""
+    response = test_app.get("/status", headers={"X-Request-ID": bad_id})
+
+    generated = response.headers["X-Request-ID"]
+    assert generated != bad_id
+    assert len(generated) == 32
+
+
+def test_security_headers_applied(test_app):
+    """Test the precomputed security headers are set on every response."""
+    response = test_app.get("/status")
+
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "max-age=31536000" in response.headers["Strict-Transport-Security"]
+    assert response.headers["Content-Security-Policy"].startswith("default-src 'self'")
+    assert "Pragma" not in response.headers
+
+
+def test_probe_endpoints_skip_request_logging(test_app):
+    """Test health probes bypass per-request logging and context binding."""
+    with patch("mcp_server.enhanced_server.structlog.contextvars.bind_contextvars") as bind:
+        test_app.get("/health")
+        assert bind.call_count == 0
+
+        test_app.get("/status")
+        assert bind.call_count == 1
+
+
 def test_execute_code_requires_execute_permission(test_app):
     """Test that code execution requires execute permission."""
     response = test_app.post(
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import jwt
 import pytest
@@ -89,6 +90,38 @@ def test_verify_token_success(jwt_handler):
     assert payload["roles"] == ["developer"]
 
 
+def test_verify_token_reuses_cached_verification(jwt_handler):
+    """Test repeated verification of a token skips jwt.decode."""
+    token = jwt_handler.create_token(user_id="user-123", roles=[Role.DEVELOPER])
+
+    with patch("mcp_server.auth.jwt_handler.jwt.decode", wraps=jwt.decode) as decode:
+        first = jwt_handler.verify_token(token)
+        first["sub"] = "tampered"
+        second = jwt_handler.verify_token(token)
+
+    assert decode.call_count == 1
+    assert second["sub"] == "user-123"
+
+
+def test_verify_token_cache_respects_expiry(jwt_handler):
+    """Test cached verifications are dropped once the token expires."""
+    token = jwt_handler.create_token(user_id="user-123", roles=[Role.DEVELOPER])
+    jwt_handler.verify_token(token)
+
+    expires_at = jwt.decode(token, options={"verify_signature": False})["exp"]
+    with (
+        patch("mcp_server.auth.jwt_handler.time.time", return_value=expires_at + 1),
+        patch(
+            "mcp_server.auth.jwt_handler.jwt.decode",
+            side_effect=jwt.ExpiredSignatureError("Signature has expired"),
+        ) as decode,
+    ):
+        with pytest.raises(jwt.ExpiredSignatureError):
+            jwt_handler.verify_token(token)
+
+    assert decode.call_count == 1
+
+
 def test_verify_token_invalid_signature(jwt_handler):
     """Test verifying token with invalid signature."""
     # Create token with different secret
@@ -213,3 +246,45 @@ def test_jwt_handler_different_algorithm():
     # Verify with wrong algorithm should fail
     with pytest.raises(jwt.InvalidAlgorithmError):
         jwt.decode(token, "test-secret", algorithms=["HS256"], issuer="ultimate-mcp")
+
+
+@pytest.fixture
+def ed25519_pems():
+    """Generate an Ed25519 key pair as PEM bytes."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    private_key = Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem, public_pem
+
+
+def test_eddsa_token_round_trip(ed25519_pems):
+    """Test EdDSA tokens signed with a private key verify with the public key."""
+    private_pem, public_pem = ed25519_pems
+    issuer = JWTHandler(private_key_pem=private_pem)
+    verifier = JWTHandler(public_key_pem=public_pem)
+
+    token = issuer.create_token(user_id="user-123", roles=[Role.ADMIN])
+
+    assert issuer.algorithm == "EdDSA"
+    assert jwt.get_unverified_header(token)["alg"] == "EdDSA"
+    assert verifier.verify_token(token)["sub"] == "user-123"
+    assert issuer.verify_token(token)["roles"] == ["admin"]
+
+
+def test_eddsa_verifier_cannot_sign(ed25519_pems):
+    """Test a handler holding only the public key refuses to issue tokens."""
+    _, public_pem = ed25519_pems
+    verifier = JWTHandler(public_key_pem=public_pem)
+
+    with pytest.raises(ValueError):
+        verifier.create_token(user_id="user-123", roles=[Role.VIEWER])
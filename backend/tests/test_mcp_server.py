@@ -85,3 +85,111 @@ def test_example():
     assert response.status_code == 200
     payload = response.json()
     assert payload["return_code"] == 0
+
+
+@pytest.mark.asyncio
+async def test_request_context_middleware_headers_and_limits() -> None:
+    from mcp_server.server import RequestContextMiddleware, settings
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    async def echo_id(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(request.state.request_id)
+
+    app = RequestContextMiddleware(Starlette(routes=[Route("/", echo_id, methods=["GET", "POST"])]))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/", headers={"X-Request-Id": "abc"})
+        assert response.text == "abc"
+        assert response.headers["X-Request-Id"] == "abc"
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+        for bad_id in ("x" * 129, "abc\tinjected=1", "a b"):
+            replaced = await client.get("/", headers={"X-Request-Id": bad_id})
+            assert replaced.text != bad_id
+            assert len(replaced.headers["X-Request-Id"]) == 32
+
+        too_large = await client.post("/", content=b"x" * (settings.max_request_bytes + 1))
+        assert too_large.status_code == 413
+        assert too_large.json() == {"detail": "Request body too large"}
+
+        malformed = await client.get("/", headers={"Content-Length": "nope"})
+        assert malformed.status_code == 400
+
+
+def test_settings_reject_wildcard_cors_origin(monkeypatch: pytest.MonkeyPatch) -> None:
+    from mcp_server.server import Settings
+
+    monkeypatch.setenv("ALLOWED_ORIGINS", "http://localhost:3000, *")
+    with pytest.raises(ValueError, match="ALLOWED_ORIGINS"):
+        Settings()
+
+
+def test_rate_limit_handler_returns_json_429() -> None:
+    from mcp_server.server import rate_limit_handler
+
+    response = rate_limit_handler(None, RuntimeError("boom"))  # type: ignore[arg-type]
+    assert response.status_code == 429
+    assert response.body == b'{"detail":"Unexpected error"}'
+    assert response.media_type == "application/json"
+
+
+def test_token_bucket_refills_over_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    from mcp_server.utils import user_rate_limit
+    from mcp_server.utils.user_rate_limit import TokenBucket
+
+    now = 100.0
+    monkeypatch.setattr(user_rate_limit.time, "monotonic", lambda: now)
+    bucket = TokenBucket(rate=2, max_keys=2)
+
+    assert [bucket.allow("a") for _ in range(3)] == [True, True, False]
+    assert bucket.allow("b")
+    now += 0.5
+    assert bucket.allow("a")
+    assert not bucket.allow("a")
+
+    now += 10
+    assert bucket.allow("c")
+    assert set(bucket.buckets) == {"c"}
+
+
+def test_now_iso_formats_once_per_second(monkeypatch: pytest.MonkeyPatch) -> None:
+    from mcp_server import server
+
+    monkeypatch.setattr(server, "_iso_cache", [0, ""])
+    monkeypatch.setattr(server.time, "time", lambda: 1_700_000_000.7)
+    assert server._now_iso() == "2023-11-14T22:13:20+00:00"
+
+    server._iso_cache[1] = "cached"
+    assert server._now_iso() == "cached"
+
+
+@pytest.mark.parametrize(
+    ("header", "allowed"),
+    [
+        ("Bearer test-token", True),
+        ("bearer test-token", True),
+        ("Bearer wrong", False),
+        ("Basic test-token", False),
+        ("", False),
+    ],
+)
+def test_require_auth_compares_bearer_token(
+    monkeypatch: pytest.MonkeyPatch, header: str, allowed: bool
+) -> None:
+    from fastapi import HTTPException
+    from mcp_server import server
+    from starlette.requests import Request
+
+    monkeypatch.setattr(server.settings, "auth_token", "test-token")
+    headers = [(b"authorization", header.encode())] if header else []
+    request = Request({"type": "http", "headers": headers})
+
+    if allowed:
+        server._require_auth(request)
+    else:
+        with pytest.raises(HTTPException) as excinfo:
+            server._require_auth(request)
+        assert excinfo.value.status_code == 401
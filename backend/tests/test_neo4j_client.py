@@ -0,0 +1,221 @@
+"""Tests for the Neo4j client wrapper."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp_server.database.neo4j_client import Neo4jClient
+from mcp_server.database.neo4j_client_enhanced import EnhancedNeo4jClient
+from neo4j.exceptions import ConstraintError, ServiceUnavailable, TransientError
+
+
+@pytest.fixture
+def session():
+    """Create a mock driver session."""
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    return session
+
+
+@pytest.fixture
+def client(session):
+    """Create a client whose driver hands out the mock session."""
+    client = Neo4jClient(
+        "bolt://localhost:7687",
+        "neo4j",
+        "password",
+        "neo4j",
+        enable_circuit_breaker=False,
+    )
+    client._driver = MagicMock()
+    client._driver.session.return_value = session
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_single_round_trip(client, session):
+    """Test graph metrics are collected with one query in one session."""
+    result = AsyncMock()
+    result.single.return_value = {
+        "node_count": 5,
+        "relationship_count": 3,
+        "labels": [{"label": "Service", "occurrences": 5}],
+        "relationship_types": [{"rel_type": "DEPENDS_ON", "occurrences": 3}],
+    }
+    session.run.return_value = result
+
+    metrics = await client.get_metrics()
+
+    assert client._driver.session.call_count == 1
+    assert session.run.await_count == 1
+    assert session.run.call_args.args[0].count("CALL {") == 4
+    assert metrics.node_count == 5
+    assert metrics.relationship_count == 3
+    assert metrics.labels == {"Service": 5}
+    assert metrics.relationship_types == {"DEPENDS_ON": 3}
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_without_record(client, session):
+    """Test metrics default to an empty graph when no record is returned."""
+    result = AsyncMock()
+    result.single.return_value = None
+    session.run.return_value = result
+
+    metrics = await client.get_metrics()
+
+    assert metrics.node_count == 0
+    assert metrics.labels == {}
+
+
+@pytest.mark.asyncio
+async def test_clients_share_driver_until_last_close():
+    """Test clients for the same server reuse one driver and pool."""
+    first = Neo4jClient("bolt://shared:7687", "neo4j", "pw", "neo4j", enable_circuit_breaker=False)
+    second = Neo4jClient("bolt://shared:7687", "neo4j", "pw", "other", enable_circuit_breaker=False)
+    other = Neo4jClient("bolt://shared:7687", "admin", "pw", "neo4j", enable_circuit_breaker=False)
+
+    assert first._driver is second._driver
+    assert other._driver is not first._driver
+
+    driver = first._driver
+    driver.close = AsyncMock()
+
+    await first.close()
+    await first.close()
+    driver.close.assert_not_awaited()
+
+    await second.close()
+    driver.close.assert_awaited_once()
+
+    await other.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_unwinds_rows_in_one_query(client, session):
+    """Test batched reads send every input in a single UNWIND query."""
+    result = AsyncMock()
+    result.data.return_value = [{"key": "a", "node": {"key": "a"}}]
+    session.run.return_value = result
+
+    nodes = await client.get_nodes(["a", "b", "a"])
+
+    assert session.run.await_count == 1
+    query = session.run.call_args.args[0]
+    assert query.startswith("UNWIND $batch AS row MATCH (n:GraphNode {key: row})")
+    assert session.run.call_args.kwargs == {"batch": ["a", "b"]}
+    assert nodes == {"a": {"key": "a"}}
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_skips_empty_batch(client, session):
+    """Test an empty batch does not reach the database."""
+    assert await client.fetch_many("RETURN row", []) == []
+    session.run.assert_not_called()
+
+
+@pytest.fixture
+def enhanced_client():
+    """Create a retrying client without a circuit breaker."""
+    return EnhancedNeo4jClient(
+        "bolt://localhost:7687",
+        "neo4j",
+        "password",
+        "neo4j",
+        max_retries=3,
+        enable_circuit_breaker=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_enhanced_client_does_not_retry_permanent_errors(enhanced_client, monkeypatch):
+    """Test permanent errors are raised on the first attempt without sleeping."""
+    sleep = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    func = AsyncMock(side_effect=ConstraintError("duplicate key"))
+
+    with pytest.raises(ConstraintError):
+        await enhanced_client._run_with_retry(func)
+
+    assert func.await_count == 1
+    sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_enhanced_client_retries_transient_errors(enhanced_client, monkeypatch):
+    """Test transient errors are retried with jittered backoff."""
+    sleep = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    func = AsyncMock(side_effect=[ServiceUnavailable("down"), TransientError("busy"), "ok"])
+
+    assert await enhanced_client._run_with_retry(func) == "ok"
+
+    assert func.await_count == 3
+    first_delay, second_delay = (call.args[0] for call in sleep.await_args_list)
+    assert 0.1 <= first_delay <= 0.3
+    assert 0.2 <= second_delay <= 0.6
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_open_sessions(client, session):
+    """Test sessions are counted while held and released afterwards."""
+    assert client.pool_stats == {"pool_in_use": 0, "pool_size": 50, "client_sessions_in_use": 0}
+
+    async with client._session():
+        assert client.pool_stats["pool_in_use"] == 1
+        assert client.pool_stats["client_sessions_in_use"] == 1
+
+    assert client.pool_stats["pool_in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_the_shared_driver_pool(client, session):
+    """Test pool usage counts sessions from every client on the shared driver."""
+    other = Neo4jClient(
+        "bolt://localhost:7687", "neo4j", "password", "neo4j", enable_circuit_breaker=False
+    )
+    other._driver = client._driver
+    try:
+        async with other._session():
+            assert client.pool_stats["pool_in_use"] == 1
+            assert client.pool_stats["client_sessions_in_use"] == 0
+    finally:
+        await other.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_defaults_to_a_small_batch(client, session):
+    """Test warm-up does not open the whole pool by default."""
+    session.run.return_value = AsyncMock()
+
+    assert await client.warm_pool() == 4
+    assert client._driver.session.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_cached_metrics_memoizes_one_query(client, session):
+    """Test metrics scrapes reuse one query within the TTL."""
+    result = AsyncMock()
+    result.single.return_value = None
+    session.run.return_value = result
+
+    metrics = await client.cached_metrics()
+    assert metrics.node_count == 0
+    assert await client.cached_metrics() is metrics
+    assert session.run.await_count == 1
+
+    session.run.side_effect = ServiceUnavailable("down")
+    assert await client.cached_metrics(max_age=0) is None
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_opens_concurrent_sessions(client, session):
+    """Test warm-up runs one ping per connection and tolerates failures."""
+    result = AsyncMock()
+    session.run.side_effect = [result, result, ServiceUnavailable("down")]
+
+    assert await client.warm_pool(3) == 2
+    assert client._driver.session.call_count == 3
+    assert client.pool_stats["pool_in_use"] == 0
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import shutil
 from types import ModuleType
+from unittest.mock import AsyncMock
 
 import httpx
 import pytest
-from mcp_server.database.models import GraphQueryPayload
+from mcp_server.database.models import (
+    GraphMetrics,
+    GraphNode,
+    GraphQueryPayload,
+    GraphRelationship,
+    GraphUpsertPayload,
+)
 from mcp_server.tools import (
     ExecutionRequest,
     GenerationRequest,
+    GraphTool,
     LintRequest,
 )
 from mcp_server.utils.enhanced_security import SecurityViolationError
@@ -63,3 +74,368 @@ async def test_graph_tool_rejects_mutating_cypher(
         await graph_tool.query(
             GraphQueryPayload(cypher="DELETE FROM foo")
         )
+
+
+@pytest.mark.asyncio
+async def test_graph_tool_upsert_batches_by_label_and_type() -> None:
+    tx = AsyncMock()
+
+    async def run_handler(handler):
+        return await handler(tx)
+
+    neo4j = AsyncMock()
+    neo4j.execute_write_transaction.side_effect = run_handler
+    neo4j.get_metrics.return_value = GraphMetrics(
+        node_count=3,
+        relationship_count=2,
+        labels={},
+        relationship_types={},
+        average_degree=0.0,
+    )
+    payload = GraphUpsertPayload(
+        nodes=[
+            GraphNode(key="api", labels=["Service"]),
+            GraphNode(key="worker", labels=["Service"]),
+            GraphNode(key="db", labels=["Database"]),
+        ],
+        relationships=[
+            GraphRelationship(start="api", end="db", type="DEPENDS_ON"),
+            GraphRelationship(start="worker", end="db", type="DEPENDS_ON"),
+        ],
+    )
+
+    await GraphTool(neo4j).upsert(payload)
+
+    assert tx.run.await_count == 3
+    service_call, database_call, rel_call = tx.run.call_args_list
+    assert "MERGE (n:GraphNode:Service {key: row.key})" in service_call.args[0]
+    assert [row["key"] for row in service_call.args[1]["batch"]] == ["api", "worker"]
+    assert len(database_call.args[1]["batch"]) == 1
+    assert rel_call.args[0].startswith("UNWIND $batch AS row")
+    assert len(rel_call.args[1]["batch"]) == 2
+
+
+def test_request_models_decode_raw_bodies() -> None:
+    """Test route payloads decode straight from bytes with defaults and bounds."""
+    payload = ExecutionRequest.model_validate_json(b'{"code": "print(1)"}')
+    assert payload.language == "python"
+    assert payload.timeout_seconds == 8.0
+
+    with pytest.raises(ValueError):
+        ExecutionRequest.model_validate_json(b'{"code": "x", "timeout_seconds": 0.1}')
+
+
+@pytest.mark.asyncio
+async def test_async_lint_tool_reuses_results_for_identical_source(monkeypatch) -> None:
+    from mcp_server.tools import async_lint_tool
+    from mcp_server.tools.async_lint_tool import AsyncLintTool
+
+    monkeypatch.setattr(async_lint_tool, "invalidate_complexity_cache", AsyncMock())
+    neo4j = AsyncMock()
+    tool = AsyncLintTool(neo4j, cache_size=1)
+    linter = AsyncMock(return_value=(0, ""))
+    monkeypatch.setattr(tool, "_run_external_linter_async", linter)
+    source = LintRequest(code="def add(a, b):\n    return a + b\n")
+
+    first = await tool.run(source)
+    second = await tool.run(source)
+    assert linter.await_count == 1
+    assert second.id != first.id
+    assert second.model_dump(exclude={"id"}) == first.model_dump(exclude={"id"})
+    await tool.close()
+    assert neo4j.execute_write.await_count == 1
+    rows = neo4j.execute_write.call_args.args[1]["rows"]
+    assert [row["id"] for row in rows] == [first.id, second.id]
+
+    await tool.run(LintRequest(code="x = 1\n"))
+    await tool.run(source)
+    assert linter.await_count == 3
+    await tool.close()
+
+
+@pytest.mark.asyncio
+async def test_async_lint_tool_extracts_metadata_in_one_pass(monkeypatch) -> None:
+    from mcp_server.tools import async_lint_tool
+    from mcp_server.tools.async_lint_tool import AsyncLintTool
+
+    monkeypatch.setattr(async_lint_tool, "invalidate_complexity_cache", AsyncMock())
+    tool = AsyncLintTool(AsyncMock())
+    monkeypatch.setattr(tool, "_run_external_linter_async", AsyncMock(return_value=(0, "")))
+    code = (
+        "import os, sys\n"
+        "from collections import deque\n"
+        "class Box:\n"
+        "    async def fetch(self):\n"
+        "        for item in []:\n"
+        "            if item:\n"
+        "                pass\n"
+        "def helper():\n"
+        "    while False:\n"
+        "        pass\n"
+    )
+
+    result = await tool.run(LintRequest(code=code))
+    await tool.close()
+
+    assert result.functions == ["fetch", "helper"]
+    assert result.classes == ["Box"]
+    assert result.imports == ["collections", "os", "sys"]
+    assert result.complexity == 3.0
+
+
+@pytest.mark.asyncio
+async def test_async_lint_tool_pipes_source_to_ruff(monkeypatch, tmp_path) -> None:
+    from mcp_server.tools import async_lint_tool
+    from mcp_server.tools.async_lint_tool import AsyncLintTool
+
+    fake_ruff = tmp_path / "ruff"
+    fake_ruff.write_text('#!/bin/sh\necho "$@"\ncat\nexit 1\n')
+    fake_ruff.chmod(0o755)
+    monkeypatch.setattr(async_lint_tool, "_RUFF", str(fake_ruff))
+
+    exit_code, output = await AsyncLintTool(AsyncMock())._run_external_linter_async(
+        b"x = 1", "python"
+    )
+
+    assert exit_code == 1
+    assert output.endswith("--stdin-filename snippet.py -\nx = 1")
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("node") is None, reason="Node.js not installed")
+async def test_js_tool_runs_each_script_in_a_fresh_warm_process() -> None:
+    from mcp_server.tools.js_exec_tool import JavaScriptExecutionTool
+
+    tool = JavaScriptExecutionTool(max_concurrent=2)
+    try:
+        first = await tool.run(
+            ExecutionRequest(code="globalThis.leak = 1; console.log('a')", language="js")
+        )
+        second = await tool.run(
+            ExecutionRequest(code="console.log(typeof globalThis.leak)", language="js")
+        )
+    finally:
+        await tool.close()
+
+    assert (first.return_code, first.stdout) == (0, "a\n")
+    assert second.stdout == "undefined\n"
+    assert not tool._idle
+
+
+@pytest.mark.asyncio
+async def test_multi_language_tools_share_one_python_executor() -> None:
+    from mcp_server.tools.js_exec_tool import MultiLanguageExecutionTool, _get_python_tool
+
+    request = ExecutionRequest(code="print('ok')", language="python")
+    results = await asyncio.gather(
+        MultiLanguageExecutionTool().run(request), MultiLanguageExecutionTool().run(request)
+    )
+
+    assert [result.stdout for result in results] == ["ok\n", "ok\n"]
+    assert _get_python_tool.cache_info().currsize == 1
+
+
+@pytest.mark.asyncio
+async def test_collect_output_can_truncate_without_killing() -> None:
+    import sys
+
+    from mcp_server.utils.process_output import collect_output
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c",
+        "import sys\nsys.stderr.write('e' * 100_000)\nprint('done')",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    stdout, stderr, timed_out = await collect_output(
+        process, 10.0, limit=1000, kill_on_overflow=False
+    )
+
+    assert (process.returncode, stdout, timed_out) == (0, b"done\n", False)
+    assert stderr == b"e" * 1000
+
+
+@pytest.mark.asyncio
+async def test_async_exec_tool_runs_interpreter_isolated() -> None:
+    from mcp_server.tools.async_exec_tool import AsyncExecutionTool
+
+    result = await AsyncExecutionTool().run(
+        ExecutionRequest(
+            code="import os, sys; print(sys.flags.isolated, os.getcwd() in sys.path)",
+            language="python",
+        )
+    )
+
+    assert result.stdout == "1 False\n"
+
+
+@pytest.mark.asyncio
+async def test_async_exec_tool_isolates_each_run_workdir() -> None:
+    from mcp_server.tools.async_exec_tool import AsyncExecutionTool
+
+    tool = AsyncExecutionTool(max_concurrent=2)
+    plant = await tool.run(
+        ExecutionRequest(
+            code=(
+                "import os\n"
+                "open('textwrap.py', 'w').write('print(42)')\n"
+                "print(os.getcwd())"
+            ),
+            language="python",
+        )
+    )
+    victim = await tool.run(
+        ExecutionRequest(code="import os, textwrap; print(os.getcwd())", language="python")
+    )
+
+    assert plant.return_code == 0 and victim.return_code == 0
+    assert "42" not in victim.stdout
+    first_dir, second_dir = plant.stdout.strip(), victim.stdout.strip()
+    assert first_dir != second_dir
+    assert not os.path.exists(first_dir) and not os.path.exists(second_dir)
+
+
+@pytest.mark.asyncio
+async def test_async_exec_tool_caps_output_and_keeps_it_on_timeout() -> None:
+    from mcp_server.tools.async_exec_tool import AsyncExecutionTool
+    from mcp_server.utils.process_output import DEFAULT_OUTPUT_LIMIT
+
+    tool = AsyncExecutionTool()
+    flood = await tool.run(
+        ExecutionRequest(
+            code="import sys\nwhile True: sys.stdout.write('x' * 65536)",
+            language="python",
+        )
+    )
+    stalled = await tool.run(
+        ExecutionRequest(
+            code="import sys, time\nprint('partial', flush=True)\n"
+            "sys.stderr.write('oops'); sys.stderr.flush()\ntime.sleep(30)",
+            language="python",
+            timeout_seconds=1.0,
+        )
+    )
+
+    assert flood.return_code != 0
+    assert len(flood.stdout) == DEFAULT_OUTPUT_LIMIT
+    assert stalled.return_code == -1
+    assert stalled.stdout == "partial\n"
+    assert stalled.stderr.startswith("oops\nExecution timed out")
+
+
+@pytest.mark.asyncio
+async def test_async_lint_tool_batches_persisted_results(monkeypatch) -> None:
+    from mcp_server.tools import async_lint_tool
+    from mcp_server.tools.async_lint_tool import AsyncLintTool
+
+    invalidate = AsyncMock()
+    monkeypatch.setattr(async_lint_tool, "invalidate_complexity_cache", invalidate)
+    neo4j = AsyncMock()
+    tool = AsyncLintTool(neo4j, batch_size=2, batch_interval=0.5)
+    monkeypatch.setattr(tool, "_run_external_linter_async", AsyncMock(return_value=(0, "")))
+
+    for index in range(3):
+        await tool.run(LintRequest(code=f"x = {index}\n"))
+    for _ in range(20):
+        if neo4j.execute_write.await_count:
+            break
+        await asyncio.sleep(0.01)
+    assert neo4j.execute_write.await_count == 1
+
+    neo4j.execute_write.side_effect = RuntimeError("neo4j down")
+    await tool.close()
+
+    assert [len(call.args[1]["rows"]) for call in neo4j.execute_write.await_args_list] == [2, 1]
+    assert neo4j.execute_write.call_args.args[0].lstrip().startswith("UNWIND $rows AS r")
+    assert invalidate.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_exec_tool_timeout_kills_spawned_children() -> None:
+    from pathlib import Path
+
+    from mcp_server.tools.async_exec_tool import AsyncExecutionTool
+
+    def alive(pid: int) -> bool:
+        try:
+            return Path(f"/proc/{pid}/stat").read_text().split()[2] != "Z"
+        except FileNotFoundError:
+            return False
+
+    result = await AsyncExecutionTool().run(
+        ExecutionRequest(
+            code="import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+            "print(child.pid, flush=True)\ntime.sleep(30)",
+            language="python",
+            timeout_seconds=1.0,
+        )
+    )
+
+    assert result.return_code == -1
+    grandchild = int(result.stdout)
+    for _ in range(50):
+        if not alive(grandchild):
+            break
+        await asyncio.sleep(0.02)
+    assert not alive(grandchild)
+
+
+@pytest.mark.asyncio
+async def test_async_lint_tool_disk_cache_survives_restart(monkeypatch, tmp_path) -> None:
+    from mcp_server.tools import async_lint_tool
+    from mcp_server.tools.async_lint_tool import AsyncLintTool
+
+    monkeypatch.setattr(async_lint_tool, "invalidate_complexity_cache", AsyncMock())
+    linter = AsyncMock(return_value=(1, "E999 boom"))
+    source = LintRequest(code="import os\n")
+    results = []
+
+    for _ in range(2):
+        tool = AsyncLintTool(AsyncMock(), disk_cache_path=tmp_path / "lint.sqlite3")
+        monkeypatch.setattr(tool, "_run_external_linter_async", linter)
+        results.append(await tool.run(source))
+        await tool.close()
+
+    assert linter.await_count == 1
+    assert results[0].id != results[1].id
+    assert results[1].model_dump(exclude={"id"}) == results[0].model_dump(exclude={"id"})
+
+
+def test_request_code_bytes_encoded_once_and_not_serialised() -> None:
+    request = LintRequest(code="print('é')")
+
+    assert request.code_bytes == "print('é')".encode("utf-8")
+    assert request.code_bytes is request.code_bytes
+    assert "code_bytes" not in request.model_dump()
+    assert "code_bytes" not in ExecutionRequest.model_json_schema()["properties"]
+
+
+@pytest.mark.asyncio
+async def test_async_lint_tool_coalesces_concurrent_duplicates(monkeypatch) -> None:
+    from mcp_server.tools import async_lint_tool
+    from mcp_server.tools.async_lint_tool import AsyncLintTool
+
+    monkeypatch.setattr(async_lint_tool, "invalidate_complexity_cache", AsyncMock())
+    release = asyncio.Event()
+
+    async def slow_linter(code: bytes, language: str) -> tuple[int, str]:
+        await release.wait()
+        return 0, ""
+
+    linter = AsyncMock(side_effect=slow_linter)
+    tool = AsyncLintTool(AsyncMock())
+    monkeypatch.setattr(tool, "_run_external_linter_async", linter)
+    source = LintRequest(code="y = 2\n")
+
+    callers = [asyncio.create_task(tool.run(source)) for _ in range(5)]
+    await asyncio.sleep(0)
+    callers[0].cancel()
+    release.set()
+    results = await asyncio.gather(*callers[1:])
+    await tool.close()
+
+    assert linter.await_count == 1
+    assert len({result.id for result in results}) == 4
+    assert not tool._inflight
@@ -0,0 +1,91 @@
+"""Tests for API versioning."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from mcp_server.api.versioning import APIVersion, APIVersioning
+from starlette.requests import Request
+
+
+def _request(path: str, headers: dict[str, str] | None = None) -> Request:
+    """Build a bare request for version extraction."""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [
+            (name.lower().encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ],
+    })
+
+
+@pytest.fixture
+def versioning():
+    """Create versioning manager."""
+    return APIVersioning()
+
+
+@pytest.mark.parametrize(
+    ("path", "headers", "expected"),
+    [
+        ("/api/v2/lint", {}, APIVersion.V2),
+        ("/api/v1", {}, APIVersion.V1),
+        ("/api/v2/lint", {"X-API-Version": "v1"}, APIVersion.V2),
+        ("/lint", {"Accept": "application/vnd.ultimate-mcp.v2+json"}, APIVersion.V2),
+        ("/lint", {"X-API-Version": "v2"}, APIVersion.V2),
+        ("/api/v9/lint", {"Accept": "application/vnd.ultimate-mcp.v9+json"}, APIVersion.V1),
+        ("/api/v9/lint", {"X-API-Version": "v2"}, APIVersion.V2),
+        ("/apiv2/lint", {}, APIVersion.V1),
+    ],
+)
+def test_extract_version(versioning, path, headers, expected):
+    """Test version resolution from path, Accept header and custom header."""
+    assert versioning.extract_version(_request(path, headers)) == expected
+
+
+def test_extract_version_uses_default():
+    """Test unversioned requests fall back to the configured default."""
+    versioning = APIVersioning(default_version=APIVersion.V2)
+
+    assert versioning.extract_version(_request("/health")) == APIVersion.V2
+
+
+@pytest.mark.asyncio
+async def test_versioned_endpoint_wraps_payload(versioning):
+    """Test versioned endpoints attach precomputed version metadata."""
+    @versioning.versioned_endpoint([APIVersion.V1], deprecated_versions=[APIVersion.V1])
+    def list_tools():
+        return {"tools": ["lint"]}
+
+    route = versioning.get_router(APIVersion.V1).routes[0]
+    response = await route.endpoint()
+
+    assert json.loads(response.body) == {
+        "api_version": "v1",
+        "deprecated": True,
+        "migration_guide": "https://docs.ultimate-mcp.com/migration/v1",
+        "data": {"tools": ["lint"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_versioned_endpoint_binds_each_version(versioning):
+    """Test every version router reports its own version metadata."""
+    @versioning.versioned_endpoint(
+        [APIVersion.V1, APIVersion.V2], deprecated_versions=[APIVersion.V1]
+    )
+    async def list_tools():
+        return {"tools": ["lint"]}
+
+    v1_route = versioning.get_router(APIVersion.V1).routes[0]
+    v2_route = versioning.get_router(APIVersion.V2).routes[0]
+    v1_body = json.loads((await v1_route.endpoint()).body)
+    v2_body = json.loads((await v2_route.endpoint()).body)
+
+    assert (v1_body["api_version"], v1_body["deprecated"]) == ("v1", True)
+    assert (v2_body["api_version"], v2_body["deprecated"]) == ("v2", False)
+    assert v2_body["migration_guide"] is None